@@ -5,13 +5,24 @@ The module contains one class and methods corresponding with the FEWS PI-REST re
 https://publicwiki.deltares.nl/display/FEWSDOC/FEWS+PI+REST+Web+Service
 """
 
+import json
 import pandas as pd
-from .utils.timer import Timer
+from .utils.session import create_session, POOL_SIZE, RETRIES, BACKOFF_FACTOR
 import logging
 import urllib3
 
 from .get_qualifiers import get_qualifiers
-from .get_time_series import get_time_series
+from .get_time_series import get_time_series, iter_time_series, CHUNK_SIZE
+from .get_time_series_async import MAX_CONCURRENCY
+from .lazy import EventsLoader
+from .utils.coalescing import SingleFlight, request_key
+from .utils.downsampling import thinning_for_width
+from .utils.instrumentation import (
+    Instrumentation,
+    LoggingExporter,
+    time_series_counts
+    )
+from .utils.metrics import Metrics
 from .get_locations import get_locations
 from .get_filters import get_filters
 from .get_parameters import get_parameters
@@ -27,28 +38,118 @@ class Api:
 
     All variables related to PI-REST variables are defined camelCase. All others are
     snake_case.
+
+    All requests share one pooled session with keep-alive connections. Failed
+    connections and 5xx responses are retried with exponential backoff.
+
+    With a TimeSeriesCache as cache, time series requests with a start_time and
+    end_time are served from the cache and only the missing window is fetched.
+    With a MetadataCache as metadata_cache, filters, locations, parameters and
+    qualifiers are memoized for a time-to-live.
+
+    Time series are requested in time_series_format, "PI_JSON" (default) or
+    "PI_XML". It can be overruled per call with document_format.
+
+    Responses are requested compressed (gzip/deflate, and br/zstd if their
+    decoders are installed) unless compression is False. Transfer metrics of
+    every request (bytes on the wire, decompressed bytes, request and decode
+    time) are recorded in metrics, see Metrics.summary. Requests of the
+    concurrent (parallel and max_events) paths are not recorded.
+
+    Every call is a span in instrumentation, recording its latency, time to
+    first byte, bytes, decode and build time, and number of time series and
+    events in histograms (see Instrumentation.summary for percentiles). Spans
+    are logged at debug level and passed to exporters, and with an
+    OpenTelemetry tracer also exported as OpenTelemetry spans.
+
+    With coalesce (default), identical requests made while the first is in
+    flight (e.g. many sessions opening at once) wait for it and share its
+    result, see single_flight.waiters for the callers per request in flight.
+    Shared results should not be modified. Streamed requests (iter_time_series)
+    are not coalesced.
     """
 
-    def __init__(self, url, logger=LOGGER, ssl_verify=False):
+    def __init__(self,
+                 url,
+                 logger=LOGGER,
+                 ssl_verify=False,
+                 pool_size=POOL_SIZE,
+                 retries=RETRIES,
+                 backoff_factor=BACKOFF_FACTOR,
+                 cache=None,
+                 metadata_cache=None,
+                 time_series_format="PI_JSON",
+                 compression=True,
+                 coalesce=True,
+                 exporters=None,
+                 tracer=None):
         self.document_format = "PI_JSON"
+        self.time_series_format = time_series_format
         self.url = url
         self.logger = logger
-        self.timer = Timer(logger)
+        self.instrumentation = Instrumentation(
+            exporters=[LoggingExporter(logger), *(exporters or [])],
+            tracer=tracer
+            )
         self.ssl_verify = ssl_verify
+        self.session = create_session(
+            pool_size=pool_size,
+            retries=retries,
+            backoff_factor=backoff_factor,
+            compression=compression
+            )
+        self.metrics = Metrics()
+        self.cache = cache
+        self.metadata_cache = metadata_cache
+        self.single_flight = SingleFlight() if coalesce else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the pooled connections of the session."""
+        self.session.close()
 
     def __kwargs(self, url_post_fix: str, kwargs: dict) -> dict:
         kwargs = {**kwargs, **dict(
             url=f"{self.url}{url_post_fix}",
             document_format=self.document_format,
+            metrics=self.metrics,
+            session=self.session,
             verify=self.ssl_verify,
             logger=self.logger)}
         kwargs.pop("self")
         return kwargs
 
+    def __coalesce(self, function, kwargs: dict):
+        if self.single_flight is None:
+            return function(**kwargs)
+        return self.single_flight.do(request_key(kwargs), function, **kwargs)
+
+    def __memoize(self, endpoint: str, function, kwargs: dict):
+        with self.instrumentation.span(f"get_{endpoint}") as span:
+            if self.metadata_cache is None:
+                result = self.__coalesce(function, kwargs)
+            else:
+                key = json.dumps(
+                    {k: v for k, v in kwargs.items()
+                     if k not in ["metrics", "session", "verify", "logger"]},
+                    sort_keys=True,
+                    default=str
+                    )
+                result = self.metadata_cache.get(
+                    endpoint, key, function, **kwargs
+                    )
+            span.set(rows=len(result))
+        return result
+
     def get_parameters(self, filter_id=None):
 
         kwargs = self.__kwargs(url_post_fix="parameters", kwargs=locals())
-        result = get_parameters(**kwargs)
+        result = self.__memoize("parameters", get_parameters, kwargs)
 
         return result
 
@@ -56,17 +157,24 @@ class Api:
         """Get filters as dictionary, or sub-filters if a filter_id is specified."""
 
         kwargs = self.__kwargs(url_post_fix="filters", kwargs=locals())
-        result = get_filters(**kwargs)
+        result = self.__memoize("filters", get_filters, kwargs)
 
         return result
 
     def get_locations(self,
                       filter_id=None,
-                      attributes=[]):
-        """Get location en return as a GeoDataFrame."""
+                      attributes=[],
+                      geometry=True):
+        """
+        Get location en return as a GeoDataFrame.
+
+        Attributes are added as typed columns, attributes=True adds all. With
+        geometry=False a DataFrame with float x and y columns is returned and no
+        point geometry is built.
+        """
 
         kwargs = self.__kwargs(url_post_fix="locations", kwargs=locals())
-        result = get_locations(**kwargs)
+        result = self.__memoize("locations", get_locations, kwargs)
 
         return result
 
@@ -79,8 +187,12 @@ class Api:
             columns "name" and "group_id".
 
         """
-        url = f"{self.url}qualifiers"
-        result = get_qualifiers(url, verify=self.ssl_verify, logger=self.logger)
+        kwargs = dict(url=f"{self.url}qualifiers",
+                      metrics=self.metrics,
+                      session=self.session,
+                      verify=self.ssl_verify,
+                      logger=self.logger)
+        result = self.__memoize("qualifiers", get_qualifiers, kwargs)
         return result
 
     def get_time_series(
@@ -94,10 +206,95 @@ class Api:
             thinning=None,
             only_headers=False,
             show_statistics=False,
-            parallel=False
+            parallel=False,
+            max_concurrency=MAX_CONCURRENCY,
+            max_events=None,
+            compact=False,
+            lazy=False,
+            document_format=None,
+            plot_width=None
             ):
+        """
+        Get FEWS time series as a TimeSeriesSet.
+
+        With parallel=True the request is split into one request per location
+        and parameter. These run concurrently on one session with at most
+        max_concurrency requests in flight and are merged into one set.
+
+        With max_events (and a start_time and end_time) the request is planned
+        from its headers into location batches and time slices of at most
+        max_events events, fetched concurrently and stitched without
+        duplicates at slice boundaries.
+
+        With compact=True events are kept as numpy arrays and converted to a
+        pandas DataFrame the first time they are accessed. With a dtype, e.g.
+        compact="float32", values are kept in that dtype (half the memory).
+
+        With lazy=True only the headers are fetched. The events of a time
+        series are fetched when accessed, or for a subset in batched requests
+        with TimeSeriesSet.prefetch.
+
+        With plot_width (pixels) and without thinning, thinning is derived
+        from the time window, so FEWS returns about one event per pixel. Call
+        again with the zoomed window to fetch a higher resolution.
+        """
 
         kwargs = self.__kwargs(url_post_fix="timeseries", kwargs=locals())
-        result = get_time_series(**kwargs)
+        kwargs["document_format"] = document_format or self.time_series_format
+        if (plot_width is not None) and (thinning is None) and start_time and (
+                end_time):
+            kwargs["thinning"] = thinning_for_width(
+                start_time, end_time, plot_width
+                )
+        kwargs.pop("lazy")
+        with self.instrumentation.span("get_time_series") as span:
+            if lazy and not only_headers:
+                headers = self.__coalesce(
+                    get_time_series, {**kwargs, "only_headers": True}
+                    )
+                result = EventsLoader(self.__load_events, **kwargs).attach(
+                    headers
+                    )
+            else:
+                result = self.__coalesce(self.__get_time_series, kwargs)
+            span.set(**time_series_counts(result))
+
+        return result
 
+    def __load_events(self, **kwargs):
+        with self.instrumentation.span("load_events") as span:
+            result = self.__get_time_series(**kwargs)
+            span.set(**time_series_counts(result))
         return result
+
+    def __get_time_series(self, **kwargs):
+        if (self.cache is not None) and kwargs["start_time"] and (
+                kwargs["end_time"]) and (not kwargs["only_headers"]):
+            return self.cache.get_time_series(get_time_series, **kwargs)
+        return get_time_series(**kwargs)
+
+    def iter_time_series(
+            self,
+            filter_id,
+            location_ids=None,
+            start_time=None,
+            end_time=None,
+            parameter_ids=None,
+            qualifier_ids=None,
+            thinning=None,
+            only_headers=False,
+            show_statistics=False,
+            chunk_size=CHUNK_SIZE,
+            compact=False,
+            document_format=None
+            ):
+        """
+        Iterate over FEWS time series while the response is streamed.
+
+        Yields TimeSeries objects one by one, so peak memory scales with the
+        largest time series instead of the whole response.
+        """
+
+        kwargs = self.__kwargs(url_post_fix="timeseries", kwargs=locals())
+        kwargs["document_format"] = document_format or self.time_series_format
+        yield from iter_time_series(**kwargs)
@@ -0,0 +1,225 @@
+"""
+Module for calling the FEWS REST API from asynchronous code.
+
+AsyncApi mirrors Api with awaitable methods, so FEWS requests can be awaited in
+a running event loop (e.g. a Bokeh server callback) without blocking it. All
+requests share one aiohttp session.
+"""
+
+import logging
+
+import aiohttp
+import pandas as pd
+
+from .get_filters import get_filters_async
+from .get_locations import get_locations_async
+from .get_parameters import get_parameters_async
+from .get_qualifiers import get_qualifiers_async
+from .get_time_series_async import fetch_pi_time_series, get_time_series_async
+from .get_time_series_chunked import get_time_series_chunked
+from .time_series import TimeSeriesSet
+from .utils.asynchronous import MAX_CONCURRENCY
+from .utils.coalescing import AsyncSingleFlight, request_key
+from .utils.downsampling import thinning_for_width
+from .utils.instrumentation import (
+    Instrumentation,
+    LoggingExporter,
+    time_series_counts
+    )
+from .utils.transformations import parameters_to_fews
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncApi:
+    """
+    Asynchronous FEWS PI-REST api it needs an server url and a logger.
+
+    The aiohttp session is created on first use inside the running event loop
+    and limits the number of open connections to max_concurrency. Close it with
+    close, or use the api as an async context manager:
+
+        async with AsyncApi(url) as api:
+            time_series_set = await api.get_time_series(filter_id)
+
+    With coalesce (default), identical requests awaited while the first is in
+    flight share its request and result, as in Api.
+
+    Every call is a span in instrumentation, recording its latency and number
+    of time series and events (or rows) as in Api.
+    """
+
+    def __init__(self,
+                 url,
+                 logger=LOGGER,
+                 ssl_verify=False,
+                 max_concurrency=MAX_CONCURRENCY,
+                 time_series_format="PI_JSON",
+                 coalesce=True,
+                 exporters=None,
+                 tracer=None):
+        self.document_format = "PI_JSON"
+        self.time_series_format = time_series_format
+        self.url = url
+        self.logger = logger
+        self.instrumentation = Instrumentation(
+            exporters=[LoggingExporter(logger), *(exporters or [])],
+            tracer=tracer
+            )
+        self.ssl_verify = ssl_verify
+        self.max_concurrency = max_concurrency
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session, created on first use."""
+        if (self._session is None) or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency)
+                )
+        return self._session
+
+    async def close(self):
+        """Close the connections of the session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def __kwargs(self, url_post_fix: str, kwargs: dict) -> dict:
+        kwargs = {**kwargs, **dict(
+            url=f"{self.url}{url_post_fix}",
+            document_format=self.document_format,
+            session=self.session,
+            verify=self.ssl_verify,
+            logger=self.logger)}
+        kwargs.pop("self")
+        return kwargs
+
+    async def __request(self, name: str, function, kwargs: dict):
+        with self.instrumentation.span(name) as span:
+            if self.single_flight is None:
+                result = await function(**kwargs)
+            else:
+                result = await self.single_flight.do(
+                    request_key(kwargs), function, **kwargs
+                    )
+            if isinstance(result, TimeSeriesSet):
+                span.set(**time_series_counts(result))
+            else:
+                span.set(rows=len(result))
+        return result
+
+    async def get_parameters(self, filter_id=None):
+        kwargs = self.__kwargs(url_post_fix="parameters", kwargs=locals())
+        result = await self.__request(
+            "get_parameters", get_parameters_async, kwargs
+            )
+
+        return result
+
+    async def get_filters(self, filter_id=None):
+        kwargs = self.__kwargs(url_post_fix="filters", kwargs=locals())
+        result = await self.__request(
+            "get_filters", get_filters_async, kwargs
+            )
+
+        return result
+
+    async def get_locations(self,
+                            filter_id=None,
+                            attributes=[],
+                            geometry=True):
+        """
+        Get FEWS locations as a GeoDataFrame, or a DataFrame with float x and
+        y columns if geometry is False. With attributes as a list of ids, or
+        True for all, attributes are added as typed columns.
+        """
+        kwargs = self.__kwargs(url_post_fix="locations", kwargs=locals())
+        result = await self.__request(
+            "get_locations", get_locations_async, kwargs
+            )
+
+        return result
+
+    async def get_qualifiers(self) -> pd.DataFrame:
+        kwargs = dict(url=f"{self.url}qualifiers",
+                      session=self.session,
+                      verify=self.ssl_verify,
+                      logger=self.logger)
+        result = await self.__request(
+            "get_qualifiers", get_qualifiers_async, kwargs
+            )
+
+        return result
+
+    async def get_time_series(
+            self,
+            filter_id,
+            location_ids=None,
+            start_time=None,
+            end_time=None,
+            parameter_ids=None,
+            qualifier_ids=None,
+            thinning=None,
+            only_headers=False,
+            show_statistics=False,
+            parallel=False,
+            max_concurrency=None,
+            max_events=None,
+            compact=False,
+            document_format=None,
+            plot_width=None
+            ) -> TimeSeriesSet:
+        """
+        Get FEWS time series as a TimeSeriesSet.
+
+        With parallel=True the request is split into one request per location
+        and parameter, with max_events (and a start_time and end_time) it is
+        split in chunks of at most max_events events, as in Api.get_time_series.
+        With plot_width (pixels) and without thinning, thinning is derived
+        from the time window.
+        """
+
+        kwargs = self.__kwargs(url_post_fix="timeseries", kwargs=locals())
+        kwargs["document_format"] = document_format or self.time_series_format
+        kwargs["max_concurrency"] = max_concurrency or self.max_concurrency
+        if (plot_width is not None) and (thinning is None) and start_time and (
+                end_time):
+            kwargs["thinning"] = thinning_for_width(
+                start_time, end_time, plot_width
+                )
+        kwargs.pop("plot_width")
+
+        result = await self.__request(
+            "get_time_series", self.__get_time_series, kwargs
+            )
+
+        return result
+
+    async def __get_time_series(self, parallel, max_events, **kwargs):
+        if (max_events is not None) and kwargs["start_time"] and (
+                kwargs["end_time"]) and (not kwargs["only_headers"]):
+            kwargs.pop("only_headers")
+            return await get_time_series_chunked(**kwargs, max_events=max_events)
+
+        if parallel:
+            return await get_time_series_async(**kwargs)
+
+        pi_time_series = await fetch_pi_time_series(
+            kwargs["url"],
+            [parameters_to_fews(kwargs)],
+            max_concurrency=kwargs["max_concurrency"],
+            session=self.session,
+            verify=self.ssl_verify,
+            logger=self.logger
+            )
+        return TimeSeriesSet.from_pi_time_series(
+            pi_time_series[0], compact=kwargs["compact"]
+            )
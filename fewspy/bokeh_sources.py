@@ -0,0 +1,195 @@
+"""
+Bokeh ColumnDataSources of FEWS time series.
+
+Sources hold NumPy arrays (no lists), which Bokeh sends as binary buffers.
+Arrays are used as is, only read-only arrays (e.g. of pandas copy-on-write
+frames) are copied once, as patches are applied in place. On refresh only the
+changes are sent: rows after the last datetime are streamed, changed values of
+existing rows are patched. The data is replaced only if the refresh inserts
+datetimes in between existing rows or adds time series.
+
+Usage in a Bokeh server app:
+
+    source = TimeSeriesSource(time_series)
+    figure.line(x="datetime", y="value", source=source.source)
+    ...
+    source.update(new_time_series)  # e.g. in a periodic callback
+"""
+
+from typing import Dict, List
+
+import numpy as np
+from bokeh.models import ColumnDataSource
+
+from .time_series import TimeSeries, TimeSeriesSet, nan_equal
+
+DATETIME = "datetime"
+
+
+def _writable(array: np.ndarray) -> np.ndarray:
+    return array if array.flags.writeable else array.copy()
+
+
+def _tail(data: Dict[str, np.ndarray], rollover: int = None) -> dict:
+    """The last rollover rows of data, all rows if rollover is None."""
+    if rollover is None:
+        return dict(data)
+    return {k: v[-rollover:] if rollover else v[:0] for k, v in data.items()}
+
+
+def update_source(source: ColumnDataSource,
+                  data: Dict[str, np.ndarray],
+                  rollover: int = None) -> Dict[str, int]:
+    """
+    Update a source with new data, sending only new and changed rows
+
+    Rows of data after the last datetime of the source are streamed. Rows at
+    datetimes already in the source are compared and changed values patched.
+    Source rows absent in data are kept, rows of data before the first
+    datetime of the source (e.g. dropped by rollover) are ignored. If data
+    has other columns or rows in between the datetimes of the source, the
+    data of the source is replaced by (the last rollover rows of) data.
+
+    Args:
+        source (ColumnDataSource): source with a sorted "datetime" column
+        data (Dict[str, np.ndarray]): new data with the same columns
+        rollover (int, optional): maximum number of rows kept when streaming.
+        Defaults to None (unlimited).
+
+    Returns:
+        Dict[str, int]: number of "streamed" and "patched" rows, "replaced" is
+        1 if the data of the source is replaced
+
+    """
+
+    result = {"streamed": 0, "patched": 0, "replaced": 0}
+    current = source.data
+    datetime = np.asarray(current.get(DATETIME, []), dtype="datetime64[ns]")
+    new_datetime = np.asarray(data[DATETIME], dtype="datetime64[ns]")
+
+    if (len(datetime) == 0) or (set(current.keys()) != set(data.keys())):
+        source.data = _tail(data, rollover)
+        result["replaced"] = 1
+        return result
+
+    # rows within the current period must exist in the source
+    start = int(np.searchsorted(new_datetime, datetime[0]))
+    end = int(np.searchsorted(new_datetime, datetime[-1], side="right"))
+    positions = np.searchsorted(datetime, new_datetime[start:end])
+    found = positions < len(datetime)
+    found[found] = datetime[positions[found]] == new_datetime[start:end][found]
+    if not found.all():
+        source.data = _tail(data, rollover)
+        result["replaced"] = 1
+        return result
+
+    # patch changed values
+    patches = {}
+    for column, values in data.items():
+        if column == DATETIME:
+            continue
+        old = np.asarray(current[column])[positions]
+        new = values[start:end]
+        changed = ~nan_equal(old, new)
+        if changed.any():
+            patches[column] = [
+                (int(i), j) for i, j in zip(positions[changed],
+                                            new[changed].tolist())
+                ]
+            result["patched"] += int(changed.sum())
+    if patches:
+        source.patch(patches)
+
+    # stream new rows
+    if end < len(new_datetime):
+        source.stream({k: v[end:] for k, v in data.items()}, rollover=rollover)
+        result["streamed"] = len(new_datetime) - end
+
+    return result
+
+
+def time_series_data(time_series: TimeSeries) -> Dict[str, np.ndarray]:
+    """Events of a TimeSeries as "datetime", "value" and "flag" arrays."""
+    datetime, value, flag = time_series.to_arrays()
+    return {DATETIME: datetime,
+            "value": _writable(value),
+            "flag": _writable(flag)}
+
+
+def column_name(time_series: TimeSeries) -> str:
+    """Source column of a time series: location, parameter and qualifiers."""
+    return "|".join(
+        [time_series.header.location_id, time_series.header.parameter_id]
+        + list(time_series.header.qualifier_id or [])
+        )
+
+
+def time_series_set_data(time_series_set: TimeSeriesSet,
+                         column: str = "value") -> Dict[str, np.ndarray]:
+    """Aligned values of all time series, one column per time series."""
+    df = time_series_set.to_frame(column)
+    data = {DATETIME: df.index.to_numpy()}
+    values = df.to_numpy()
+    for i, time_series in enumerate(time_series_set.time_series):
+        data[column_name(time_series)] = _writable(values[:, i])
+    return data
+
+
+class TimeSeriesSource:
+    """
+    ColumnDataSource of one TimeSeries with "datetime", "value" and "flag".
+
+    Args:
+        time_series (TimeSeries): time series to show
+        rollover (int, optional): maximum number of rows kept when streaming
+    """
+
+    def __init__(self, time_series: TimeSeries, rollover: int = None):
+        self.rollover = rollover
+        self.source = ColumnDataSource(
+            data=_tail(time_series_data(time_series), rollover)
+            )
+
+    def update(self, time_series: TimeSeries) -> Dict[str, int]:
+        """Stream new and patch changed events, see update_source."""
+        return update_source(
+            self.source, time_series_data(time_series), self.rollover
+            )
+
+
+class TimeSeriesSetSource:
+    """
+    ColumnDataSource of all time series of a TimeSeriesSet on aligned datetimes.
+
+    Columns are "datetime" and one column per time series, named by
+    column_name (location_id|parameter_id|qualifier_ids).
+
+    Args:
+        time_series_set (TimeSeriesSet): time series to show
+        column (str, optional): events column, "value" or "flag". Defaults to
+        "value".
+        rollover (int, optional): maximum number of rows kept when streaming
+    """
+
+    def __init__(self,
+                 time_series_set: TimeSeriesSet,
+                 column: str = "value",
+                 rollover: int = None):
+        self.column = column
+        self.rollover = rollover
+        self.source = ColumnDataSource(
+            data=_tail(time_series_set_data(time_series_set, column), rollover)
+            )
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of the time series columns."""
+        return [i for i in self.source.data.keys() if i != DATETIME]
+
+    def update(self, time_series_set: TimeSeriesSet) -> Dict[str, int]:
+        """Stream new and patch changed rows, see update_source."""
+        return update_source(
+            self.source,
+            time_series_set_data(time_series_set, self.column),
+            self.rollover
+            )
@@ -0,0 +1,455 @@
+"""
+Local caches for FEWS PI-REST responses.
+
+TimeSeriesCache stores time series in a SQLite file. Per request (filter,
+locations, parameters and qualifiers) it keeps the time window that has been
+fetched, so repeated requests only fetch the missing head and/or tail of the
+window from FEWS.
+
+MetadataCache keeps filters, locations, parameters and qualifiers in memory
+for a time-to-live per endpoint.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+
+from .time_series import Events, Header, TimeSeries, TimeSeriesSet
+
+METADATA_TTL = {
+    "filters": 3600,
+    "locations": 3600,
+    "parameters": 3600,
+    "qualifiers": 3600
+    }
+METADATA_MAX_SIZE = 128
+
+# increase on incompatible changes of SCHEMA, older cache files are emptied
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    key TEXT PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    version TEXT,
+    time_zone REAL
+);
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    location_id TEXT,
+    parameter_id TEXT,
+    qualifier_id TEXT,
+    header TEXT NOT NULL,
+    UNIQUE (key, location_id, parameter_id, qualifier_id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    series_id INTEGER NOT NULL,
+    datetime INTEGER NOT NULL,
+    value REAL,
+    flag REAL,
+    PRIMARY KEY (series_id, datetime)
+) WITHOUT ROWID;
+"""
+
+
+def _sorted_ids(ids: Union[str, List[str]]) -> Union[List[str], None]:
+    if ids is None:
+        return None
+    elif isinstance(ids, str):
+        return [ids]
+    else:
+        return sorted(ids)
+
+
+def request_key(
+        filter_id: str,
+        location_ids: Union[str, List[str]] = None,
+        parameter_ids: Union[str, List[str]] = None,
+        qualifier_ids: Union[str, List[str]] = None,
+        thinning: int = None
+        ) -> str:
+    """
+    Normalized cache key of a time series request
+
+    Args:
+        filter_id (str): FEWS filter id
+        location_ids (Union[str, List[str]], optional): FEWS location ids
+        parameter_ids (Union[str, List[str]], optional): FEWS parameter ids
+        qualifier_ids (Union[str, List[str]], optional): FEWS qualifier ids
+        thinning (int, optional): FEWS thinning
+
+    Returns:
+        str: JSON string, independent of the order of ids
+
+    """
+
+    return json.dumps([
+        filter_id,
+        _sorted_ids(location_ids),
+        _sorted_ids(parameter_ids),
+        _sorted_ids(qualifier_ids),
+        thinning
+        ])
+
+
+class TimeSeriesCache:
+    """SQLite store of FEWS time series with incremental refresh."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self.path.as_posix(), check_same_thread=False
+            )
+        with self._lock, self._connection:
+            version = self._connection.execute(
+                "PRAGMA user_version"
+                ).fetchone()[0]
+            if version < SCHEMA_VERSION:
+                self._connection.executescript(
+                    "DROP TABLE IF EXISTS requests; "
+                    "DROP TABLE IF EXISTS series; "
+                    "DROP TABLE IF EXISTS events;"
+                    )
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        """Close the SQLite connection."""
+        self._connection.close()
+
+    def coverage(self, key: str) -> Union[tuple, None]:
+        """Return (start_time, end_time) fetched for a request key, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT start_time, end_time FROM requests WHERE key = ?", (key,)
+                ).fetchone()
+        if row is None:
+            return None
+        return tuple(datetime.fromisoformat(i) for i in row)
+
+    def clear(self, key: str = None):
+        """Remove one request key or (default) everything from the cache."""
+        with self._lock, self._connection:
+            if key is None:
+                self._connection.execute("DELETE FROM events")
+                self._connection.execute("DELETE FROM series")
+                self._connection.execute("DELETE FROM requests")
+            else:
+                self._connection.execute(
+                    "DELETE FROM events WHERE series_id IN "
+                    "(SELECT id FROM series WHERE key = ?)", (key,)
+                    )
+                self._connection.execute(
+                    "DELETE FROM series WHERE key = ?", (key,)
+                    )
+                self._connection.execute(
+                    "DELETE FROM requests WHERE key = ?", (key,)
+                    )
+
+    def put(self,
+            key: str,
+            time_series_set: TimeSeriesSet,
+            start_time: datetime,
+            end_time: datetime):
+        """
+        Merge a fetched TimeSeriesSet into the cache and extend the coverage
+
+        Events at existing datetimes are replaced by the newly fetched ones.
+
+        Args:
+            key (str): request key, see request_key
+            time_series_set (TimeSeriesSet): fetched time series
+            start_time (datetime): start of the fetched window
+            end_time (datetime): end of the fetched window
+
+        """
+
+        with self._lock, self._connection:
+            cursor = self._connection.cursor()
+            row = cursor.execute(
+                "SELECT start_time, end_time FROM requests WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None:
+                start_time = min(start_time, datetime.fromisoformat(row[0]))
+                end_time = max(end_time, datetime.fromisoformat(row[1]))
+            cursor.execute(
+                "INSERT OR REPLACE INTO requests VALUES (?, ?, ?, ?, ?)",
+                (key,
+                 start_time.isoformat(),
+                 end_time.isoformat(),
+                 time_series_set.version,
+                 time_series_set.time_zone)
+                )
+
+            for time_series in time_series_set.time_series:
+                header = time_series.header
+                qualifier_id = json.dumps(header.qualifier_id)
+                cursor.execute(
+                    "INSERT INTO series "
+                    "(key, location_id, parameter_id, qualifier_id, header) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key, location_id, parameter_id, qualifier_id) "
+                    "DO UPDATE SET header = excluded.header",
+                    (key,
+                     header.location_id,
+                     header.parameter_id,
+                     qualifier_id,
+                     json.dumps(header.to_pi_header()))
+                    )
+                series_id = cursor.execute(
+                    "SELECT id FROM series WHERE key = ? AND location_id = ? "
+                    "AND parameter_id = ? AND qualifier_id = ?",
+                    (key, header.location_id, header.parameter_id, qualifier_id)
+                    ).fetchone()[0]
+
+                events = time_series.events
+                if events.empty:
+                    continue
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?)",
+                    zip([series_id] * len(events),
+                        events.index.values.astype("datetime64[ns]")
+                        .astype(np.int64).tolist(),
+                        events["value"].astype(float).tolist(),
+                        events["flag"].astype(float).tolist())
+                    )
+
+    def get(self,
+            key: str,
+            start_time: datetime,
+            end_time: datetime) -> TimeSeriesSet:
+        """
+        Read the cached time series of a request key within a time window
+
+        The window is in UTC, like FEWS start_time and end_time. Events are in
+        the time zone of the FEWS response, so the window is shifted by it.
+
+        Args:
+            key (str): request key, see request_key
+            start_time (datetime): start of the window
+            end_time (datetime): end of the window
+
+        Returns:
+            TimeSeriesSet: cached time series
+
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT version, time_zone FROM requests WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                return TimeSeriesSet()
+            version, time_zone = row
+            offset = timedelta(hours=time_zone if time_zone else 0)
+            window = [
+                np.datetime64(i + offset, "ns").astype(np.int64).item()
+                for i in (start_time, end_time)
+                ]
+
+            time_series = []
+            for series_id, header in self._connection.execute(
+                    "SELECT id, header FROM series WHERE key = ? ORDER BY id",
+                    (key,)
+                    ).fetchall():
+                rows = self._connection.execute(
+                    "SELECT datetime, value, flag FROM events WHERE series_id = ? "
+                    "AND datetime BETWEEN ? AND ? ORDER BY datetime",
+                    (series_id, *window)
+                    ).fetchall()
+                array = np.array(
+                    rows, dtype=[("datetime", "i8"), ("value", "f8"), ("flag", "f8")]
+                    )
+                flag = array["flag"]
+                if not np.isnan(flag).any():
+                    flag = flag.astype(np.int8)
+                events = Events.from_arrays(
+                    array["datetime"].astype("datetime64[ns]"),
+                    array["value"],
+                    flag
+                    )
+                time_series.append(
+                    TimeSeries(
+                        header=Header.from_pi_header(json.loads(header)),
+                        events=events
+                        )
+                    )
+
+        return TimeSeriesSet(
+            version=version,
+            time_zone=time_zone,
+            time_series=time_series,
+            empty=len(time_series) == 0
+            )
+
+    def get_time_series(self,
+                        fetch: Callable[..., TimeSeriesSet],
+                        filter_id: str,
+                        start_time: datetime,
+                        end_time: datetime,
+                        location_ids: Union[str, List[str]] = None,
+                        parameter_ids: Union[str, List[str]] = None,
+                        qualifier_ids: Union[str, List[str]] = None,
+                        thinning: int = None,
+                        **kwargs) -> TimeSeriesSet:
+        """
+        Get time series, fetching only what is missing in the cache
+
+        If the window starts before the cached window its head is fetched, if
+        it ends after the cached window its tail is fetched (including the last
+        cached moment, so late updates are picked up). The cached window is
+        kept contiguous.
+
+        Args:
+            fetch (Callable[..., TimeSeriesSet]): function doing the request,
+            e.g. get_time_series, called with all other arguments
+            filter_id (str): FEWS filter id
+            start_time (datetime): start of the window
+            end_time (datetime): end of the window
+
+        Returns:
+            TimeSeriesSet: time series within the window
+
+        """
+
+        key = request_key(
+            filter_id, location_ids, parameter_ids, qualifier_ids, thinning
+            )
+        coverage = self.coverage(key)
+        if coverage is None:
+            windows = [(start_time, end_time)]
+        else:
+            windows = []
+            if start_time < coverage[0]:
+                windows.append((start_time, coverage[0]))
+            if end_time > coverage[1]:
+                windows.append((coverage[1], end_time))
+
+        for window_start, window_end in windows:
+            time_series_set = fetch(
+                filter_id=filter_id,
+                start_time=window_start,
+                end_time=window_end,
+                location_ids=location_ids,
+                parameter_ids=parameter_ids,
+                qualifier_ids=qualifier_ids,
+                thinning=thinning,
+                **kwargs
+                )
+            # a failed request returns an empty set without version
+            if time_series_set.empty and (time_series_set.version is None):
+                continue
+            self.put(key, time_series_set, window_start, window_end)
+
+        return self.get(key, start_time, end_time)
+
+
+def _is_empty(value) -> bool:
+    """True for None and empty results, e.g. of a failed request."""
+    return (value is None) or (hasattr(value, "__len__") and len(value) == 0)
+
+
+class MetadataCache:
+    """
+    In-memory LRU cache with a time-to-live per endpoint.
+
+    Results are stored under an endpoint and a key (e.g. url and parameters). At
+    most max_size results are kept, the least recently used is dropped first.
+    Concurrent calls for the same missing key wait for the first one, so the
+    endpoint is called once. Results are deep-copied on the way out, so callers
+    can modify them. Empty results are not stored, as the get_* functions
+    return them for error responses.
+    """
+
+    def __init__(self,
+                 ttl: Dict[str, float] = None,
+                 max_size: int = METADATA_MAX_SIZE):
+        self.ttl = {**METADATA_TTL, **(ttl or {})}
+        self.max_size = max_size
+        self.hits = Counter()
+        self.misses = Counter()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, endpoint: str, key: str):
+        """Return (True, value) for a valid entry, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get((endpoint, key))
+            if entry is not None:
+                expires, value = entry
+                if expires > time.monotonic():
+                    self._entries.move_to_end((endpoint, key))
+                    self.hits[endpoint] += 1
+                    return True, value
+                del self._entries[(endpoint, key)]
+        return False, None
+
+    def get(self, endpoint: str, key: str, function: Callable, **kwargs):
+        """
+        Return the cached result of an endpoint or call function(**kwargs)
+
+        Args:
+            endpoint (str): endpoint name, selects the time-to-live
+            key (str): key of the result within the endpoint
+            function (Callable): function to call on a miss
+
+        Returns:
+            a copy of the (cached) result
+
+        """
+
+        found, value = self._lookup(endpoint, key)
+        if not found:
+            with self._lock:
+                key_lock = self._key_locks.setdefault(
+                    (endpoint, key), threading.Lock()
+                    )
+            with key_lock:
+                # another thread may have loaded it while we waited
+                found, value = self._lookup(endpoint, key)
+                if not found:
+                    value = function(**kwargs)
+                    with self._lock:
+                        self.misses[endpoint] += 1
+                        if not _is_empty(value):
+                            self._entries[(endpoint, key)] = (
+                                time.monotonic() + self.ttl.get(endpoint, 0),
+                                value
+                                )
+                            self._entries.move_to_end((endpoint, key))
+                            while len(self._entries) > self.max_size:
+                                self._entries.popitem(last=False)
+                        self._key_locks.pop((endpoint, key), None)
+
+        return copy.deepcopy(value)
+
+    def invalidate(self, endpoint: str = None):
+        """Drop all results of one endpoint or (default) all results."""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                for key in [i for i in self._entries if i[0] == endpoint]:
+                    del self._entries[key]
+
+    @property
+    def stats(self) -> Dict[str, dict]:
+        """Hit and miss counts per endpoint."""
+        endpoints = set(self.hits) | set(self.misses)
+        return {i: {"hits": self.hits[i], "misses": self.misses[i]}
+                for i in sorted(endpoints)}
@@ -0,0 +1,166 @@
+"""
+Document formats of FEWS PI time series responses.
+
+Every format parses a response to the FEWS PI JSON structure, so the same
+TimeSeriesSet and TimeSeries parsers are used for all formats:
+{"version": ..., "timeZone": ..., "timeSeries": [{"header": ..., "events": ...}]}
+
+Formats are looked up by their FEWS documentFormat name. Other formats can be
+added with register_format.
+"""
+
+import json
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple
+from xml.etree import ElementTree
+
+from .utils.streaming import iter_json_array
+
+NS = "{http://www.wldelft.nl/fews/PI}"
+
+
+class DocumentFormat(NamedTuple):
+    """Parsers of a FEWS PI document format."""
+    loads: Callable[[bytes], dict]
+    iter_time_series: Callable[[Iterable[bytes]], Iterator[dict]]
+
+
+def _tag(element: ElementTree.Element) -> str:
+    return element.tag.rpartition("}")[2]
+
+
+def _series_to_dict(series_element: ElementTree.Element) -> dict:
+    """
+    Convert a PI XML series element to a PI JSON time series dict
+
+    Header elements become strings, or dicts if they have attributes (e.g.
+    timeStep, startDate). Events become their attribute dicts.
+
+    Args:
+        series_element (ElementTree.Element): PI XML series element
+
+    Returns:
+        dict: FEWS PI time series with header and events (if any)
+
+    """
+
+    header, events = {}, []
+    for element in series_element:
+        tag = _tag(element)
+        if tag == "event":
+            events.append(element.attrib)
+        elif tag == "header":
+            for i in element:
+                key = _tag(i)
+                value = i.attrib if i.attrib else i.text
+                if key == "qualifierId":
+                    header.setdefault(key, []).append(value)
+                else:
+                    header[key] = value
+
+    pi_time_series = {"header": header}
+    if events:
+        pi_time_series["events"] = events
+    return pi_time_series
+
+
+def loads_pi_json(content: bytes) -> dict:
+    """Parse a PI JSON response."""
+    return json.loads(content)
+
+
+def iter_pi_json(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """Yield PI time series dicts while reading a PI JSON response."""
+    return iter_json_array(chunks, "timeSeries")
+
+
+def loads_pi_xml(content: bytes) -> dict:
+    """
+    Parse a PI XML response to the FEWS PI JSON structure
+
+    Args:
+        content (bytes): PI XML TimeSeries document
+
+    Returns:
+        dict: FEWS PI time series
+
+    """
+
+    root = ElementTree.fromstring(content)
+    result = {"timeSeries": []}
+    if "version" in root.attrib.keys():
+        result["version"] = root.attrib["version"]
+    for element in root:
+        tag = _tag(element)
+        if tag == "series":
+            result["timeSeries"].append(_series_to_dict(element))
+        elif tag == "timeZone":
+            result["timeZone"] = element.text
+    return result
+
+
+def iter_pi_xml(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Yield PI time series dicts while reading a PI XML response
+
+    The document is parsed incrementally and every series element is removed
+    from the tree once converted, so only one series is kept in memory.
+
+    Args:
+        chunks (Iterable[bytes]): PI XML document as chunks of bytes, e.g.
+        requests.Response.iter_content()
+
+    Yields:
+        dict: FEWS PI time series
+
+    """
+
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    root = None
+
+    def _read_events():
+        nonlocal root
+        for event, element in parser.read_events():
+            if root is None:
+                root = element
+            elif (event == "end") and (element.tag == f"{NS}series"):
+                yield _series_to_dict(element)
+                root.remove(element)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _read_events()
+    parser.close()
+    yield from _read_events()
+
+
+FORMATS: Dict[str, DocumentFormat] = {
+    "PI_JSON": DocumentFormat(loads_pi_json, iter_pi_json),
+    "PI_XML": DocumentFormat(loads_pi_xml, iter_pi_xml)
+    }
+
+
+def register_format(document_format: str,
+                    loads: Callable[[bytes], dict],
+                    iter_time_series: Callable[[Iterable[bytes]], Iterator[dict]]):
+    """
+    Register parsers for a FEWS documentFormat
+
+    Args:
+        document_format (str): FEWS documentFormat, e.g. "PI_XML"
+        loads (Callable[[bytes], dict]): parses a response to a FEWS PI dict
+        iter_time_series (Callable[[Iterable[bytes]], Iterator[dict]]): yields
+        FEWS PI time series dicts from response chunks
+
+    """
+
+    FORMATS[document_format] = DocumentFormat(loads, iter_time_series)
+
+
+def get_format(document_format: str) -> DocumentFormat:
+    """Get the parsers of a FEWS documentFormat, raises ValueError if unknown."""
+    if document_format not in FORMATS.keys():
+        raise ValueError(
+            f"documentFormat '{document_format}' not supported, use one of "
+            f"{list(FORMATS.keys())}"
+            )
+    return FORMATS[document_format]
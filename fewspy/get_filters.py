@@ -1,16 +1,26 @@
 import requests
+import aiohttp
+import json
 import logging
 from typing import List
+from .utils.asynchronous import client_session, fetch
+from .utils.metrics import Metrics, record_response
 from .utils.timer import Timer
 from .utils.transformations import parameters_to_fews
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _parse_filters(pi_filters: dict) -> List[dict]:
+    return pi_filters.get("filters", [])
+
+
 def get_filters(
         url: str,
         filter_id: str = None,
         document_format: str = "PI_JSON",
+        metrics: Metrics = None,
+        session: requests.Session = None,
         verify: bool = False,
         logger=LOGGER
         ) -> List[dict]:
@@ -20,6 +30,10 @@ def get_filters(
     Args:
         url (str): url Delft-FEWS PI REST WebService.
         E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/qualifiers
+        metrics (Metrics, optional): collector to record transfer metrics of
+        the response in. Defaults to None.
+        session (requests.Session, optional): session to do the request with.
+        By default a one-off requests.get is used.
         verify (bool, optional): passed to requests.get verify parameter.
         Defaults to False.
         logger (logging.Logger, optional): Logger to pass logging to. By
@@ -34,16 +48,57 @@ def get_filters(
     # do the request
     timer = Timer(logger)
     parameters = parameters_to_fews(locals())
-    response = requests.get(url, parameters, verify=verify)
+    response = (session or requests).get(url, parameters, verify=verify)
+    timer.report("Filters request")
+
+    # parse the response
+    result = []
+    with record_response(metrics, response, "filters"):
+        if response.status_code == 200:
+            result = _parse_filters(response.json())
+            timer.report("Filters parsed")
+        else:
+            logger.error(f"FEWS Server responds {response.text}")
+
+    return result
+
+
+async def get_filters_async(
+        url: str,
+        filter_id: str = None,
+        document_format: str = "PI_JSON",
+        session: aiohttp.ClientSession = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> List[dict]:
+    """
+    Get FEWS filters without blocking the event loop
+
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/filters
+        session (aiohttp.ClientSession, optional): session to share. By default
+        a session is created and closed for this call.
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        List[dict]: FEWS filters
+
+    """
+
+    # do the request
+    timer = Timer(logger)
+    parameters = parameters_to_fews(locals())
+    async with client_session(session) as session:
+        content = await fetch(session, url, parameters, verify, logger)
     timer.report("Filters request")
 
     # parse the response
     result = []
-    if response.status_code == 200:
-        if "filters" in response.json().keys():
-            result = response.json()["filters"]
+    if content is not None:
+        result = _parse_filters(json.loads(content))
         timer.report("Filters parsed")
-    else:
-        logger.error(f"FEWS Server responds {response.text}")
 
     return result
@@ -1,11 +1,16 @@
 import requests
+import aiohttp
+import json
 import pandas as pd
 import geopandas as gpd
 import logging
+from .utils.asynchronous import client_session, fetch
+from .utils.metrics import Metrics, record_response
 from .utils.timer import Timer
 from .utils.transformations import parameters_to_fews
+from typing import List, Union
 from .utils.conversions import (
-    attributes_to_array,
+    attributes_to_frame,
     camel_to_snake_case,
     geo_datum_to_crs,
     xy_array_to_point
@@ -15,11 +20,45 @@ from .utils.conversions import (
 LOGGER = logging.getLogger(__name__)
 
 
+def _parse_locations(
+        pi_locations: dict,
+        attributes: Union[List[str], bool] = [],
+        geometry: bool = True
+        ) -> pd.DataFrame:
+    # convert to df and snake_case
+    df = pd.DataFrame(pi_locations["locations"])
+    df.columns = [camel_to_snake_case(i) for i in df.columns]
+    df.set_index("location_id", inplace=True)
+
+    # handle geometry and crs
+    if geometry:
+        gdf = gpd.GeoDataFrame(
+            df,
+            geometry=xy_array_to_point(df[["x", "y"]].values),
+            crs=geo_datum_to_crs(pi_locations["geoDatum"])
+            )
+    else:
+        gdf = df.astype({"x": float, "y": float})
+
+    # handle attributes
+    if attributes and ("attributes" in gdf.columns):
+        df_attributes = attributes_to_frame(
+            gdf["attributes"].values,
+            None if attributes is True else attributes
+            )
+        for column in df_attributes.columns:
+            gdf[column] = df_attributes[column].values
+    return gdf.drop(columns=["attributes"], errors="ignore")
+
+
 def get_locations(
         url: str,
         filter_id: str = None,
         document_format: str = "PI_JSON",
-        attributes: list = [],
+        attributes: Union[List[str], bool] = [],
+        geometry: bool = True,
+        metrics: Metrics = None,
+        session: requests.Session = None,
         verify: bool = False,
         logger=LOGGER
         ) -> pd.DataFrame:
@@ -29,6 +68,15 @@ def get_locations(
     Args:
         url (str): url Delft-FEWS PI REST WebService.
         E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/qualifiers
+        attributes (Union[List[str], bool], optional): attribute ids to add as
+        typed columns, or True to add all attributes. Defaults to [].
+        geometry (bool, optional): return a GeoDataFrame with point geometry.
+        If False a DataFrame with float x and y columns is returned. Defaults
+        to True.
+        metrics (Metrics, optional): collector to record transfer metrics of
+        the response in. Defaults to None.
+        session (requests.Session, optional): session to do the request with.
+        By default a one-off requests.get is used.
         verify (bool, optional): passed to requests.get verify parameter.
         Defaults to False.
         logger (logging.Logger, optional): Logger to pass logging to. By
@@ -43,31 +91,65 @@ def get_locations(
     # do the request
     timer = Timer(logger)
     parameters = parameters_to_fews(locals())
-    response = requests.get(url, parameters, verify=verify)
+    response = (session or requests).get(url, parameters, verify=verify)
     timer.report("Locations request")
 
     # parse the response
-    if response.status_code == 200:
-        # convert to gdf and snake_case
-        gdf = gpd.GeoDataFrame(response.json()["locations"])
-        gdf.columns = [camel_to_snake_case(i) for i in gdf.columns]
-        gdf.set_index("location_id", inplace=True)
-
-        # handle geometry and crs
-        gdf["geometry"] = xy_array_to_point(gdf[["x", "y"]].values)
-        gdf.crs = geo_datum_to_crs(response.json()["geoDatum"])
-
-        # handle attributes
-        if attributes:
-            gdf.loc[:, attributes] = attributes_to_array(
-                gdf["attributes"].values,
-                attributes)
-        gdf.drop(columns=["attributes"], inplace=True)
+    with record_response(metrics, response, "locations"):
+        if response.status_code == 200:
+            gdf = _parse_locations(response.json(), attributes, geometry)
+            timer.report("Locations parsed")
+        else:
+            logger.error(f"FEWS Server responds {response.text}")
+            gdf = gpd.GeoDataFrame() if geometry else pd.DataFrame()
 
-        timer.report("Locations parsed")
+    return gdf
+
+
+async def get_locations_async(
+        url: str,
+        filter_id: str = None,
+        document_format: str = "PI_JSON",
+        attributes: Union[List[str], bool] = [],
+        geometry: bool = True,
+        session: aiohttp.ClientSession = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> pd.DataFrame:
+    """
+    Get FEWS locations as a (Geo)DataFrame without blocking the event loop
 
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/locations
+        attributes (Union[List[str], bool], optional): attribute ids to add as
+        typed columns, or True to add all attributes. Defaults to [].
+        geometry (bool, optional): return a GeoDataFrame with point geometry.
+        If False a DataFrame with float x and y columns is returned. Defaults
+        to True.
+        session (aiohttp.ClientSession, optional): session to share. By default
+        a session is created and closed for this call.
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        df (pandas.DataFrame): (Geo)DataFrame with index "location_id"
+
+    """
+
+    # do the request
+    timer = Timer(logger)
+    parameters = parameters_to_fews(locals())
+    async with client_session(session) as session:
+        content = await fetch(session, url, parameters, verify, logger)
+    timer.report("Locations request")
+
+    # parse the response
+    if content is not None:
+        gdf = _parse_locations(json.loads(content), attributes, geometry)
+        timer.report("Locations parsed")
     else:
-        logger.error(f"FEWS Server responds {response.text}")
-        gdf = gpd.GeoDataFrame()
+        gdf = gpd.GeoDataFrame() if geometry else pd.DataFrame()
 
     return gdf
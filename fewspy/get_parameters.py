@@ -1,7 +1,11 @@
 import requests
+import aiohttp
+import json
 import logging
 import pandas as pd
 from typing import List
+from .utils.asynchronous import client_session, fetch
+from .utils.metrics import Metrics, record_response
 from .utils.timer import Timer
 from .utils.transformations import parameters_to_fews
 from .utils.conversions import camel_to_snake_case
@@ -18,10 +22,21 @@ COLUMNS = [
     ]
 
 
+def _parse_parameters(pi_parameters: dict) -> pd.DataFrame:
+    df = pd.DataFrame(columns=COLUMNS)
+    if "timeSeriesParameters" in pi_parameters.keys():
+        df = pd.DataFrame(pi_parameters["timeSeriesParameters"])
+        df.columns = [camel_to_snake_case(i) for i in df.columns]
+        df["uses_datum"] = df["uses_datum"] == "true"
+    return df.set_index("id")
+
+
 def get_parameters(
         url: str,
         filter_id: str = None,
         document_format: str = "PI_JSON",
+        metrics: Metrics = None,
+        session: requests.Session = None,
         verify: bool = False,
         logger=LOGGER
         ) -> List[dict]:
@@ -31,6 +46,10 @@ def get_parameters(
     Args:
         url (str): url Delft-FEWS PI REST WebService.
         E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/qualifiers
+        metrics (Metrics, optional): collector to record transfer metrics of
+        the response in. Defaults to None.
+        session (requests.Session, optional): session to do the request with.
+        By default a one-off requests.get is used.
         verify (bool, optional): passed to requests.get verify parameter.
         Defaults to False.
         logger (logging.Logger, optional): Logger to pass logging to. By
@@ -45,19 +64,51 @@ def get_parameters(
     # do the request
     timer = Timer(logger)
     parameters = parameters_to_fews(locals())
-    response = requests.get(url, parameters, verify=verify)
+    response = (session or requests).get(url, parameters, verify=verify)
     timer.report("Parameters request")
 
     # parse the response
-    df = pd.DataFrame(columns=COLUMNS)
-    if response.status_code == 200:
-        if "timeSeriesParameters" in response.json().keys():
-            df = pd.DataFrame(response.json()["timeSeriesParameters"])
-            df.columns = [camel_to_snake_case(i) for i in df.columns]
-            df["uses_datum"] = df["uses_datum"] == "true"
-    else:
-        logger.error(f"FEWS Server responds {response.text}")
-
-    df.set_index("id", inplace=True)
+    with record_response(metrics, response, "parameters"):
+        if response.status_code == 200:
+            df = _parse_parameters(response.json())
+        else:
+            logger.error(f"FEWS Server responds {response.text}")
+            df = _parse_parameters({})
 
     return df
+
+
+async def get_parameters_async(
+        url: str,
+        filter_id: str = None,
+        document_format: str = "PI_JSON",
+        session: aiohttp.ClientSession = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> pd.DataFrame:
+    """
+    Get FEWS parameters as a pandas DataFrame without blocking the event loop
+
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/parameters
+        session (aiohttp.ClientSession, optional): session to share. By default
+        a session is created and closed for this call.
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        df (pandas.DataFrame): Pandas dataframe with index "id"
+
+    """
+
+    # do the request
+    timer = Timer(logger)
+    parameters = parameters_to_fews(locals())
+    async with client_session(session) as session:
+        content = await fetch(session, url, parameters, verify, logger)
+    timer.report("Parameters request")
+
+    # parse the response
+    return _parse_parameters({} if content is None else json.loads(content))
@@ -1,7 +1,10 @@
 import requests
+import aiohttp
 from xml.etree import ElementTree
 import pandas as pd
 import logging
+from .utils.asynchronous import client_session, fetch
+from .utils.metrics import Metrics, record_response
 from .utils.timer import Timer
 
 NS = "{http://www.wldelft.nl/fews/PI}"
@@ -42,8 +45,19 @@ def _element_to_tuple(
     return (ident, name, group_id)
 
 
+def _parse_qualifiers(content: bytes) -> pd.DataFrame:
+    tree = ElementTree.fromstring(content)
+    qualifiers_tree = [i for i in tree.iter(tag=f"{NS}qualifier")]
+    qualifiers_tuple = (_element_to_tuple(i) for i in qualifiers_tree)
+    return pd.DataFrame(qualifiers_tuple, columns=COLUMNS)
+
+
 def get_qualifiers(
-        url: str, verify: bool = False, logger=LOGGER
+        url: str,
+        metrics: Metrics = None,
+        session: requests.Session = None,
+        verify: bool = False,
+        logger=LOGGER
         ) -> pd.DataFrame:
     """
     Get FEWS qualifiers as Pandas DataFrame
@@ -51,6 +65,10 @@ def get_qualifiers(
     Args:
         url (str): url Delft-FEWS PI REST WebService.
         E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/qualifiers
+        metrics (Metrics, optional): collector to record transfer metrics of
+        the response in. Defaults to None.
+        session (requests.Session, optional): session to do the request with.
+        By default a one-off requests.get is used.
         verify (bool, optional): passed to requests.get verify parameter.
         Defaults to False.
         logger (logging.Logger, optional): Logger to pass logging to. By
@@ -64,20 +82,59 @@ def get_qualifiers(
 
     # do the request
     timer = Timer(logger)
-    response = requests.get(url, verify=False)
+    response = (session or requests).get(url, verify=verify)
     timer.report("Qualifiers request")
 
     logger.debug(response.url)
 
     # parse the response
-    if response.status_code == 200:
-        tree = ElementTree.fromstring(response.content)
-        qualifiers_tree = [i for i in tree.iter(tag=f"{NS}qualifier")]
-        qualifiers_tuple = (_element_to_tuple(i) for i in qualifiers_tree)
-        df = pd.DataFrame(qualifiers_tuple, columns=COLUMNS)
+    with record_response(metrics, response, "qualifiers"):
+        if response.status_code == 200:
+            df = _parse_qualifiers(response.content)
+            timer.report("Qualifiers parsed")
+        else:
+            logger.error(f"FEWS Server responds {response.text}")
+            df = pd.DataFrame(columns=COLUMNS)
+    df.set_index("id", inplace=True)
+
+    return df
+
+
+async def get_qualifiers_async(
+        url: str,
+        session: aiohttp.ClientSession = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> pd.DataFrame:
+    """
+    Get FEWS qualifiers as Pandas DataFrame without blocking the event loop
+
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/qualifiers
+        session (aiohttp.ClientSession, optional): session to share. By default
+        a session is created and closed for this call.
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        df (pandas.DataFrame): Pandas dataframe with index "id" and columns
+        "name" and "group_id".
+
+    """
+
+    # do the request
+    timer = Timer(logger)
+    async with client_session(session) as session:
+        content = await fetch(session, url, verify=verify, logger=logger)
+    timer.report("Qualifiers request")
+
+    # parse the response
+    if content is not None:
+        df = _parse_qualifiers(content)
         timer.report("Qualifiers parsed")
     else:
-        logger.error(f"FEWS Server responds {response.text}")
         df = pd.DataFrame(columns=COLUMNS)
     df.set_index("id", inplace=True)
 
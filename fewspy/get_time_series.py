@@ -1,16 +1,22 @@
 import requests
-import pandas as pd
 import logging
+import time
+from .utils.asynchronous import run_sync
+from .utils.downsampling import thinning_for_width
+from .utils.metrics import Metrics, count_bytes, record_response
 from .utils.timer import Timer
 from .utils.transformations import parameters_to_fews
-from typing import List, Union
-from .time_series import TimeSeriesSet
+from typing import Iterator, List, Union
+from .time_series import TimeSeries, TimeSeriesSet
+from .get_time_series_async import get_time_series_async, MAX_CONCURRENCY
+from .get_time_series_chunked import get_time_series_chunked
+from .formats import get_format
+from .lazy import EventsLoader
 from datetime import datetime
-import aiohttp
-import asyncio
 
 
 LOGGER = logging.getLogger(__name__)
+CHUNK_SIZE = 2 ** 20
 
 
 def _ts_or_headers(only_headers=False):
@@ -33,49 +39,200 @@ def get_time_series(
         show_statistics: bool = False,
         document_format: str = "PI_JSON",
         parallel: bool = False,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_events: int = None,
+        compact: Union[bool, str] = False,
+        lazy: bool = False,
+        plot_width: int = None,
+        metrics: Metrics = None,
+        session: requests.Session = None,
         verify: bool = False,
         logger=LOGGER
-        ) -> pd.DataFrame:
+        ) -> TimeSeriesSet:
     """
-    Get FEWS qualifiers as a pandas DataFrame
+    Get FEWS time series as a TimeSeriesSet
 
     Args:
         url (str): url Delft-FEWS PI REST WebService.
-        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/qualifiers
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/timeseries
+        document_format (str, optional): "PI_JSON" or "PI_XML", or another
+        format registered in fewspy.formats. Defaults to "PI_JSON".
+        parallel (bool, optional): split the request into one request per
+        location and parameter and run these concurrently. Defaults to False.
+        max_concurrency (int, optional): maximum number of parallel requests
+        in flight. Defaults to 8.
+        max_events (int, optional): events per request budget. If specified
+        with start_time and end_time, the request is split in location batches
+        and time slices within this budget that are fetched concurrently.
+        compact (Union[bool, str], optional): keep events as compact arrays
+        that are converted to pandas on first access, with values as a dtype
+        (e.g. "float32") or float64 if True. Defaults to False.
+        lazy (bool, optional): fetch only the headers and fetch the events of
+        a time series when these are accessed, or in batches with
+        TimeSeriesSet.prefetch. Defaults to False.
+        plot_width (int, optional): width of the plot in pixels. If specified
+        with start_time and end_time and without thinning, thinning is set to
+        the milliseconds per pixel. Zooming in (a shorter window at the same
+        width) thus fetches a higher resolution, up to the full resolution.
+        metrics (Metrics, optional): collector to record transfer metrics of
+        the response in. Defaults to None.
+        session (requests.Session, optional): session to do the request with.
+        By default a one-off requests.get is used.
         verify (bool, optional): passed to requests.get verify parameter.
         Defaults to False.
         logger (logging.Logger, optional): Logger to pass logging to. By
         default a logger will ge created.
 
     Returns:
-        df (pandas.DataFrame): Pandas dataframe with index "id" and columns
-        "name" and "group_id".
+        TimeSeriesSet: FEWS time series
 
     """
+    if (plot_width is not None) and (thinning is None) and start_time and (
+            end_time):
+        thinning = thinning_for_width(start_time, end_time, plot_width)
+
+    if lazy and not only_headers:
+        kwargs = {k: v for k, v in locals().items() if k != "lazy"}
+        headers = get_time_series(**{**kwargs, "only_headers": True})
+        return EventsLoader(get_time_series, **kwargs).attach(headers)
+
+    if (max_events is not None) and start_time and end_time and (
+            not only_headers):
+        return run_sync(
+            get_time_series_chunked(
+                url=url,
+                filter_id=filter_id,
+                start_time=start_time,
+                end_time=end_time,
+                location_ids=location_ids,
+                parameter_ids=parameter_ids,
+                qualifier_ids=qualifier_ids,
+                thinning=thinning,
+                show_statistics=show_statistics,
+                document_format=document_format,
+                max_events=max_events,
+                max_concurrency=max_concurrency,
+                compact=compact,
+                verify=verify,
+                logger=logger
+                )
+            )
+
+    if parallel:
+        return run_sync(
+            get_time_series_async(
+                url=url,
+                filter_id=filter_id,
+                location_ids=location_ids,
+                parameter_ids=parameter_ids,
+                qualifier_ids=qualifier_ids,
+                start_time=start_time,
+                end_time=end_time,
+                thinning=thinning,
+                only_headers=only_headers,
+                show_statistics=show_statistics,
+                document_format=document_format,
+                max_concurrency=max_concurrency,
+                compact=compact,
+                verify=verify,
+                logger=logger
+                )
+            )
+
     report_string = _ts_or_headers(only_headers)
 
     # do the request
     timer = Timer(logger)
+    document = get_format(document_format)
     parameters = parameters_to_fews(locals())
-    print("parameters=",parameters)
-    
-    if (parallel==False):
-        response = requests.get(url, parameters, verify=verify)
-        timer.report(report_string.format(status="request"))
-    
-        # parse the response
- 
-        if response.status_code == 200:
-            pi_time_series = response.json()
-            time_series_set = TimeSeriesSet.from_pi_time_series(pi_time_series)
-            timer.report(report_string.format(status="parsed"))
-        else:
-            logger.error(f"FEWS Server responds {response.text}")
-            time_series_set = TimeSeriesSet()
+    response = (session or requests).get(url, parameters, verify=verify)
+    timer.report(report_string.format(status="request"))
 
-   
-           
-        time_series_set = result_async
-        print(time_series_set)
+    # parse the response
+    if response.status_code == 200:
+        with record_response(metrics, response, "timeseries") as record:
+            pi_time_series = document.loads(response.content)
+            start = time.perf_counter()
+            time_series_set = TimeSeriesSet.from_pi_time_series(
+                pi_time_series, compact=compact
+                )
+            record["build_time"] = time.perf_counter() - start
+        timer.report(report_string.format(status="parsed"))
+    else:
+        with record_response(metrics, response, "timeseries"):
+            logger.error(f"FEWS Server responds {response.text}")
+        time_series_set = TimeSeriesSet()
 
     return time_series_set
+
+
+def iter_time_series(
+        url: str,
+        filter_id: str,
+        location_ids: Union[str, List[str]] = None,
+        parameter_ids: Union[str, List[str]] = None,
+        qualifier_ids: Union[str, List[str]] = None,
+        start_time: datetime = None,
+        end_time: datetime = None,
+        thinning: int = None,
+        only_headers: bool = False,
+        show_statistics: bool = False,
+        document_format: str = "PI_JSON",
+        chunk_size: int = CHUNK_SIZE,
+        compact: Union[bool, str] = False,
+        metrics: Metrics = None,
+        session: requests.Session = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> Iterator[TimeSeries]:
+    """
+    Stream FEWS time series one by one from a PI JSON or PI XML response
+
+    The response is read in chunks and parsed incrementally, so peak memory
+    scales with the largest single time series instead of the whole response.
+
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/timeseries
+        document_format (str, optional): "PI_JSON" or "PI_XML", or another
+        format registered in fewspy.formats. Defaults to "PI_JSON".
+        chunk_size (int, optional): number of bytes read from the response at
+        once. Defaults to 1 MiB.
+        compact (Union[bool, str], optional): keep events as compact arrays
+        that are converted to pandas on first access, with values as a dtype
+        (e.g. "float32") or float64 if True. Defaults to False.
+        metrics (Metrics, optional): collector to record transfer metrics of
+        the response in. Defaults to None.
+        session (requests.Session, optional): session to do the request with.
+        By default a one-off requests.get is used.
+        verify (bool, optional): passed to requests.get verify parameter.
+        Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Yields:
+        TimeSeries: FEWS time series
+
+    """
+    report_string = _ts_or_headers(only_headers)
+
+    # do the request
+    timer = Timer(logger)
+    document = get_format(document_format)
+    parameters = parameters_to_fews(locals())
+    with (session or requests).get(
+            url, parameters, verify=verify, stream=True
+            ) as response:
+        timer.report(report_string.format(status="request"))
+
+        # parse the response while reading it, decode time includes transfer
+        with record_response(metrics, response, "timeseries") as record:
+            if response.status_code == 200:
+                pi_time_series = document.iter_time_series(count_bytes(
+                    response.iter_content(chunk_size=chunk_size), record
+                    ))
+                for i in pi_time_series:
+                    yield TimeSeries.from_pi_time_series(i, compact=compact)
+                timer.report(report_string.format(status="streamed"))
+            else:
+                logger.error(f"FEWS Server responds {response.text}")
@@ -1,25 +1,114 @@
-# -*- coding: utf-8 -*-
 """
-Created on Mon Jun 13 11:44:06 2022
+Module for fetching FEWS time series concurrently.
 
-@author: ngoor
+A time series request is split into one request per location and parameter. All
+requests share one aiohttp session and the number of requests in flight is
+limited by max_concurrency. The responses are merged into one TimeSeriesSet.
 """
-import requests
-import pandas as pd
+
+import asyncio
 import logging
-from .utils.timer import Timer
-from .utils.transformations import parameters_to_fews
-from typing import List, Union
-from .time_series import TimeSeriesSet
 from datetime import datetime
-import aiohttp
-import asyncio
+from itertools import product
+from typing import List, Union
 
+import aiohttp
 
+from .formats import get_format
+from .time_series import TimeSeriesSet
+from .utils.asynchronous import MAX_CONCURRENCY, client_session, fetch
+from .utils.timer import Timer
+from .utils.transformations import parameters_to_fews
 
 LOGGER = logging.getLogger(__name__)
 
-def get_time_series_async(
+
+def _to_list(ids: Union[str, List[str]]) -> list:
+    """Convert an id, list of ids or None to a list to split requests on."""
+    if ids is None:
+        return [None]
+    elif isinstance(ids, str):
+        return [ids]
+    else:
+        return list(ids)
+
+
+def merge_pi_time_series(pi_time_series_sets: List[dict]) -> dict:
+    """
+    Merge FEWS PI time series responses into one PI time series dict
+
+    Args:
+        pi_time_series_sets (List[dict]): FEWS PI time series responses
+
+    Returns:
+        dict: FEWS PI time series with version and timeZone of the first
+        response having these and the timeSeries of all responses
+
+    """
+
+    result = {"timeSeries": []}
+    for pi_time_series_set in pi_time_series_sets:
+        for key in ["version", "timeZone"]:
+            if (key in pi_time_series_set.keys()) and (key not in result.keys()):
+                result[key] = pi_time_series_set[key]
+        if "timeSeries" in pi_time_series_set.keys():
+            result["timeSeries"] += pi_time_series_set["timeSeries"]
+    return result
+
+
+async def _fetch(
+        session: aiohttp.ClientSession,
+        url: str,
+        parameters: dict,
+        semaphore: asyncio.Semaphore,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> dict:
+    """Fetch and parse one FEWS PI response, returns an empty dict on failure."""
+
+    document = get_format(parameters.get("documentFormat", "PI_JSON"))
+    async with semaphore:
+        content = await fetch(session, url, parameters, verify, logger)
+    return {} if content is None else document.loads(content)
+
+
+async def fetch_pi_time_series(
+        url: str,
+        requests_parameters: List[dict],
+        max_concurrency: int = MAX_CONCURRENCY,
+        session: aiohttp.ClientSession = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> List[dict]:
+    """
+    Fetch FEWS PI responses concurrently
+
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        requests_parameters (List[dict]): FEWS parameters per request
+        max_concurrency (int, optional): maximum number of requests in flight.
+        Defaults to 8.
+        session (aiohttp.ClientSession, optional): session to share. By default
+        a session is created and closed for this call.
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        List[dict]: responses in order of requests_parameters, an empty dict for
+        failed requests
+
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with client_session(session, max_concurrency) as session:
+        return await asyncio.gather(
+            *[_fetch(session, url, i, semaphore, verify, logger)
+              for i in requests_parameters]
+            )
+
+
+async def get_time_series_async(
         url: str,
         filter_id: str,
         location_ids: Union[str, List[str]] = None,
@@ -28,65 +117,75 @@ def get_time_series_async(
         start_time: datetime = None,
         end_time: datetime = None,
         thinning: int = None,
-   #     only_headers: bool = False,
-   #     show_statistics: bool = False,
+        only_headers: bool = False,
+        show_statistics: bool = False,
         document_format: str = "PI_JSON",
-        parallel: bool = False,
+        max_concurrency: int = MAX_CONCURRENCY,
+        compact: Union[bool, str] = False,
+        session: aiohttp.ClientSession = None,
         verify: bool = False,
         logger=LOGGER
-        ) -> pd.DataFrame:
-        
-        parameters = parameters_to_fews(locals())
-
-        def _get_loop():
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            finally:
-                loop.set_debug(True)
-                return loop  
-            
-        async def get_timeseries_async(location_id, parameter_id,session):
-           """Get timerseries using FEWS (asynchronously)"""
-           parameters["locationIds"] = [location_id]
-           parameters["parameterIds"]= [parameter_id]
-           print(parameters["qualifierIds"])
-           parameters["qualifierIds"] = None
-           try:
-               response = await session.request(method='GET', url=url, params=parameters, verify_ssl=verify)
-               print(response.url)
-               response.raise_for_status()  
-           except Exception as err:
-               print(f"An error ocurred: {err}")
-               response ={"notimeSeries":"1"}
-           response_json = await response.json()
-           return response_json
-
-        async def run_program(location_id,parameter_id, session):
-         
-           """Wrapper for running program in an asynchronous manner"""
-           try:
-               response = await get_timeseries_async(location_id,parameter_id, session)
-               print(f"{len(response.get('timeSeries'))}")
-           except Exception as err:
-               print(f"Exception occured: {err}")
-               response ={"notimeSeries":"1"}
-               pass
-           return response
-       
-        async def asynciee():
-           async with aiohttp.ClientSession(loop=loop) as session:
-               print("fetching async")
-               fetch_all = [run_program(location_id,parameter_id,session) for location_id in location_ids for parameter_id in parameter_ids]
-               result_async = await asyncio.gather(*fetch_all)      
-               return result_async           
-
-        if __name__ == 'fewspy.get_time_series_async': 
-            print("name=",__name__)
-            loop = _get_loop()
-            result_async =loop.run_until_complete(asynciee())
-        timeseriesset = result_async
-        return(timeseriesset)
-   
+        ) -> TimeSeriesSet:
+    """
+    Get FEWS time series with one request per location and parameter
+
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/timeseries
+        filter_id (str): FEWS filter id
+        location_ids (Union[str, List[str]], optional): FEWS location ids
+        parameter_ids (Union[str, List[str]], optional): FEWS parameter ids
+        qualifier_ids (Union[str, List[str]], optional): FEWS qualifier ids,
+        passed unchanged to every request
+        max_concurrency (int, optional): maximum number of requests in flight.
+        Defaults to 8.
+        compact (Union[bool, str], optional): keep events as compact arrays
+        that are converted to pandas on first access, with values as a dtype
+        (e.g. "float32") or float64 if True. Defaults to False.
+        session (aiohttp.ClientSession, optional): session to share. By default
+        a session is created and closed for this call.
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        TimeSeriesSet: merged time series of all requests
+
+    """
+
+    timer = Timer(logger)
+    parameters = parameters_to_fews(locals())
+    parameters.pop("locationIds", None)
+    parameters.pop("parameterIds", None)
+
+    # one request per location and parameter
+    requests_parameters = []
+    for location_id, parameter_id in product(
+            _to_list(location_ids), _to_list(parameter_ids)
+            ):
+        request_parameters = {**parameters}
+        if location_id is not None:
+            request_parameters["locationIds"] = location_id
+        if parameter_id is not None:
+            request_parameters["parameterIds"] = parameter_id
+        requests_parameters.append(request_parameters)
+
+    # fan out over a shared session
+    pi_time_series_sets = await fetch_pi_time_series(
+        url,
+        requests_parameters,
+        max_concurrency=max_concurrency,
+        session=session,
+        verify=verify,
+        logger=logger
+        )
+    timer.report(f"TimeSeries requests ({len(requests_parameters)}x)")
+
+    # merge and parse the responses
+    pi_time_series = merge_pi_time_series(pi_time_series_sets)
+    time_series_set = TimeSeriesSet.from_pi_time_series(
+        pi_time_series, compact=compact
+        )
+    timer.report("TimeSeries parsed")
+
+    return time_series_set
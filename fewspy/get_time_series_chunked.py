@@ -0,0 +1,218 @@
+"""
+Module for fetching large FEWS time series requests in chunks.
+
+The headers of the request are fetched first to estimate the number of events per
+location from the time step. Locations are packed into batches and the time
+window is sliced, so every chunk stays within an events-per-request budget.
+Chunks are fetched concurrently and stitched back into one TimeSeriesSet.
+"""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Union
+
+import aiohttp
+
+from .get_time_series_async import fetch_pi_time_series
+from .time_series import TimeSeriesSet
+from .utils.asynchronous import MAX_CONCURRENCY, client_session
+from .utils.conversions import datetime_to_fews_str
+from .utils.timer import Timer
+from .utils.transformations import parameters_to_fews
+
+LOGGER = logging.getLogger(__name__)
+MAX_EVENTS = 500_000
+NONEQUIDISTANT_TIME_STEP = timedelta(minutes=15)
+TIME_STEP_UNITS = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1)
+    }
+
+
+def time_step_to_timedelta(time_step: dict) -> timedelta:
+    """
+    Convert a FEWS PI time step to a timedelta
+
+    Args:
+        time_step (dict): FEWS PI time step (e.g. {"unit": "minute",
+        "multiplier": "15"})
+
+    Returns:
+        timedelta: time step, NONEQUIDISTANT_TIME_STEP for non-equidistant or
+        unknown time steps
+
+    """
+
+    if (not time_step) or (time_step.get("unit") not in TIME_STEP_UNITS.keys()):
+        return NONEQUIDISTANT_TIME_STEP
+    multiplier = float(time_step.get("multiplier", 1))
+    divider = float(time_step.get("divider", 1))
+    return TIME_STEP_UNITS[time_step["unit"]] * multiplier / divider
+
+
+def events_per_day(time_series_set: TimeSeriesSet) -> Dict[str, float]:
+    """Estimate events per day per location from the time series headers."""
+    result = {}
+    for time_series in time_series_set.time_series:
+        header = time_series.header
+        time_step = time_step_to_timedelta(header.time_step)
+        result[header.location_id] = result.get(header.location_id, 0) + (
+            timedelta(days=1) / time_step
+            )
+    return result
+
+
+def plan_requests(
+        start_time: datetime,
+        end_time: datetime,
+        events_per_day: Dict[str, float],
+        max_events: int = MAX_EVENTS
+        ) -> List[Tuple[datetime, datetime, List[str]]]:
+    """
+    Split a request into chunks within an events-per-request budget
+
+    Locations are packed into batches that fit the budget over the full
+    window. Locations that do not fit on their own get a batch of their own,
+    which is sliced in time. Slices share their boundaries, FEWS includes both.
+
+    Args:
+        start_time (datetime): start of the window
+        end_time (datetime): end of the window
+        events_per_day (Dict[str, float]): estimated events per day per
+        location
+        max_events (int, optional): events per request budget. Defaults to
+        500000.
+
+    Returns:
+        List[Tuple[datetime, datetime, List[str]]]: chunks as (start_time,
+        end_time, location_ids), per batch in order of time
+
+    """
+
+    days = max((end_time - start_time) / timedelta(days=1), 1e-9)
+    capacity = max_events / days
+
+    # pack locations into batches
+    batches, batch, batch_rate = [], [], 0.0
+    for location_id, rate in events_per_day.items():
+        if rate > capacity:
+            batches.append(([location_id], rate))
+            continue
+        if batch and (batch_rate + rate > capacity):
+            batches.append((batch, batch_rate))
+            batch, batch_rate = [], 0.0
+        batch.append(location_id)
+        batch_rate += rate
+    if batch:
+        batches.append((batch, batch_rate))
+
+    # slice batches in time
+    chunks = []
+    for location_ids, rate in batches:
+        slices = max(1, math.ceil(rate * days / max_events))
+        step = (end_time - start_time) / slices
+        edges = [start_time + step * i for i in range(slices)] + [end_time]
+        edges = [i.replace(microsecond=0) for i in edges]
+        chunks += [
+            (edges[i], edges[i + 1], location_ids) for i in range(slices)
+            ]
+
+    return chunks
+
+
+def _stitch(time_series_sets: List[TimeSeriesSet]) -> TimeSeriesSet:
+    """Merge time series of chunks, dropping duplicates at boundaries."""
+
+    time_series_set = TimeSeriesSet()
+    for i in time_series_sets:
+        time_series_set.add(i)
+    return time_series_set
+
+
+async def get_time_series_chunked(
+        url: str,
+        filter_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        location_ids: Union[str, List[str]] = None,
+        parameter_ids: Union[str, List[str]] = None,
+        qualifier_ids: Union[str, List[str]] = None,
+        thinning: int = None,
+        show_statistics: bool = False,
+        document_format: str = "PI_JSON",
+        max_events: int = MAX_EVENTS,
+        max_concurrency: int = MAX_CONCURRENCY,
+        compact: Union[bool, str] = False,
+        session: aiohttp.ClientSession = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> TimeSeriesSet:
+    """
+    Get FEWS time series in chunks within an events-per-request budget
+
+    Args:
+        url (str): url Delft-FEWS PI REST WebService.
+        E.g. http://localhost:8080/FewsWebServices/rest/fewspiservice/v1/timeseries
+        filter_id (str): FEWS filter id
+        start_time (datetime): start of the window
+        end_time (datetime): end of the window
+        max_events (int, optional): events per request budget. Defaults to
+        500000.
+        max_concurrency (int, optional): maximum number of requests in flight.
+        Defaults to 8.
+        compact (Union[bool, str], optional): keep events as compact arrays
+        that are converted to pandas on first access, with values as a dtype
+        (e.g. "float32") or float64 if True. Defaults to False.
+        session (aiohttp.ClientSession, optional): session to share. By default
+        a session is created and closed for this call.
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        TimeSeriesSet: stitched time series of all chunks
+
+    """
+
+    timer = Timer(logger)
+    parameters = parameters_to_fews(locals())
+    fetch_kwargs = dict(max_concurrency=max_concurrency,
+                        verify=verify,
+                        logger=logger)
+
+    async with client_session(session, max_concurrency) as session:
+        # headers to estimate the size of the request
+        pi_headers = await fetch_pi_time_series(
+            url, [{**parameters, "onlyHeaders": True}],
+            session=session,
+            **fetch_kwargs
+            )
+        headers = TimeSeriesSet.from_pi_time_series(pi_headers[0])
+        chunks = plan_requests(
+            start_time, end_time, events_per_day(headers), max_events
+            )
+        timer.report(f"Headers request, planned {len(chunks)} chunks")
+
+        requests_parameters = [
+            {**parameters,
+             "locationIds": i[2],
+             "startTime": datetime_to_fews_str(i[0]),
+             "endTime": datetime_to_fews_str(i[1])}
+            for i in chunks
+            ]
+        pi_time_series_sets = await fetch_pi_time_series(
+            url, requests_parameters, session=session, **fetch_kwargs
+            )
+    timer.report(f"TimeSeries requests ({len(chunks)}x)")
+
+    time_series_set = _stitch(
+        [TimeSeriesSet.from_pi_time_series(i, compact=compact)
+         for i in pi_time_series_sets]
+        )
+    timer.report("TimeSeries parsed")
+
+    return time_series_set
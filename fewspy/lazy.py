@@ -0,0 +1,70 @@
+"""
+Module for lazy loading of FEWS time series events.
+
+A lazy TimeSeriesSet is built from a cheap headers-only request. Every time
+series gets an EventsLoader that fetches its events the first time they are
+accessed. TimeSeriesSet.prefetch loads a subset in batched requests: one request
+per parameter for all locations in the batch.
+"""
+
+import threading
+from typing import Callable, List
+
+from .time_series import TimeSeries, TimeSeriesSet
+
+
+class EventsLoader:
+    """
+    Fetches events for lazy time series.
+
+    Args:
+        fetch (Callable[..., TimeSeriesSet]): function doing the request, e.g.
+        get_time_series, called with location_ids, parameter_ids and kwargs
+        **kwargs: arguments of the original request passed to fetch, e.g.
+        filter_id, start_time and end_time
+    """
+
+    def __init__(self, fetch: Callable[..., TimeSeriesSet], **kwargs):
+        self.fetch = fetch
+        self.kwargs = {**kwargs, "only_headers": False}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def attach(self, time_series_set: TimeSeriesSet) -> TimeSeriesSet:
+        """Make all time series in a headers-only TimeSeriesSet lazy."""
+        for time_series in time_series_set.time_series:
+            time_series._loader = self
+        return time_series_set
+
+    def load(self, time_series: List[TimeSeries]):
+        """
+        Fetch and set the events of time series in one request per parameter.
+
+        Time series that are absent in the response get empty events, so they
+        are fetched only once.
+
+        Args:
+            time_series (List[TimeSeries]): lazy time series to load
+
+        """
+
+        with self._lock:
+            # another thread may have loaded (some of) them meanwhile
+            time_series = [i for i in time_series if i._loader is self]
+            batches = {}
+            for i in time_series:
+                batches.setdefault(i.header.parameter_id, []).append(i)
+
+            for parameter_id, batch in batches.items():
+                location_ids = list(dict.fromkeys(
+                    i.header.location_id for i in batch
+                    ))
+                time_series_set = self.fetch(
+                    **{**self.kwargs,
+                       "location_ids": location_ids,
+                       "parameter_ids": parameter_id}
+                    )
+                self.requests += 1
+                loaded = {i.key: i for i in time_series_set.time_series}
+                for i in batch:
+                    i.load_from(loaded.get(i.key, TimeSeries(header=i.header)))
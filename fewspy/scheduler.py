@@ -0,0 +1,373 @@
+"""
+Module for refreshing FEWS time series shared by many subscribers.
+
+Every Bokeh session polling FEWS on its own makes N sessions watching the same
+view do N identical requests. A RefreshScheduler registers subscriptions by
+their request (filter, locations, parameters and other get_time_series
+arguments), fetches every distinct request once per interval and passes the
+result to all its subscribers. Server load scales with the number of distinct
+views instead of the number of sessions.
+
+Subscribers are called from the scheduler thread with the latest TimeSeriesSet
+and the delta: only the events that are new or changed since the previous
+refresh. In a Bokeh server app, hand the update to the session's document:
+
+    scheduler = shared_scheduler(api, interval=60)
+
+    def update(time_series_set, delta):
+        doc.add_next_tick_callback(partial(source.update, time_series_set))
+
+    subscription = scheduler.subscribe(update, filter_id, period=timedelta(2))
+    doc.on_session_destroyed(lambda context: subscription.cancel())
+"""
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from .api import Api
+from .time_series import Events, TimeSeries, TimeSeriesSet, nan_equal
+
+LOGGER = logging.getLogger(__name__)
+
+INTERVAL = 60
+
+_SCHEDULERS = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def _changed(previous: TimeSeries, current: TimeSeries) -> np.ndarray:
+    """Mask of the current events that are new or changed since previous."""
+    times, value, flag = current.to_arrays()
+    old_times, old_value, old_flag = previous.to_arrays()
+    positions = np.searchsorted(old_times, times)
+    found = positions < len(old_times)
+    found[found] = old_times[positions[found]] == times[found]
+    changed = ~found
+    old = positions[found]
+    changed[found] = ~(
+        nan_equal(old_value[old], value[found])
+        & nan_equal(old_flag[old], flag[found])
+        )
+    return changed
+
+
+def delta(previous: TimeSeriesSet, current: TimeSeriesSet) -> TimeSeriesSet:
+    """
+    Events of current that are new or changed compared to previous
+
+    Args:
+        previous (TimeSeriesSet): result of the previous refresh, or None
+        current (TimeSeriesSet): result of the latest refresh
+
+    Returns:
+        TimeSeriesSet: time series with new or changed events only, time series
+        without changes are left out
+
+    """
+
+    if previous is None:
+        return current
+
+    result = TimeSeriesSet(
+        version=current.version, time_zone=current.time_zone
+        )
+    for time_series in current.time_series:
+        header = time_series.header
+        old = previous.get(
+            header.location_id, header.parameter_id, header.qualifier_id
+            )
+        if old is None:
+            result.time_series.append(time_series)
+            continue
+        changed = _changed(old, time_series)
+        if changed.any():
+            times, value, flag = time_series.to_arrays()
+            result.time_series.append(TimeSeries(
+                header=header,
+                events=Events.from_arrays(
+                    times[changed], value[changed], flag[changed]
+                    )
+                ))
+    result.empty = len(result.time_series) == 0
+    return result
+
+
+class Subscription:
+    """
+    Registration of a subscriber to a view of a RefreshScheduler.
+
+    Args:
+        view (View): view the subscriber receives updates of
+        callback (Callable[[TimeSeriesSet, TimeSeriesSet], None]): called with
+        the latest TimeSeriesSet and the delta since the previous refresh
+    """
+
+    def __init__(self, view, callback: Callable):
+        self.view = view
+        self.callback = callback
+
+    def cancel(self):
+        """Stop receiving updates, the view is dropped without subscribers."""
+        self.view.scheduler.unsubscribe(self)
+
+
+class View:
+    """
+    One distinct get_time_series request and its subscribers.
+
+    With a period the request is for the window of period ending at the time
+    (UTC) of every refresh, otherwise kwargs are passed as is.
+    """
+
+    def __init__(self, scheduler, key: str, kwargs: dict, period: timedelta):
+        self.scheduler = scheduler
+        self.key = key
+        self.kwargs = kwargs
+        self.period = period
+        self.subscriptions: List[Subscription] = []
+        self.time_series_set: TimeSeriesSet = None
+        self.refreshed = None
+        self.requests = 0
+
+    def request_kwargs(self) -> dict:
+        if self.period is None:
+            return self.kwargs
+        # naive UTC, as datetimes are sent to FEWS as UTC
+        end_time = datetime.now(timezone.utc).replace(
+            tzinfo=None, microsecond=0
+            )
+        return {**self.kwargs,
+                "start_time": end_time - self.period,
+                "end_time": end_time}
+
+
+class RefreshScheduler:
+    """
+    Refreshes distinct time series views once per interval for all subscribers.
+
+    Args:
+        api (Api): api doing the requests
+        interval (float, optional): seconds between refreshes of a view.
+        Defaults to 60.
+        logger (logging.Logger, optional): logger of refresh errors
+    """
+
+    def __init__(self, api: Api, interval: float = INTERVAL, logger=LOGGER):
+        self.api = api
+        self.interval = interval
+        self.logger = logger
+        self.views: Dict[str, View] = {}
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self.views)
+
+    @property
+    def subscriptions(self) -> int:
+        """Number of subscriptions over all views."""
+        return sum(len(i.subscriptions) for i in self.views.values())
+
+    @property
+    def requests(self) -> int:
+        """Number of requests done by the scheduler."""
+        return sum(i.requests for i in self.views.values())
+
+    @staticmethod
+    def view_key(kwargs: dict, period: timedelta = None) -> str:
+        """Key of a request, equal for requests differing only in list order."""
+        def _normalize(value):
+            if isinstance(value, (list, tuple, set)):
+                return sorted(value)
+            return value
+
+        return json.dumps(
+            {"period": period,
+             **{k: _normalize(v) for k, v in kwargs.items() if v is not None}},
+            sort_keys=True,
+            default=str
+            )
+
+    def subscribe(self,
+                  callback: Callable[[TimeSeriesSet, TimeSeriesSet], None],
+                  filter_id,
+                  location_ids=None,
+                  parameter_ids=None,
+                  period: timedelta = None,
+                  **kwargs) -> Subscription:
+        """
+        Subscribe to the time series of a view.
+
+        A new subscriber of a view that has been refreshed gets the latest
+        TimeSeriesSet immediately (as both set and delta), a new view is
+        refreshed at the next run.
+
+        Args:
+            callback (Callable[[TimeSeriesSet, TimeSeriesSet], None]): called
+            with the latest TimeSeriesSet and the delta since the previous
+            refresh
+            filter_id (str): FEWS filter
+            location_ids (list, optional): FEWS locations. Defaults to None.
+            parameter_ids (list, optional): FEWS parameters. Defaults to None.
+            period (timedelta, optional): window ending at every refresh, used
+            instead of start_time and end_time. Defaults to None.
+            **kwargs: other arguments of Api.get_time_series, e.g. start_time,
+            end_time, thinning or compact
+
+        Returns:
+            Subscription: registration, cancel it to stop receiving updates
+
+        """
+
+        kwargs = {**kwargs,
+                  "filter_id": filter_id,
+                  "location_ids": location_ids,
+                  "parameter_ids": parameter_ids}
+        key = self.view_key(kwargs, period)
+        with self._lock:
+            view = self.views.get(key)
+            if view is None:
+                view = self.views[key] = View(self, key, kwargs, period)
+            subscription = Subscription(view, callback)
+            view.subscriptions.append(subscription)
+            time_series_set = view.time_series_set
+
+        if time_series_set is not None:
+            self._call(subscription, time_series_set, time_series_set)
+        else:
+            self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription, and its view if it has no subscribers left."""
+        with self._lock:
+            view = subscription.view
+            if subscription in view.subscriptions:
+                view.subscriptions.remove(subscription)
+            if not view.subscriptions:
+                self.views.pop(view.key, None)
+
+    def _call(self,
+              subscription: Subscription,
+              time_series_set: TimeSeriesSet,
+              delta: TimeSeriesSet):
+        try:
+            subscription.callback(time_series_set, delta)
+        except Exception:
+            self.logger.exception(f"subscriber of view {subscription.view.key}")
+
+    def refresh(self, view: View):
+        """
+        Fetch a view once and pass the result to all its subscribers.
+
+        If the request fails the previous result is kept and nothing is passed.
+        """
+        try:
+            time_series_set = self.api.get_time_series(**view.request_kwargs())
+        except Exception:
+            self.logger.exception(f"refresh of view {view.key}")
+            return
+        finally:
+            view.requests += 1
+            view.refreshed = time.monotonic()
+
+        # a failed request returns an empty set without version
+        if time_series_set.empty and (time_series_set.version is None):
+            self.logger.error(f"refresh of view {view.key} failed")
+            return
+
+        with self._lock:
+            changes = delta(view.time_series_set, time_series_set)
+            view.time_series_set = time_series_set
+            subscriptions = list(view.subscriptions)
+
+        if changes.empty and (changes is not time_series_set):
+            return
+        for subscription in subscriptions:
+            self._call(subscription, time_series_set, changes)
+
+    def run_pending(self) -> float:
+        """
+        Refresh all views that are due.
+
+        Returns:
+            float: seconds until the next view is due
+
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            due = [i for i in self.views.values() if (i.refreshed is None) or (
+                now - i.refreshed >= self.interval)]
+        for view in due:
+            self.refresh(view)
+
+        with self._lock:
+            refreshed = [i.refreshed for i in self.views.values()
+                         if i.refreshed is not None]
+            if len(refreshed) < len(self.views):
+                return 0.0
+        if not refreshed:
+            return self.interval
+        return max(0.0, min(refreshed) + self.interval - time.monotonic())
+
+    def _run(self):
+        while not self._stopped.is_set():
+            wait = self.run_pending()
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    @property
+    def running(self) -> bool:
+        return (self._thread is not None) and self._thread.is_alive()
+
+    def start(self):
+        """Start refreshing in a background (daemon) thread."""
+        if not self.running:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="fewspy-refresh", daemon=True
+                )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None):
+        """Stop the background thread after the running refresh."""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def shared_scheduler(api: Api, interval: float = INTERVAL) -> RefreshScheduler:
+    """
+    Process-wide running RefreshScheduler of a FEWS server
+
+    All callers with an api of the same url get the same scheduler, so all
+    sessions of a Bokeh server share its requests. The interval is set by the
+    first caller.
+
+    Args:
+        api (Api): api doing the requests
+        interval (float, optional): seconds between refreshes of a view.
+        Defaults to 60.
+
+    Returns:
+        RefreshScheduler: started scheduler
+
+    """
+
+    with _SCHEDULERS_LOCK:
+        scheduler = _SCHEDULERS.get(api.url)
+        if scheduler is None:
+            scheduler = _SCHEDULERS[api.url] = RefreshScheduler(api, interval)
+        return scheduler.start()
@@ -1,14 +1,20 @@
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import Dict, List, Tuple, Union
 from datetime import datetime
-from dataclasses import dataclass
-from .utils.conversions import camel_to_snake_case, dict_to_datetime
-from .utils.transformations import flatten_list
+from itertools import islice
+from dataclasses import dataclass, field, fields, replace
+from .utils.conversions import (
+    camel_to_snake_case,
+    dict_to_datetime,
+    snake_to_camel_case
+    )
 
 
-DATETIME_KEYS = ["start_date", "end_date"]
-FLOAT_KEYS = ["miss_val", "lat", "lon", "x", "y", "z"]
+DATETIME_KEYS = frozenset(["start_date", "end_date"])
+FLOAT_KEYS = frozenset(["miss_val", "lat", "lon", "x", "y", "z"])
 EVENT_COLUMNS = ["datetime", "value", "flag"]
+DATETIME_CHUNK_SIZE = 2 ** 16
 
 
 def reliables(df: pd.DataFrame, threshold: int = 6) -> pd.DataFrame:
@@ -27,7 +33,7 @@ def reliables(df: pd.DataFrame, threshold: int = 6) -> pd.DataFrame:
     return df.loc[df["flag"] < threshold]
 
 
-@dataclass
+@dataclass(slots=True)
 class Header:
     """FEWS-PI header-style dataclass"""
     type: str
@@ -46,12 +52,15 @@ class Header:
     station_name: str = None
     z: float = None
     qualifier_id: List[str] = None
+    extra: dict = None
 
     @classmethod
     def from_pi_header(cls, pi_header: dict):
         """
         Parse Header from FEWS PI header dict.
 
+        Keys that are not a Header field are kept (snake_case) in extra.
+
         Args:
             pi_header (dict): FEWS PI header as dictionary
 
@@ -60,20 +69,178 @@ class Header:
 
         """
 
-        def _convert_kv(k: str, v) -> dict:
-            k = camel_to_snake_case(k)
+        kwargs, extra = {}, {}
+        for k, v in pi_header.items():
+            k = HEADER_KEYS.get(k) or camel_to_snake_case(k)
             if k in DATETIME_KEYS:
                 v = dict_to_datetime(v)
-            if k in FLOAT_KEYS:
+            elif k in FLOAT_KEYS:
                 v = float(v)
-            return k, v
+            if k in HEADER_FIELDS:
+                kwargs[k] = v
+            else:
+                extra[k] = v
+        if extra:
+            kwargs["extra"] = extra
+        return cls(**kwargs)
+
+    def to_pi_header(self) -> dict:
+        """
+        Convert to a FEWS PI header dict, the inverse of from_pi_header.
+
+        Returns:
+            dict: FEWS PI header as dictionary with JSON-serializable values
+
+        """
+
+        pi_header = {}
+        items = [(i, getattr(self, i)) for i in HEADER_FIELDS]
+        for k, v in items + list((self.extra or {}).items()):
+            if v is None:
+                continue
+            if k in DATETIME_KEYS:
+                v = {"date": v.date().isoformat(), "time": v.time().isoformat()}
+            pi_header[snake_to_camel_case(k)] = v
+        return pi_header
+
+
+HEADER_FIELDS = frozenset(i.name for i in fields(Header)) - {"extra"}
+HEADER_KEYS = {snake_to_camel_case(i): i for i in HEADER_FIELDS}
+
+
+def pi_events_to_arrays(
+        pi_events: list,
+        missing_value: float = None
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse FEWS PI events to datetime, value and flag arrays in one pass per column
+
+    Args:
+        pi_events (list): FEWS PI events as list of dictionaries
+        missing_value (float, optional): value of missings to remove
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: datetime64[ns], float64 and
+        int8 arrays (float64 with NaN for flags if some events have no flag)
 
-        args = (_convert_kv(k, v) for k, v in pi_header.items())
-        return cls(**{i[0]: i[1] for i in args})
+    """
+
+    count = len(pi_events)
+
+    # datetime strings are parsed per chunk to limit peak memory
+    datetime = np.empty(count, dtype="datetime64[ns]")
+    events = iter(pi_events)
+    for start in range(0, count, DATETIME_CHUNK_SIZE):
+        datetime[start:start + DATETIME_CHUNK_SIZE] = np.array(
+            [f"{i['date']}T{i['time']}"
+             for i in islice(events, DATETIME_CHUNK_SIZE)],
+            dtype="datetime64[ns]"
+            )
+    value = np.fromiter(
+        (i["value"] for i in pi_events), dtype=np.float64, count=count
+        )
+    try:
+        flag = np.fromiter(
+            (i["flag"] for i in pi_events), dtype=np.int8, count=count
+            )
+    except KeyError:
+        flag = np.fromiter(
+            (i.get("flag", np.nan) for i in pi_events),
+            dtype=np.float64,
+            count=count
+            )
+
+    # remove missings
+    if missing_value is not None:
+        mask = value != missing_value
+        if not mask.all():
+            datetime, value, flag = datetime[mask], value[mask], flag[mask]
+
+    return datetime, value, flag
+
+
+def nan_equal(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise equality of values or flags, NaN equals NaN."""
+    equal = a == b
+    if np.issubdtype(a.dtype, np.floating) or (
+            np.issubdtype(b.dtype, np.floating)):
+        equal |= np.isnan(a) & np.isnan(b)
+    return equal
+
+
+def merge_arrays(
+        arrays: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        other: Tuple[np.ndarray, np.ndarray, np.ndarray]
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge sorted datetime, value and flag arrays, other wins on equal datetimes
+
+    Only the part of arrays within the datetime span of other is merged and
+    sorted, the parts before and after are copied as is. Appending new readings
+    is therefore linear in the number of events.
+
+    Args:
+        arrays (Tuple[np.ndarray, np.ndarray, np.ndarray]): sorted datetime64[ns],
+        value and flag arrays
+        other (Tuple[np.ndarray, np.ndarray, np.ndarray]): sorted datetime64[ns],
+        value and flag arrays to merge into arrays
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: merged arrays
+
+    """
+
+    datetime, other_datetime = arrays[0], other[0]
+    if len(other_datetime) == 0:
+        return arrays
+    if len(datetime) == 0:
+        return other
+
+    start = np.searchsorted(datetime, other_datetime[0], side="left")
+    end = np.searchsorted(datetime, other_datetime[-1], side="right")
+    keep = ~np.isin(datetime[start:end], other_datetime, assume_unique=True)
+    order = None
+    if keep.any():
+        order = np.argsort(
+            np.concatenate([datetime[start:end][keep], other_datetime]),
+            kind="stable"
+            )
+
+    result = []
+    for array, other_array in zip(arrays, other):
+        within = np.concatenate([array[start:end][keep], other_array])
+        if order is not None:
+            within = within[order]
+        result.append(np.concatenate([array[:start], within, array[end:]]))
+    return tuple(result)
 
 
 class Events(pd.DataFrame):
     """FEWS-PI events in pandas DataFrame"""
+    @classmethod
+    def from_arrays(cls,
+                    datetime: np.ndarray,
+                    value: np.ndarray,
+                    flag: np.ndarray):
+        """
+        Create Events from datetime, value and flag arrays without copying.
+
+        Args:
+            datetime (np.ndarray): datetime64 array, becomes the index
+            value (np.ndarray): float array with values
+            flag (np.ndarray): int array with flags
+
+        Returns:
+            Events: pandas DataFrame
+
+        """
+
+        return cls(
+            {"value": value, "flag": flag},
+            index=pd.DatetimeIndex(datetime, name="datetime"),
+            copy=False
+            )
+
     @classmethod
     def from_pi_events(cls, pi_events: list, missing_value: float):
         """
@@ -87,64 +254,336 @@ class Events(pd.DataFrame):
 
         """
 
-        df = cls(pi_events)
+        return cls.from_arrays(*pi_events_to_arrays(pi_events, missing_value))
 
-        # set datetime
-        df["datetime"] = pd.to_datetime(df["date"]) + pd.to_timedelta(
-            df["time"]
-        )
 
-        # set value to numeric and remove missings
-        df["value"] = pd.to_numeric(df["value"])
-        df = df.loc[df["value"] != missing_value]
+class CompactEvents:
+    """
+    FEWS-PI events as contiguous arrays.
 
-        # drop columns and add missing columns
-        drop_cols = [i for i in df.columns if i not in EVENT_COLUMNS]
-        df.drop(columns=drop_cols, inplace=True)
-        for i in EVENT_COLUMNS:
-            if i not in df.columns:
-                df[i] = pd.NA
+    Holds int64 timestamps (ns), values and int8 flags without pandas overhead.
+    Use to_events to get an Events DataFrame.
+    """
 
-        # set flag to numeric
-        df["flag"] = pd.to_numeric(df["flag"])
+    __slots__ = ("datetime", "value", "flag")
 
-        # set datetime to index
-        df.set_index("datetime", inplace=True)
+    def __init__(self, datetime: np.ndarray, value: np.ndarray, flag: np.ndarray):
+        self.datetime = np.asarray(datetime, dtype="datetime64[ns]").view(np.int64)
+        self.value = value
+        self.flag = flag
 
-        return df
+    def __len__(self):
+        return len(self.datetime)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of the arrays."""
+        return self.datetime.nbytes + self.value.nbytes + self.flag.nbytes
+
+    @classmethod
+    def from_pi_events(cls,
+                       pi_events: list,
+                       missing_value: float,
+                       value_dtype: np.dtype = np.float64):
+        """
+        Parse CompactEvents from FEWS PI events dict.
+
+        Args:
+            pi_events (dict): FEWS PI events as dictionary
+            missing_value (float): value of missings to remove
+            value_dtype (np.dtype, optional): dtype of values, np.float32 halves
+            the memory of values. Defaults to np.float64.
+
+        Returns:
+            CompactEvents: events as arrays
+
+        """
+
+        datetime, value, flag = pi_events_to_arrays(pi_events, missing_value)
+        return cls(datetime, value.astype(value_dtype, copy=False), flag)
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return datetime64[ns], value and flag arrays without copying."""
+        return self.datetime.view("datetime64[ns]"), self.value, self.flag
+
+    def to_events(self) -> Events:
+        """Convert to an Events DataFrame without copying the arrays."""
+        return Events.from_arrays(*self.to_arrays())
 
 
-@dataclass
 class TimeSeries:
-    """FEWS-PI time series"""
-    header: Header
-    events: Events = pd.DataFrame(columns=EVENT_COLUMNS).set_index("datetime")
+    """
+    FEWS-PI time series
+
+    Events are stored as Events DataFrame, or as CompactEvents that are
+    converted to an Events DataFrame the first time events is accessed. A lazy
+    time series has a loader and fetches its events on first access.
+    """
+
+    __slots__ = ("header", "_events", "_compact", "_loader")
+
+    def __init__(self,
+                 header: Header,
+                 events: Events = None,
+                 compact: CompactEvents = None,
+                 loader=None):
+        self.header = header
+        self._events = events
+        self._compact = compact
+        self._loader = loader
+
+    def __repr__(self):
+        events = "<lazy>" if self.lazy else f"{len(self)} events"
+        return f"TimeSeries(header={self.header!r}, events={events})"
+
+    def __eq__(self, other):
+        if not isinstance(other, TimeSeries):
+            return NotImplemented
+        return (self.header == other.header) and self.events.equals(other.events)
+
+    def __len__(self):
+        """Number of loaded events, 0 for a lazy time series."""
+        if self.lazy:
+            return 0
+        if self._events is None and self._compact is not None:
+            return len(self._compact)
+        return len(self.events)
+
+    @property
+    def lazy(self) -> bool:
+        """True if events are not loaded yet and will be fetched on access."""
+        return self._loader is not None
+
+    @property
+    def compact(self) -> bool:
+        """True if events are (still) stored as CompactEvents."""
+        return self._events is None and self._compact is not None
+
+    @property
+    def events(self) -> Events:
+        if self._loader is not None:
+            self._loader.load([self])
+        if self._events is None:
+            if self._compact is not None:
+                self._events = self._compact.to_events()
+                self._compact = None
+            else:
+                self._events = Events.from_arrays(
+                    np.array([], dtype="datetime64[ns]"),
+                    np.array([], dtype=np.float64),
+                    np.array([], dtype=np.int8)
+                    )
+        return self._events
+
+    @events.setter
+    def events(self, events: Events):
+        self._events = events
+        self._compact = None
+        self._loader = None
+
+    @property
+    def key(self) -> tuple:
+        """(location_id, parameter_id, qualifier_ids) identifying the series."""
+        return (self.header.location_id,
+                self.header.parameter_id,
+                tuple(self.header.qualifier_id or []))
+
+    def merge(self, time_series):
+        """
+        Merge the events of another TimeSeries into this one.
+
+        Events of time_series replace events at equal datetimes. The header
+        period is extended to cover both time series.
+
+        Args:
+            time_series (TimeSeries): time series with the same key
+
+        Returns:
+            TimeSeries: self
+
+        """
+
+        arrays = merge_arrays(self.to_arrays(), time_series.to_arrays())
+        if self.compact:
+            self._compact = CompactEvents(*arrays)
+        else:
+            self.events = Events.from_arrays(*arrays)
+
+        headers = [self.header, time_series.header]
+        start_dates = [i.start_date for i in headers if i.start_date is not None]
+        end_dates = [i.end_date for i in headers if i.end_date is not None]
+        self.header = replace(
+            self.header,
+            start_date=min(start_dates) if start_dates else None,
+            end_date=max(end_dates) if end_dates else None
+            )
+        return self
+
+    def load_from(self, time_series):
+        """Take the (compact) events of another TimeSeries, ending lazy mode."""
+        self._events = time_series._events
+        self._compact = time_series._compact
+        self._loader = None
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return datetime64[ns], value and flag arrays of the events."""
+        if self._loader is not None:
+            self._loader.load([self])
+        if self.compact:
+            return self._compact.to_arrays()
+        events = self.events
+        return (np.asarray(events.index, dtype="datetime64[ns]"),
+                events["value"].to_numpy(),
+                events["flag"].to_numpy())
 
     @classmethod
-    def from_pi_time_series(cls, pi_time_series: dict):
-        #print(pi_time_series)
+    def from_pi_time_series(cls,
+                            pi_time_series: dict,
+                            compact: Union[bool, str] = False):
+        """
+        Parse TimeSeries from FEWS PI time series dict.
+
+        Args:
+            pi_time_series (dict): FEWS PI time series with header and events
+            compact (Union[bool, str], optional): store events as CompactEvents
+            and convert to pandas on first access. True stores values as
+            float64, a dtype (e.g. "float32") as that dtype. Defaults to False.
+
+        Returns:
+            TimeSeries: FEWS-PI time series
+
+        """
+
         header = Header.from_pi_header(pi_time_series["header"])
         kwargs = dict(header=header)
         if "events" in pi_time_series.keys():
-            kwargs["events"] = Events.from_pi_events(
-                pi_time_series["events"],
-                header.miss_val
-                )
+            if compact:
+                kwargs["compact"] = CompactEvents.from_pi_events(
+                    pi_time_series["events"],
+                    header.miss_val,
+                    np.float64 if compact is True else compact
+                    )
+            else:
+                kwargs["events"] = Events.from_pi_events(
+                    pi_time_series["events"],
+                    header.miss_val
+                    )
         return cls(**kwargs)
 
 
+def _qualifier_key(qualifier) -> tuple:
+    if qualifier is None:
+        return ()
+    if isinstance(qualifier, str):
+        return (qualifier,)
+    return tuple(qualifier)
+
+
+class TimeSeriesIndex:
+    """Lookup tables of time series by key, location and parameter."""
+
+    __slots__ = ("state",
+                 "keys",
+                 "location_parameters",
+                 "locations",
+                 "parameters",
+                 "qualifiers")
+
+    def __init__(self, time_series: List[TimeSeries]):
+        self.keys = {}
+        self.location_parameters = {}
+        self.locations = {}
+        self.parameters = {}
+        self.qualifiers = {}
+        for i in time_series:
+            self.append(i)
+        self.state = (id(time_series), len(time_series))
+
+    def append(self, time_series: TimeSeries):
+        header = time_series.header
+        self.keys.setdefault(time_series.key, time_series)
+        self.location_parameters.setdefault(
+            (header.location_id, header.parameter_id), []
+            ).append(time_series)
+        self.locations.setdefault(header.location_id, []).append(time_series)
+        self.parameters.setdefault(header.parameter_id, []).append(time_series)
+        for i in header.qualifier_id or []:
+            self.qualifiers[i] = None
+
+
 @dataclass
 class TimeSeriesSet:
     version: str = None
     time_zone: float = None
-    time_series: List[TimeSeries] = list
+    time_series: List[TimeSeries] = field(default_factory=list)
     empty: bool = True
+    _index: TimeSeriesIndex = field(
+        default=None, init=False, repr=False, compare=False
+        )
 
     def __len__(self):
         return len(self.time_series)
 
+    @property
+    def index(self) -> TimeSeriesIndex:
+        """
+        Lookup tables of the time series, built on first use.
+
+        The index is rebuilt when time_series is replaced or changes in length.
+        Call invalidate after replacing items of time_series in place.
+        """
+
+        state = (id(self.time_series), len(self.time_series))
+        if (self._index is None) or (self._index.state != state):
+            self._index = TimeSeriesIndex(self.time_series)
+        return self._index
+
+    def invalidate(self):
+        """Drop the index, so it is rebuilt on next use."""
+        self._index = None
+
+    def get(self,
+            location_id: str,
+            parameter_id: str,
+            qualifier: Union[str, List[str]] = None) -> Union[TimeSeries, None]:
+        """
+        Get a time series by location, parameter and qualifier(s).
+
+        Args:
+            location_id (str): FEWS location id
+            parameter_id (str): FEWS parameter id
+            qualifier (Union[str, List[str]], optional): FEWS qualifier id(s).
+            If None, the time series without qualifiers or else the first time
+            series of the location and parameter is returned.
+
+        Returns:
+            Union[TimeSeries, None]: time series, None if not in the set
+
+        """
+
+        index = self.index
+        key = (location_id, parameter_id, _qualifier_key(qualifier))
+        time_series = index.keys.get(key)
+        if (time_series is None) and (qualifier is None):
+            time_series = index.location_parameters.get(
+                (location_id, parameter_id), [None]
+                )[0]
+        return time_series
+
+    @property
+    def by_location(self) -> Dict[str, List[TimeSeries]]:
+        """Time series grouped by location_id."""
+        return self.index.locations
+
+    @property
+    def by_parameter(self) -> Dict[str, List[TimeSeries]]:
+        """Time series grouped by parameter_id."""
+        return self.index.parameters
+
     @classmethod
-    def from_pi_time_series(cls, pi_time_series_set: dict):
+    def from_pi_time_series(cls,
+                            pi_time_series_set: dict,
+                            compact: Union[bool, str] = False):
         kwargs = {}
         if "version" in pi_time_series_set.keys():
             kwargs["version"] = pi_time_series_set["version"]
@@ -152,7 +591,7 @@ class TimeSeriesSet:
             kwargs["time_zone"] = float(pi_time_series_set["timeZone"])
         if "timeSeries" in pi_time_series_set.keys():
             kwargs["time_series"] = [
-                TimeSeries.from_pi_time_series(i)
+                TimeSeries.from_pi_time_series(i, compact=compact)
                 for i in pi_time_series_set["timeSeries"]
                 ]
             if len(kwargs["time_series"]) > 0:
@@ -160,20 +599,157 @@ class TimeSeriesSet:
         return cls(**kwargs)
     
     def add(self, time_series_set):
-        # add time_series_set to the time_series_set
+        """
+        Add the time series of another TimeSeriesSet to this set.
+
+        Time series are matched on location_id, parameter_id and qualifier_id.
+        Events of matching time series are merged (new events win on equal
+        datetimes), other time series are appended (not copied).
+
+        Args:
+            time_series_set (TimeSeriesSet): time series to add
+
+        Returns:
+            TimeSeriesSet: self
+
+        """
+
+        if self.version is None:
+            self.version = time_series_set.version
+        if self.time_zone is None:
+            self.time_zone = time_series_set.time_zone
+
+        index = self.index
+        for time_series in time_series_set.time_series:
+            existing = index.keys.get(time_series.key)
+            if existing is None:
+                self.time_series.append(time_series)
+                index.append(time_series)
+            else:
+                existing.merge(time_series)
+        index.state = (id(self.time_series), len(self.time_series))
+
+        self.empty = len(self.time_series) == 0
+        return self
+
+    def prefetch(self,
+                 location_ids: List[str] = None,
+                 parameter_ids: List[str] = None):
+        """
+        Load the events of lazy time series in batched requests.
+
+        Args:
+            location_ids (List[str], optional): only prefetch these locations.
+            Defaults to all.
+            parameter_ids (List[str], optional): only prefetch these parameters.
+            Defaults to all.
+
+        Returns:
+            TimeSeriesSet: self
+
+        """
+
+        loaders = {}
+        for time_series in self.time_series:
+            if time_series._loader is None:
+                continue
+            header = time_series.header
+            if (location_ids is not None) and (
+                    header.location_id not in location_ids):
+                continue
+            if (parameter_ids is not None) and (
+                    header.parameter_id not in parameter_ids):
+                continue
+            loader = time_series._loader
+            loaders.setdefault(id(loader), (loader, []))[1].append(time_series)
+
+        for loader, time_series in loaders.values():
+            loader.load(time_series)
+
         return self
 
     @property
     def parameter_ids(self):
-        return list(set([i.header.parameter_id for i in self.time_series]))
+        return list(self.index.parameters)
 
     @property
     def location_ids(self):
-        return list(set([i.header.location_id for i in self.time_series]))
+        return list(self.index.locations)
 
     @property
     def qualifier_ids(self):
-        qualifiers = (i.header.qualifier_id for i in self.time_series)
-        qualifiers = [i for i in qualifiers if i is not None]
+        return list(self.index.qualifiers)
+
+    def to_frame(self,
+                 column: str = "value",
+                 resample: str = None,
+                 how: str = None) -> pd.DataFrame:
+        """
+        Align all time series in one wide (datetime x time series) DataFrame.
+
+        The union of all datetimes is the index. The matrix is allocated once
+        and every time series is written into its column, missing moments are
+        NaN. Columns are a MultiIndex of location_id, parameter_id and
+        qualifier_id (qualifiers joined by ",").
 
-        return list(set(flatten_list(qualifiers)))
+        Args:
+            column (str, optional): events column to align, "value" or "flag".
+            Defaults to "value".
+            resample (str, optional): pandas offset alias (e.g. "1h") to
+            resample the aligned frame to a common time step.
+            how (str, optional): aggregation when resampling. Defaults to "mean"
+            for values and "max" (worst) for flags.
+
+        Returns:
+            pd.DataFrame: aligned values (float64) or flags (float32)
+
+        """
+
+        self.prefetch()
+        arrays = [i.to_arrays() for i in self.time_series]
+        indexes = [i[0] for i in arrays]
+        # series often share their index, only distinct indexes are merged
+        distinct = []
+        for index in indexes:
+            if not (distinct and np.array_equal(distinct[-1], index)):
+                distinct.append(index)
+        if len(distinct) == 1:
+            datetime = distinct[0]
+        elif distinct:
+            datetime = np.unique(np.concatenate(distinct))
+        else:
+            datetime = np.array([], dtype="datetime64[ns]")
+
+        dtype = np.float32 if column == "flag" else np.float64
+        # column-major, so columns are written contiguously and pandas can
+        # use the matrix as its block without copying
+        values = np.full(
+            (len(datetime), len(indexes)), np.nan, dtype=dtype, order="F"
+            )
+        position = EVENT_COLUMNS.index(column)
+        for i, array in enumerate(arrays):
+            rows = slice(None) if len(distinct) == 1 else np.searchsorted(
+                datetime, array[0]
+                )
+            values[rows, i] = array[position]
+
+        columns = pd.MultiIndex.from_tuples(
+            [(i.header.location_id,
+              i.header.parameter_id,
+              ",".join(i.header.qualifier_id) if i.header.qualifier_id else None)
+             for i in self.time_series],
+            names=["location_id", "parameter_id", "qualifier_id"]
+            )
+        df = pd.DataFrame(
+            values,
+            index=pd.DatetimeIndex(datetime, name="datetime"),
+            columns=columns,
+            copy=False
+            )
+
+        if resample is not None:
+            if how is None:
+                how = "max" if column == "flag" else "mean"
+            df = df.resample(resample).agg(how)
+
+        return df
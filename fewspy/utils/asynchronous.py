@@ -0,0 +1,91 @@
+"""Helpers for asynchronous requests and to run coroutines from synchronous code."""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Union
+
+import aiohttp
+
+from .transformations import parameters_to_query
+
+LOGGER = logging.getLogger(__name__)
+MAX_CONCURRENCY = 8
+
+
+def run_sync(coroutine):
+    """
+    Run a coroutine to completion and return its result.
+
+    If no event loop is running in the current thread the coroutine is run with
+    asyncio.run. Inside a running loop (e.g. a Bokeh server callback) the
+    coroutine is run on a fresh loop in a worker thread, so the calling loop is
+    never re-entered.
+
+    Args:
+        coroutine (coroutine): coroutine to run
+
+    Returns:
+        result of the coroutine
+
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+@asynccontextmanager
+async def client_session(
+        session: aiohttp.ClientSession = None,
+        max_concurrency: int = MAX_CONCURRENCY
+        ):
+    """Yield session, or a new session that is closed afterwards if None."""
+    if session is not None:
+        yield session
+    else:
+        async with aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=max_concurrency)
+                ) as session:
+            yield session
+
+
+async def fetch(
+        session: aiohttp.ClientSession,
+        url: str,
+        parameters: dict = None,
+        verify: bool = False,
+        logger=LOGGER
+        ) -> Union[bytes, None]:
+    """
+    Do a GET request and return the response body
+
+    Args:
+        session (aiohttp.ClientSession): session to do the request with
+        url (str): url Delft-FEWS PI REST WebService endpoint
+        parameters (dict, optional): FEWS parameters as returned by
+        parameters_to_fews
+        verify (bool, optional): verify the SSL certificate. Defaults to False.
+        logger (logging.Logger, optional): Logger to pass logging to. By
+        default a logger will ge created.
+
+    Returns:
+        Union[bytes, None]: response body, None if the request failed
+
+    """
+
+    query = parameters_to_query(parameters or {})
+    try:
+        async with session.get(url, params=query, ssl=verify) as response:
+            if response.status == 200:
+                return await response.read()
+            logger.error(f"FEWS Server responds {await response.text()}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        logger.error(f"FEWS Server request failed: {err!r}")
+
+    return None
@@ -0,0 +1,176 @@
+"""
+Single-flight coalescing of identical concurrent requests.
+
+Calls with the same key made while a first call is in flight wait for that call
+and share its (parsed) result, so a burst of identical requests (e.g. many
+sessions opening at once) reaches the FEWS server once. Results are shared, not
+copied: callers should not modify them.
+"""
+
+import asyncio
+import json
+import threading
+from typing import Awaitable, Callable, Dict
+
+from .transformations import API_KEYS, parameters_to_fews
+
+IGNORED_KEYS = ["metrics", "session", "verify", "logger"]
+ID_KEYS = ["locationIds", "parameterIds", "qualifierIds"]
+
+
+def request_key(kwargs: dict) -> str:
+    """
+    Key of a request, equal for requests with the same FEWS parameters
+
+    FEWS parameters are normalized by parameters_to_fews (e.g. datetimes to
+    FEWS strings, None values dropped) and ids are sorted, so the order of
+    location_ids, parameter_ids and qualifier_ids does not matter. Other
+    arguments that change the result (url, attributes, compact, max_events,
+    ...) are part of the key, the session, metrics and logger are not.
+
+    Args:
+        kwargs (dict): arguments of a get_* function
+
+    Returns:
+        str: key of the request
+
+    """
+
+    def _normalize(key: str, value):
+        if isinstance(value, (list, tuple, set)):
+            return sorted(value)
+        if (key in ID_KEYS) and isinstance(value, str):
+            return [value]
+        return value
+
+    fews = {k: _normalize(k, v) for k, v in parameters_to_fews(kwargs).items()}
+    other = {k: v for k, v in kwargs.items()
+             if (k not in API_KEYS) and (k not in IGNORED_KEYS)}
+    # parameters_to_fews sends any attributes as showAttributes, the selected
+    # attributes (list) or all (True) change the result
+    if "attributes" in kwargs.keys():
+        other["attributes"] = _normalize("attributes", kwargs["attributes"])
+    return json.dumps(
+        {"fews": fews, **other},
+        sort_keys=True,
+        default=str
+        )
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 1
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls from threads.
+
+    waiters counts the callers per key in flight, requests and coalesced count
+    the calls that were executed and the calls that shared their result.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def waiters(self) -> Dict[str, int]:
+        """Number of callers per key in flight."""
+        with self._lock:
+            return {k: v.waiters for k, v in self._calls.items()}
+
+    def do(self, key: str, function: Callable, **kwargs):
+        """
+        Call function(**kwargs), or wait for the identical call in flight
+
+        Args:
+            key (str): key of the call, e.g. from request_key
+            function (Callable): function to call
+
+        Returns:
+            result of the (shared) call, its exception is raised for all callers
+
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.requests += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(**kwargs)
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces identical concurrent calls within one event loop.
+
+    The shared call runs as a task, so cancelling one caller does not cancel
+    the request for the others.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.coalesced = 0
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+    @property
+    def waiters(self) -> Dict[str, int]:
+        """Number of callers per key in flight."""
+        return dict(self._waiters)
+
+    def _done(self, key: str):
+        self._tasks.pop(key, None)
+        self._waiters.pop(key, None)
+
+    async def do(self, key: str, function: Callable[..., Awaitable], **kwargs):
+        """
+        Await function(**kwargs), or the identical call in flight
+
+        Args:
+            key (str): key of the call, e.g. from request_key
+            function (Callable[..., Awaitable]): coroutine function to call
+
+        Returns:
+            result of the (shared) call, its exception is raised for all callers
+
+        """
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(function(**kwargs))
+            task.add_done_callback(lambda task: self._done(key))
+            self._waiters[key] = 1
+            self.requests += 1
+        else:
+            self._waiters[key] += 1
+            self.coalesced += 1
+        return await asyncio.shield(task)
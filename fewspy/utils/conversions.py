@@ -1,14 +1,17 @@
 from datetime import datetime
-from shapely.geometry import Point
+from functools import lru_cache
+import geopandas as gpd
 import numpy as np
+import pandas as pd
 from typing import List
 
 GEODATUM_MAPPING = {"WGS 1984": "epsg:4326",
                     "Rijks Driehoekstelsel": "epsg:28992"}
 
+@lru_cache(maxsize=4096)
 def camel_to_snake_case(camel_case: str) -> str:
     """
-    Convert camelCase to snake_case
+    Convert camelCase to snake_case, memoized as keys repeat a lot
 
     Args:
         camel_case (str): sentence in camelCase (e.g. myInputVariable)
@@ -77,16 +80,91 @@ def datetime_to_fews_str(date_time: datetime) -> str:
     return date_time.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def xy_array_to_point(xy_array: np.ndarray) -> List[Point]:
-    return [Point(i.astype(float)) for i in xy_array]
+def xy_array_to_point(xy_array: np.ndarray) -> gpd.array.GeometryArray:
+    """
+    Convert an array of x and y coordinates to points in one vectorized call
+
+    Args:
+        xy_array (np.ndarray): array with shape (n, 2), values can be strings
+
+    Returns:
+        gpd.array.GeometryArray: array with n shapely Points
+
+    """
 
-def attributes_to_array(attribute_values: np.ndarray, attributes: list) -> np.ndarray:
+    xy_array = np.asarray(xy_array, dtype=float)
+    return gpd.points_from_xy(xy_array[:, 0], xy_array[:, 1])
 
-    def _get_values(x, attributes):
-        selection = {i["id"]:i["value"] for i in x if i["id"] in attributes}
-        return [selection[i] if i in selection.keys() else None for i in attributes]
+def attributes_to_frame(
+        attribute_values: np.ndarray,
+        attributes: List[str] = None
+        ) -> pd.DataFrame:
+    """
+    Extract FEWS location attributes to typed columns in a single pass
+
+    Columns are float for FEWS attribute type "number", bool for "boolean" and
+    str for "text". Without a type, a column is numeric if all its values are.
+
+    Args:
+        attribute_values (np.ndarray): per location a list of FEWS attribute
+        dicts with keys "id", "value" and optionally "type"
+        attributes (List[str], optional): attribute ids to extract, in this
+        column order. By default all attributes are extracted.
+
+    Returns:
+        pd.DataFrame: one row per location and one column per attribute,
+        missing values are None/NaN
+
+    """
 
-    return np.array([_get_values(i, attributes) for i in attribute_values])
+    count = len(attribute_values)
+    selection = None if attributes is None else set(attributes)
+    columns = {}
+    types = {}
+
+    get_column = columns.get
+    for row, location_attributes in enumerate(attribute_values):
+        if not isinstance(location_attributes, list):
+            continue
+        for attribute in location_attributes:
+            column = get_column(attribute["id"])
+            if column is None:
+                key = attribute["id"]
+                if (selection is not None) and (key not in selection):
+                    continue
+                column = columns[key] = [None] * count
+                types[key] = attribute.get("type")
+            column[row] = attribute.get("value")
+
+    if attributes is not None:
+        columns = {i: columns.get(i, [None] * count) for i in attributes}
+
+    def _to_numeric(values: list, errors: str = "raise") -> np.ndarray:
+        try:
+            return np.array(
+                [np.nan if i is None else i for i in values], dtype=float
+                )
+        except (ValueError, TypeError):
+            return pd.to_numeric(pd.Series(values, dtype=object),
+                                 errors=errors).values
+
+    def _to_series(key: str, values: list) -> pd.Series:
+        attribute_type = types.get(key)
+        if attribute_type == "number":
+            return pd.Series(_to_numeric(values, errors="coerce"))
+        elif attribute_type == "boolean":
+            return pd.Series(
+                [None if i is None else str(i).lower() == "true" for i in values],
+                dtype=object
+                )
+        elif attribute_type is None:
+            try:
+                return pd.Series(_to_numeric(values))
+            except (ValueError, TypeError):
+                pass
+        return pd.Series(values, dtype=object)
+
+    return pd.DataFrame({k: _to_series(k, v) for k, v in columns.items()})
 
 
 def geo_datum_to_crs(geo_datum: str) -> str:
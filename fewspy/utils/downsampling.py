@@ -0,0 +1,140 @@
+"""Thinning and downsampling of time series for plotting."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+METHODS = ["lttb", "min_max"]
+
+
+def thinning_for_width(start_time: datetime,
+                       end_time: datetime,
+                       plot_width: int) -> int:
+    """
+    FEWS thinning (milliseconds per pixel) to plot a window at a width
+
+    Args:
+        start_time (datetime): start of the window
+        end_time (datetime): end of the window
+        plot_width (int): width of the plot in pixels
+
+    Returns:
+        int: FEWS thinning, at least 1
+
+    """
+
+    milliseconds = (end_time - start_time).total_seconds() * 1000
+    return max(1, int(milliseconds // max(plot_width, 1)))
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points selected by Largest-Triangle-Three-Buckets
+
+    The first and last point are kept. The other points are split in
+    threshold - 2 buckets and from every bucket the point forming the largest
+    triangle with the previously selected point and the average of the next
+    bucket is selected.
+
+    Args:
+        x (np.ndarray): sorted x values
+        y (np.ndarray): y values without NaN
+        threshold (int): number of points to select
+
+    Returns:
+        np.ndarray: sorted indices of the selected points
+
+    """
+
+    count = len(x)
+    if (threshold >= count) or (threshold < 3):
+        return np.arange(count)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.int64)
+
+    # averages of all buckets at once, the last "bucket" is the last point
+    sums_x = np.add.reduceat(x[1:count - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:count - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    average_x = np.append(sums_x / sizes, x[-1])
+    average_y = np.append(sums_y / sizes, y[-1])
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, count - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[previous] - average_x[i + 1]) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (average_y[i + 1] - y[previous])
+            )
+        previous = start + int(np.argmax(area))
+        indices[i + 1] = previous
+    return indices
+
+
+def min_max(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the minimum and maximum of threshold // 2 equal-time buckets
+
+    Args:
+        x (np.ndarray): sorted x values
+        y (np.ndarray): y values without NaN
+        threshold (int): maximum number of points to select
+
+    Returns:
+        np.ndarray: sorted indices of the selected points
+
+    """
+
+    count = len(x)
+    buckets = threshold // 2
+    if (threshold >= count) or (buckets < 1):
+        return np.arange(count)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y)
+    # buckets are contiguous as x is sorted
+    edges = np.searchsorted(x, np.linspace(x[0], x[-1], buckets + 1)[1:-1])
+    indices = []
+    for start, end in zip(np.concatenate([[0], edges]),
+                          np.concatenate([edges, [count]])):
+        if end > start:
+            indices += [start + np.argmin(y[start:end]),
+                        start + np.argmax(y[start:end])]
+    return np.unique(indices)
+
+
+def downsample(events: pd.DataFrame,
+               threshold: int,
+               method: str = "lttb") -> pd.DataFrame:
+    """
+    Downsample Events to at most threshold points, keeping their visual shape
+
+    Args:
+        events (pd.DataFrame): Events with a DatetimeIndex and a value column
+        threshold (int): maximum number of points, e.g. the plot width in pixels
+        method (str, optional): "lttb" (Largest-Triangle-Three-Buckets) or
+        "min_max" (minimum and maximum per bucket). Defaults to "lttb".
+
+    Returns:
+        pd.DataFrame: selected rows of events
+
+    """
+
+    if method not in METHODS:
+        raise ValueError(f"method '{method}' not supported, use one of {METHODS}")
+
+    events = events.loc[events["value"].notna()]
+    if len(events) <= threshold:
+        return events
+
+    x = np.asarray(events.index, dtype="datetime64[ns]").view(np.int64)
+    y = events["value"].to_numpy()
+    indices = lttb(x, y, threshold) if method == "lttb" else min_max(
+        x, y, threshold
+        )
+    return events.iloc[indices]
@@ -0,0 +1,264 @@
+"""
+Structured instrumentation of FEWS requests.
+
+Every Api call runs in a span that records its latency and attributes: time to
+first byte, bytes on the wire and decompressed, decode time (JSON/XML), build
+time (DataFrames), number of time series and events. Span durations and
+numeric attributes are kept in in-process histograms, summarized with
+percentiles by Instrumentation.summary, so a slow dashboard can be attributed
+to the network (ttfb, wire_bytes), the FEWS server (ttfb) or parsing
+(decode_time, build_time).
+
+Finished spans are passed to exporters, objects with an export(span) method,
+e.g. LoggingExporter. With a tracer (e.g. opentelemetry_tracer()) every span is
+also an OpenTelemetry span, the opentelemetry-api package is optional.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Protocol
+
+import numpy as np
+import pandas as pd
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+LOGGER = logging.getLogger(__name__)
+MAX_SAMPLES = 10_000
+PERCENTILES = [50, 90, 99]
+
+_CURRENT_SPAN = contextvars.ContextVar("fewspy_span", default=None)
+
+
+@dataclass
+class Span:
+    """A timed operation and its attributes."""
+    name: str
+    start_time: float
+    duration: float = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+    error: str = None
+
+    def set(self, **attributes):
+        """Set attributes of the span."""
+        self.attributes.update(attributes)
+
+    def add(self, **attributes):
+        """Add to numeric attributes of the span, e.g. bytes of a response."""
+        for key, value in attributes.items():
+            self.attributes[key] = self.attributes.get(key, 0) + value
+
+
+def current_span() -> Span:
+    """Span of the running Api call, None outside a span."""
+    return _CURRENT_SPAN.get()
+
+
+class Exporter(Protocol):
+    """Receives every finished span."""
+
+    def export(self, span: Span):
+        ...
+
+
+class LoggingExporter:
+    """
+    Writes every finished span as one debug line.
+
+    Args:
+        logger (logging.Logger, optional): logger to write to
+        level (int, optional): log level. Defaults to logging.DEBUG.
+    """
+
+    def __init__(self, logger=LOGGER, level: int = logging.DEBUG):
+        self.logger = logger
+        self.level = level
+
+    def export(self, span: Span):
+        if self.logger.isEnabledFor(self.level):
+            attributes = " ".join(
+                f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}"
+                for k, v in span.attributes.items()
+                )
+            self.logger.log(
+                self.level,
+                f"{span.name} in {span.duration:.3f} sec {attributes}".strip()
+                )
+
+
+class Histogram:
+    """
+    Distribution of a metric.
+
+    Count, sum, minimum and maximum cover all values, percentiles the last
+    max_samples values.
+    """
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else np.nan
+
+    def percentiles(self, percentiles: List[float] = PERCENTILES) -> List[float]:
+        """Percentiles of the kept samples."""
+        if not self.samples:
+            return [np.nan] * len(percentiles)
+        return list(np.percentile(np.fromiter(self.samples, float), percentiles))
+
+
+def time_series_counts(time_series_set) -> Dict[str, int]:
+    """Number of time series and of loaded events in a TimeSeriesSet."""
+    return {
+        "series": len(time_series_set.time_series),
+        "events": sum(len(i) for i in time_series_set.time_series if not i.lazy)
+        }
+
+
+def opentelemetry_tracer(name: str = "fewspy"):
+    """
+    OpenTelemetry tracer of the globally configured tracer provider
+
+    Args:
+        name (str, optional): instrumentation name. Defaults to "fewspy".
+
+    Raises:
+        ImportError: if opentelemetry-api is not installed
+
+    Returns:
+        opentelemetry.trace.Tracer: tracer to pass to Instrumentation
+
+    """
+
+    if trace is None:
+        raise ImportError(
+            "OpenTelemetry spans require opentelemetry-api, install it with "
+            "'pip install opentelemetry-api'"
+            )
+    return trace.get_tracer(name)
+
+
+class Instrumentation:
+    """
+    Records spans of Api calls in histograms and passes them to exporters.
+
+    Histograms are named "<span name>.duration" and "<span name>.<attribute>"
+    for every numeric attribute.
+
+    Args:
+        exporters (List[Exporter], optional): receivers of finished spans
+        tracer (opentelemetry.trace.Tracer, optional): tracer to create
+        OpenTelemetry spans with, see opentelemetry_tracer
+        max_samples (int, optional): samples per histogram for percentiles.
+        Defaults to 10_000.
+    """
+
+    def __init__(self,
+                 exporters: List[Exporter] = None,
+                 tracer=None,
+                 max_samples: int = MAX_SAMPLES):
+        self.exporters = list(exporters or [])
+        self.tracer = tracer
+        self.max_samples = max_samples
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, value: float):
+        """Add a value to the histogram of a metric."""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.max_samples)
+            histogram.add(value)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        Time a with block as a span, yielding it to set attributes
+
+        Responses recorded with metrics.record_response within the block add
+        their transfer metrics to the span.
+
+        Args:
+            name (str): name of the span, e.g. "get_time_series"
+            **attributes: initial attributes of the span
+
+        """
+
+        span = Span(name=name, start_time=time.time(), attributes=attributes)
+        token = _CURRENT_SPAN.set(span)
+        start = time.perf_counter()
+        otel_span = None
+        if self.tracer is not None:
+            otel = self.tracer.start_as_current_span(name)
+            otel_span = otel.__enter__()
+        exc_info = (None, None, None)
+        try:
+            yield span
+        except BaseException as error:
+            # only the span's own exception, not one handled around the call
+            exc_info = (type(error), error, error.__traceback__)
+            span.error = repr(error)
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            _CURRENT_SPAN.reset(token)
+            if otel_span is not None:
+                otel_span.set_attributes({
+                    k: v for k, v in span.attributes.items()
+                    if isinstance(v, (bool, str, int, float))
+                    })
+                otel.__exit__(*exc_info)
+            self._finish(span)
+
+    def _finish(self, span: Span):
+        self.record(f"{span.name}.duration", span.duration)
+        for key, value in span.attributes.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.record(f"{span.name}.{key}", value)
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                LOGGER.exception(f"exporter {exporter!r} failed")
+
+    def clear(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def summary(self, percentiles: List[float] = PERCENTILES) -> pd.DataFrame:
+        """Count, mean, minimum, percentiles and maximum per metric."""
+        with self._lock:
+            rows = {
+                k: [v.count, v.mean, v.min, *v.percentiles(percentiles), v.max]
+                for k, v in self.histograms.items()
+                }
+        return pd.DataFrame(
+            list(rows.values()),
+            index=pd.Index(list(rows.keys()), name="metric"),
+            columns=["count", "mean", "min", *[f"p{i}" for i in percentiles],
+                     "max"]
+            ).sort_index()
@@ -0,0 +1,177 @@
+"""Transfer metrics of FEWS PI-REST responses."""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator
+
+import pandas as pd
+import requests
+
+from .instrumentation import current_span
+
+MAX_RECORDS = 10_000
+
+
+@dataclass
+class ResponseMetrics:
+    """
+    Transfer metrics of one response.
+
+    request_time is the time to first byte (until the headers are parsed),
+    decode_time the time to parse the body (JSON/XML) and build_time the time
+    to build TimeSeries from the parsed body.
+    """
+    endpoint: str
+    status: int
+    content_encoding: str
+    wire_bytes: int
+    content_bytes: int
+    request_time: float
+    decode_time: float
+    build_time: float = 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decompressed bytes per byte received."""
+        return self.content_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+
+def response_metrics(response: requests.Response,
+                     endpoint: str,
+                     decode_time: float = 0.0,
+                     content_bytes: int = None,
+                     build_time: float = 0.0) -> ResponseMetrics:
+    """
+    Collect the metrics of a response of which the body has been read
+
+    Args:
+        response (requests.Response): response with its content read
+        endpoint (str): FEWS endpoint, e.g. "timeseries"
+        decode_time (float, optional): seconds spent decoding the content.
+        Defaults to 0.0.
+        content_bytes (int, optional): decompressed size of a streamed
+        response. By default the size of response.content.
+        build_time (float, optional): seconds spent building TimeSeries.
+        Defaults to 0.0.
+
+    Returns:
+        ResponseMetrics: metrics of the response
+
+    """
+
+    if content_bytes is None:
+        content_bytes = len(response.content)
+    try:
+        # bytes read from the socket, before decompression
+        wire_bytes = response.raw.tell()
+    except AttributeError:
+        wire_bytes = content_bytes
+    return ResponseMetrics(
+        endpoint=endpoint,
+        status=response.status_code,
+        content_encoding=response.headers.get("Content-Encoding", "identity"),
+        wire_bytes=wire_bytes or content_bytes,
+        content_bytes=content_bytes,
+        request_time=response.elapsed.total_seconds(),
+        decode_time=decode_time,
+        build_time=build_time
+        )
+
+
+class Metrics:
+    """
+    Collects ResponseMetrics of the requests of an Api.
+
+    At most max_records responses are kept, the oldest are dropped first.
+    """
+
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self.records = deque(maxlen=max_records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, metrics: ResponseMetrics):
+        self.records.append(metrics)
+
+    def clear(self):
+        self.records.clear()
+
+    def to_frame(self) -> pd.DataFrame:
+        """All records as a DataFrame, one row per response."""
+        return pd.DataFrame(
+            [asdict(i) for i in self.records],
+            columns=list(ResponseMetrics.__dataclass_fields__.keys())
+            )
+
+    def summary(self) -> pd.DataFrame:
+        """Requests, bytes, times and compression ratio per endpoint."""
+        df = self.to_frame().groupby("endpoint").agg(
+            requests=("status", "size"),
+            wire_bytes=("wire_bytes", "sum"),
+            content_bytes=("content_bytes", "sum"),
+            request_time=("request_time", "sum"),
+            decode_time=("decode_time", "sum"),
+            build_time=("build_time", "sum")
+            )
+        df["compression_ratio"] = df["content_bytes"] / df["wire_bytes"]
+        return df
+
+
+@contextmanager
+def record_response(metrics: Metrics,
+                    response: requests.Response,
+                    endpoint: str):
+    """
+    Record the metrics of a response, timing the with block as decode time
+
+    Yields a dict in which a streamed response can count its decompressed
+    size as "content_bytes", see count_bytes, and the time spent building
+    TimeSeries can be set as "build_time" (excluded from the decode time).
+
+    The metrics are also added to the span of the running Api call, see
+    instrumentation.Instrumentation.span.
+
+    Args:
+        metrics (Metrics): collector, nothing is collected if None
+        response (requests.Response): response to record
+        endpoint (str): FEWS endpoint, e.g. "timeseries"
+
+    """
+
+    start = time.perf_counter()
+    record = {}
+    try:
+        yield record
+    finally:
+        span = current_span()
+        if (metrics is not None) or (span is not None):
+            build_time = record.get("build_time", 0.0)
+            result = response_metrics(
+                response,
+                endpoint,
+                time.perf_counter() - start - build_time,
+                record.get("content_bytes"),
+                build_time
+                )
+            if metrics is not None:
+                metrics.add(result)
+            if span is not None:
+                span.add(
+                    requests=1,
+                    ttfb=result.request_time,
+                    wire_bytes=result.wire_bytes,
+                    content_bytes=result.content_bytes,
+                    decode_time=result.decode_time,
+                    build_time=result.build_time
+                    )
+
+
+def count_bytes(chunks: Iterable[bytes], record: dict) -> Iterator[bytes]:
+    """Pass chunks through, counting their size in record["content_bytes"]."""
+    record["content_bytes"] = 0
+    for chunk in chunks:
+        record["content_bytes"] += len(chunk)
+        yield chunk
@@ -0,0 +1,60 @@
+"""Pooled HTTP session for the FEWS PI-REST api."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+POOL_SIZE = 10
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+STATUS_FORCELIST = [500, 502, 503, 504]
+# gzip and deflate, plus br and zstd if their decoders are installed
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def create_session(
+        pool_size: int = POOL_SIZE,
+        retries: int = RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+        compression: bool = True
+        ) -> requests.Session:
+    """
+    Create a requests Session with keep-alive connection pooling and retries
+
+    Args:
+        pool_size (int, optional): maximum number of connections kept alive per
+        host. Defaults to 10.
+        retries (int, optional): number of retries on connection errors and
+        5xx responses. Defaults to 3.
+        backoff_factor (float, optional): exponential backoff factor between
+        retries in seconds. Defaults to 0.5.
+        compression (bool, optional): accept compressed responses with all
+        encodings urllib3 can decode. If False the identity encoding is
+        requested. Defaults to True.
+
+    Returns:
+        requests.Session: session to pass to the get_* functions
+
+    """
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=STATUS_FORCELIST,
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False
+        )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry
+        )
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = (
+        ACCEPT_ENCODING if compression else "identity"
+        )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
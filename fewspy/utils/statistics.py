@@ -0,0 +1,218 @@
+"""
+Statistics over all time series of a TimeSeriesSet.
+
+Statistics are computed in one vectorized pass per series (summary) or on the
+aligned value matrix of TimeSeriesSet.to_frame (per period and rolling), and
+returned as compact tables instead of columns added to every Events frame.
+
+Statistics are named "mean", "median", "min", "max", "std", "sum", "count" or
+"q<percentage>" for quantiles (e.g. "q10", "q90").
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+STATISTICS = ["mean", "median", "min", "max", "std", "sum", "count"]
+DEFAULT_STATISTICS = ["mean", "min", "max", "q10", "q90"]
+PERIODS = {"day": "D", "month": "M", "year": "Y"}
+HYDROLOGICAL_YEAR_START = 10
+
+
+def _quantile(statistic: str) -> float:
+    """Quantile of a q<percentage> statistic, None for other statistics."""
+    if statistic.startswith("q") and statistic[1:].replace(".", "", 1).isdigit():
+        return float(statistic[1:]) / 100
+    return None
+
+
+def _validate(statistics: List[str]):
+    unknown = [
+        i for i in statistics if (i not in STATISTICS) and (_quantile(i) is None)
+        ]
+    if unknown:
+        raise ValueError(
+            f"statistics {unknown} not supported, use {STATISTICS} or "
+            "q<percentage> (e.g. 'q90')"
+            )
+
+
+def _series_index(time_series_set) -> pd.MultiIndex:
+    return pd.MultiIndex.from_tuples(
+        [(i.header.location_id,
+          i.header.parameter_id,
+          ",".join(i.header.qualifier_id) if i.header.qualifier_id else None)
+         for i in time_series_set.time_series],
+        names=["location_id", "parameter_id", "qualifier_id"]
+        )
+
+
+def _sorted_statistics(values: np.ndarray, statistics: List[str]) -> list:
+    """Statistics of one series, order statistics read from one sort."""
+    values = values[~np.isnan(values)]
+    count = len(values)
+    if count == 0:
+        return [0 if i == "count" else np.nan for i in statistics]
+
+    ordered = np.sort(values)
+
+    def _at(quantile: float) -> float:
+        position = quantile * (count - 1)
+        lower = int(position)
+        upper = min(lower + 1, count - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+            position - lower
+            )
+
+    result = []
+    for statistic in statistics:
+        if statistic == "mean":
+            result.append(values.mean())
+        elif statistic == "median":
+            result.append(_at(0.5))
+        elif statistic == "min":
+            result.append(ordered[0])
+        elif statistic == "max":
+            result.append(ordered[-1])
+        elif statistic == "std":
+            result.append(values.std(ddof=1) if count > 1 else np.nan)
+        elif statistic == "sum":
+            result.append(values.sum())
+        elif statistic == "count":
+            result.append(count)
+        else:
+            result.append(_at(_quantile(statistic)))
+    return result
+
+
+def summary(time_series_set,
+            statistics: List[str] = DEFAULT_STATISTICS,
+            column: str = "value") -> pd.DataFrame:
+    """
+    Statistics of every time series over its full period
+
+    Every series is sorted once, from which all order statistics (min, max,
+    median, quantiles) are read.
+
+    Args:
+        time_series_set (TimeSeriesSet): time series
+        statistics (List[str], optional): statistics to compute. Defaults to
+        ["mean", "min", "max", "q10", "q90"].
+        column (str, optional): events column, "value" or "flag". Defaults to
+        "value".
+
+    Returns:
+        pd.DataFrame: one row per time series (location_id, parameter_id,
+        qualifier_id) and one column per statistic
+
+    """
+
+    _validate(statistics)
+    position = 1 if column == "value" else 2
+    rows = [
+        _sorted_statistics(
+            np.asarray(i.to_arrays()[position], dtype=np.float64), statistics
+            )
+        for i in time_series_set.time_series
+        ]
+    return pd.DataFrame(
+        rows, index=_series_index(time_series_set), columns=list(statistics)
+        )
+
+
+def _period_labels(index: pd.DatetimeIndex,
+                   period: str,
+                   start_month: int) -> pd.Index:
+    if period == "hydrological_year":
+        return pd.Index(
+            index.year - (index.month < start_month).astype(int),
+            name="hydrological_year"
+            )
+    return pd.Index(
+        index.to_period(PERIODS.get(period, period)).start_time, name="period"
+        )
+
+
+def period_statistics(time_series_set,
+                      period: str = "day",
+                      statistics: List[str] = DEFAULT_STATISTICS,
+                      column: str = "value",
+                      start_month: int = HYDROLOGICAL_YEAR_START) -> pd.DataFrame:
+    """
+    Statistics of every time series per period
+
+    All series are aligned in one matrix and grouped once, every statistic is
+    one vectorized aggregation over all series.
+
+    Args:
+        time_series_set (TimeSeriesSet): time series
+        period (str, optional): "day", "month", "year", "hydrological_year" or
+        a pandas period alias. Defaults to "day".
+        statistics (List[str], optional): statistics to compute. Defaults to
+        ["mean", "min", "max", "q10", "q90"].
+        column (str, optional): events column, "value" or "flag". Defaults to
+        "value".
+        start_month (int, optional): first month of the hydrological year.
+        Defaults to 10 (October).
+
+    Returns:
+        pd.DataFrame: one row per time series and period, one column per
+        statistic
+
+    """
+
+    _validate(statistics)
+    df = time_series_set.to_frame(column)
+    groups = df.groupby(_period_labels(df.index, period, start_month))
+
+    quantiles = [_quantile(i) for i in statistics if _quantile(i) is not None]
+    if quantiles:
+        quantile_frame = groups.quantile(quantiles)
+
+    columns = {}
+    for statistic in statistics:
+        quantile = _quantile(statistic)
+        if quantile is None:
+            result = groups.agg(statistic)
+        else:
+            result = quantile_frame.xs(quantile, level=-1)
+        columns[statistic] = result.T.stack()
+    return pd.DataFrame(columns)
+
+
+def rolling(time_series_set,
+            window: str,
+            statistic: str = "mean",
+            column: str = "value",
+            min_periods: int = 1) -> pd.DataFrame:
+    """
+    Rolling statistic of all time series on their aligned datetimes
+
+    Args:
+        time_series_set (TimeSeriesSet): time series
+        window (str): time window as pandas offset alias, e.g. "24h"
+        statistic (str, optional): statistic to compute. Defaults to "mean".
+        column (str, optional): events column, "value" or "flag". Defaults to
+        "value".
+        min_periods (int, optional): minimum number of events in a window.
+        Defaults to 1.
+
+    Returns:
+        pd.DataFrame: aligned (datetime x time series) frame as to_frame
+
+    """
+
+    _validate([statistic])
+    windows = time_series_set.to_frame(column).rolling(
+        window, min_periods=min_periods
+        )
+    quantile = _quantile(statistic)
+    if quantile is not None:
+        return windows.quantile(quantile)
+    return windows.agg(statistic)
+
+
+def cumulative(time_series_set, column: str = "value") -> pd.DataFrame:
+    """Cumulative sum of all time series on their aligned datetimes."""
+    return time_series_set.to_frame(column).cumsum()
@@ -0,0 +1,79 @@
+"""Incremental parsing of large FEWS PI JSON responses."""
+
+import codecs
+import json
+import re
+from typing import Iterable, Iterator
+
+SEPARATORS = re.compile(r"[\s,]*")
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[dict]:
+    """
+    Yield the items of a top-level JSON array one by one from a byte stream
+
+    Only the item being decoded is kept in memory. An incomplete item is decoded
+    again only after the buffer has doubled in size, so every byte is decoded a
+    bounded number of times.
+
+    Args:
+        chunks (Iterable[bytes]): JSON document as chunks of bytes, e.g.
+        requests.Response.iter_content()
+        key (str): key of the array in the top-level JSON object, e.g.
+        "timeSeries"
+
+    Yields:
+        dict: decoded array items
+
+    """
+
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    array_start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+
+    def _read(buffer: str) -> tuple:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return buffer + utf8.decode(b"", final=True), False
+        return buffer + utf8.decode(chunk), True
+
+    # read until the start of the array
+    buffer, more = "", True
+    match = None
+    while match is None:
+        match = array_start.search(buffer)
+        if match is None:
+            if not more:
+                return
+            buffer, more = _read(buffer)
+    buffer = buffer[match.end():]
+    pos = 0
+
+    while True:
+        pos = SEPARATORS.match(buffer, pos).end()
+        if pos == len(buffer):
+            if not more:
+                raise ValueError(f"JSON stream ends inside array '{key}'")
+            buffer, more = _read(buffer[pos:])
+            pos = 0
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            item, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if not more:
+                raise
+            # item incomplete: read until the buffer has doubled
+            buffer = buffer[pos:]
+            pos, size = 0, len(buffer)
+            while more and (len(buffer) < 2 * size):
+                buffer, more = _read(buffer)
+            continue
+        yield item
+
+        # drop consumed text once it is the larger part of the buffer
+        if pos > len(buffer) // 2:
+            buffer = buffer[pos:]
+            pos = 0
@@ -7,13 +7,14 @@ class Timer(object):
     """Record function efficiency."""
 
     def __init__(self, logger):
-        self.start = time.time()
-        self.milestone = self.start
+        self.start_time = time.time()
+        self.milestone = self.start_time
         self.logger = logger
 
     def start(self):
         """Start the timer."""
-        self.start = time.time()
+        self.start_time = time.time()
+        self.milestone = self.start_time
 
     def report(self, message=""):
         """Set milestone and report."""
@@ -23,6 +24,7 @@ class Timer(object):
     def reset(self, message=None):
         """Report task-efficiency and reset."""
         if message:
-            self.logger.debug(f"{message} in {(time.time() - self.start):.3f} sec")
-        self.start = time.time()
-        self.milestone = self.start
+            self.logger.debug(
+                f"{message} in {(time.time() - self.start_time):.3f} sec"
+                )
+        self.start()
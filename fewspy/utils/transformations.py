@@ -54,6 +54,38 @@ def parameters_to_fews(parameters: dict) -> dict:
 
         return k, v
 
-    args = (_convert_kv(k, v) for k, v in parameters.items() if k in API_KEYS)
-    args = (i for i in args if i[1] is not None)
+    args = (
+        _convert_kv(k, v) for k, v in parameters.items()
+        if (k in API_KEYS) and (v is not None)
+        )
     return {i[0]: i[1] for i in args}
+
+
+def parameters_to_query(parameters: dict) -> list:
+    """
+    Convert FEWS API parameters to a list of query tuples
+
+    Lists are expanded to repeated keys and booleans are written in lower case,
+    so the parameters can be passed to clients that (unlike requests) do not
+    accept list or boolean values, like aiohttp.
+
+    Args:
+        parameters (dict): parameters as returned by parameters_to_fews
+
+    Returns:
+        list: list of (key, value) tuples with string values
+
+    """
+
+    def _to_str(v) -> str:
+        if isinstance(v, bool):
+            return str(v).lower()
+        return str(v)
+
+    query = []
+    for k, v in parameters.items():
+        if isinstance(v, (list, tuple)):
+            query += [(k, _to_str(i)) for i in v]
+        else:
+            query.append((k, _to_str(v)))
+    return query
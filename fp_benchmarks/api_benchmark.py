@@ -0,0 +1,52 @@
+"""Benchmark every Api method against the mock FEWS server."""
+
+from mock_fews import FILTER_ID, START_TIME, TIME_STEP
+
+from conftest import EVENTS
+
+KWARGS = dict(filter_id=FILTER_ID,
+              start_time=START_TIME,
+              end_time=START_TIME + TIME_STEP * (EVENTS - 1))
+
+
+def test_get_filters(benchmark, api):
+    benchmark(api.get_filters)
+
+
+def test_get_locations(benchmark, api):
+    benchmark(api.get_locations, attributes=True)
+
+
+def test_get_locations_no_geometry(benchmark, api):
+    benchmark(api.get_locations, geometry=False)
+
+
+def test_get_parameters(benchmark, api):
+    benchmark(api.get_parameters)
+
+
+def test_get_qualifiers(benchmark, api):
+    benchmark(api.get_qualifiers)
+
+
+def test_get_time_series_headers(benchmark, api):
+    benchmark(api.get_time_series, only_headers=True, **KWARGS)
+
+
+def test_get_time_series_serial(benchmark, api):
+    result = benchmark(api.get_time_series, **KWARGS)
+    assert not result.empty
+
+
+def test_get_time_series_parallel(benchmark, api):
+    result = benchmark(api.get_time_series, parallel=True, **KWARGS)
+    assert not result.empty
+
+
+def test_get_time_series_chunked(benchmark, api):
+    result = benchmark(api.get_time_series, max_events=EVENTS * 10, **KWARGS)
+    assert not result.empty
+
+
+def test_iter_time_series(benchmark, api):
+    benchmark(lambda: sum(1 for _ in api.iter_time_series(**KWARGS)))
@@ -0,0 +1,58 @@
+"""
+Benchmarks against an offline mock FEWS server, run with:
+
+    pytest fp_benchmarks
+
+Files named *_benchmark.py are collected. Sizes can be set with the environment
+variables FEWS_MOCK_LOCATIONS, FEWS_MOCK_PARAMETERS and FEWS_MOCK_EVENTS.
+
+By default the mock server runs in the benchmark process and competes with the
+client for the GIL, which penalizes the concurrent fetchers. For fair serial vs
+parallel numbers run the server in its own process and pass its url:
+
+    python fp_tests/mock_fews.py --locations 50 --events 3000
+    FEWS_MOCK_URL=http://127.0.0.1:<port>/FewsWebServices/rest/fewspiservice/v1/ \
+        pytest fp_benchmarks
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, Path(__file__).parents[1].as_posix())
+sys.path.insert(0, (Path(__file__).parents[1] / "fp_tests").as_posix())
+
+from mock_fews import MockFews
+
+from fewspy.api import Api
+
+LOCATIONS = int(os.environ.get("FEWS_MOCK_LOCATIONS", 50))
+PARAMETERS = int(os.environ.get("FEWS_MOCK_PARAMETERS", 2))
+EVENTS = int(os.environ.get("FEWS_MOCK_EVENTS", 3000))
+
+
+def pytest_collect_file(file_path, parent):
+    # files passed on the command line are collected by pytest itself
+    if file_path.name.endswith("_benchmark.py") and (
+            not parent.session.isinitpath(file_path)):
+        return pytest.Module.from_parent(parent, path=file_path)
+
+
+@pytest.fixture(scope="session")
+def url():
+    if "FEWS_MOCK_URL" in os.environ.keys():
+        yield os.environ["FEWS_MOCK_URL"]
+    else:
+        with MockFews(locations=LOCATIONS,
+                      parameters=PARAMETERS,
+                      events=EVENTS,
+                      attributes=40) as server:
+            yield server.url
+
+
+@pytest.fixture(scope="session")
+def api(url):
+    with Api(url) as api:
+        yield api
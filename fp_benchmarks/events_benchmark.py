@@ -0,0 +1,78 @@
+"""
+Benchmark Events.from_pi_events against the former DataFrame-of-dicts parser.
+
+Run with: python fp_benchmarks/events_benchmark.py [number_of_events]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.time_series import EVENT_COLUMNS, Events
+
+MISSING_VALUE = -999.0
+
+
+def legacy_from_pi_events(pi_events: list, missing_value: float) -> pd.DataFrame:
+    """Events parser as implemented before the columnar parser."""
+    df = pd.DataFrame(pi_events)
+    df["datetime"] = pd.to_datetime(df["date"]) + pd.to_timedelta(df["time"])
+    df["value"] = pd.to_numeric(df["value"])
+    df = df.loc[df["value"] != missing_value]
+    drop_cols = [i for i in df.columns if i not in EVENT_COLUMNS]
+    df = df.drop(columns=drop_cols)
+    df["flag"] = pd.to_numeric(df["flag"])
+    return df.set_index("datetime")
+
+
+def pi_events(count: int) -> list:
+    """Generate 15-minute FEWS PI events with some missings."""
+    datetime = pd.date_range("2015-01-01", periods=count, freq="15min")
+    values = np.random.default_rng(0).normal(size=count).round(3)
+    values[::100] = MISSING_VALUE
+    return [
+        {"date": i.strftime("%Y-%m-%d"),
+         "time": i.strftime("%H:%M:%S"),
+         "value": str(j),
+         "flag": "0"}
+        for i, j in zip(datetime, values)
+        ]
+
+
+def measure(function, *args) -> tuple:
+    """Return (seconds, peak MiB, result) of function(*args)."""
+    start = time.perf_counter()
+    result = function(*args)
+    seconds = time.perf_counter() - start
+
+    # memory is traced in a second run, tracing slows down the first
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 350_000
+    events = pi_events(count)
+
+    legacy = measure(legacy_from_pi_events, events, MISSING_VALUE)
+    columnar = measure(Events.from_pi_events, events, MISSING_VALUE)
+
+    pd.testing.assert_frame_equal(
+        legacy[2], columnar[2], check_dtype=False, check_index_type=False,
+        check_frame_type=False
+        )
+
+    print(f"{count} events")
+    print(f"legacy:   {legacy[0]:.3f} sec, peak {legacy[1]:.1f} MiB")
+    print(f"columnar: {columnar[0]:.3f} sec, peak {columnar[1]:.1f} MiB")
+    print(f"speed-up: {legacy[0] / columnar[0]:.1f}x")
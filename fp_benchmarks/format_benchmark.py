@@ -0,0 +1,46 @@
+"""Benchmark bytes on wire and parse time of the time series document formats."""
+
+import pytest
+from mock_fews import FILTER_ID
+
+from fewspy.formats import get_format
+from fewspy.time_series import TimeSeriesSet
+
+FORMATS = ["PI_JSON", "PI_XML"]
+
+
+@pytest.fixture(scope="module", params=FORMATS)
+def document_format(request):
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def content(api, url, document_format):
+    return api.session.get(
+        f"{url}timeseries",
+        params={"filterId": FILTER_ID, "documentFormat": document_format}
+        ).content
+
+
+def test_loads(benchmark, content, document_format):
+    benchmark.extra_info["bytes"] = len(content)
+    benchmark(get_format(document_format).loads, content)
+
+
+def test_iter_time_series(benchmark, content, document_format):
+    chunks = [content[i:i + 2 ** 20] for i in range(0, len(content), 2 ** 20)]
+    benchmark.extra_info["bytes"] = len(content)
+    benchmark(lambda: sum(
+        1 for _ in get_format(document_format).iter_time_series(chunks)
+        ))
+
+
+def test_get_time_series(benchmark, api, document_format):
+    benchmark(
+        api.get_time_series, filter_id=FILTER_ID, document_format=document_format
+        )
+
+
+def test_parse(benchmark, content, document_format):
+    pi_time_series = get_format(document_format).loads(content)
+    benchmark(TimeSeriesSet.from_pi_time_series, pi_time_series)
@@ -0,0 +1,71 @@
+"""Benchmark transfer time against decode and parse time of time series."""
+
+import json
+
+import pandas as pd
+import pytest
+from mock_fews import FILTER_ID
+
+from events_benchmark import legacy_from_pi_events
+from fewspy.time_series import Events, Header, TimeSeriesSet
+
+
+@pytest.fixture(scope="module")
+def time_series_url(url):
+    return f"{url}timeseries"
+
+
+@pytest.fixture(scope="module")
+def content(api, time_series_url):
+    return api.session.get(
+        time_series_url, params={"filterId": FILTER_ID}
+        ).content
+
+
+@pytest.fixture(scope="module")
+def pi_time_series(content):
+    return json.loads(content)
+
+
+def test_transfer(benchmark, api, time_series_url):
+    benchmark(lambda: api.session.get(
+        time_series_url, params={"filterId": FILTER_ID}
+        ).content)
+
+
+def test_decode(benchmark, content):
+    benchmark(json.loads, content)
+
+
+def test_parse(benchmark, pi_time_series):
+    benchmark(TimeSeriesSet.from_pi_time_series, pi_time_series)
+
+
+def test_parse_events(benchmark, pi_time_series):
+    pi_events = pi_time_series["timeSeries"][0]["events"]
+    benchmark(Events.from_pi_events, pi_events, -999.0)
+
+
+def test_parse_events_legacy(benchmark, pi_time_series):
+    pi_events = pi_time_series["timeSeries"][0]["events"]
+    benchmark(legacy_from_pi_events, pi_events, -999.0)
+
+
+def test_parse_headers(benchmark, pi_time_series):
+    pi_headers = [i["header"] for i in pi_time_series["timeSeries"]] * 100
+    benchmark(lambda: [Header.from_pi_header(i) for i in pi_headers])
+
+
+@pytest.fixture(scope="module")
+def time_series_set(pi_time_series):
+    return TimeSeriesSet.from_pi_time_series(pi_time_series)
+
+
+def test_to_frame(benchmark, time_series_set):
+    benchmark(time_series_set.to_frame)
+
+
+def test_to_frame_concat(benchmark, time_series_set):
+    benchmark(lambda: pd.concat(
+        [i.events["value"] for i in time_series_set.time_series], axis=1
+        ))
@@ -0,0 +1,37 @@
+"""Benchmark the statistics engine against the legacy per-frame helpers."""
+
+import pytest
+from mock_fews import FILTER_ID
+
+from fewspy.utils.statistics import period_statistics, summary
+from utils import statistics as legacy
+
+STATISTICS = ["mean", "median", "min", "max", "q10", "q90"]
+LEGACY = [legacy.average,
+          legacy.median,
+          legacy.minimum,
+          legacy.maximum,
+          legacy.quantile_10,
+          legacy.quantile_90]
+
+
+@pytest.fixture(scope="module")
+def time_series_set(api):
+    return api.get_time_series(filter_id=FILTER_ID)
+
+
+def test_summary(benchmark, time_series_set):
+    benchmark(summary, time_series_set, STATISTICS)
+
+
+def test_summary_legacy(benchmark, time_series_set):
+    def _legacy():
+        for time_series in time_series_set.time_series:
+            df = time_series.events.copy()
+            for function in LEGACY:
+                df = function(df)
+    benchmark(_legacy)
+
+
+def test_period_statistics(benchmark, time_series_set):
+    benchmark(period_statistics, time_series_set, "day", STATISTICS)
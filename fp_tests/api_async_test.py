@@ -0,0 +1,71 @@
+import sys
+import asyncio
+from pathlib import Path
+from datetime import datetime
+from mock_fews import FILTER_ID
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.api_async import AsyncApi
+
+KWARGS = dict(filter_id=FILTER_ID,
+              start_time=datetime(2022, 1, 1),
+              end_time=datetime(2022, 1, 2))
+
+
+def run(url: str, method: str, *args, **kwargs):
+    async def _run():
+        async with AsyncApi(url) as api:
+            return await getattr(api, method)(*args, **kwargs)
+    return asyncio.run(_run())
+
+
+def test_filters(server):
+    assert run(server.url, "get_filters")[0]["id"] == FILTER_ID
+
+
+def test_locations(server):
+    locations = run(server.url, "get_locations", attributes=True)
+    assert len(locations) == 5
+    assert locations.crs.to_epsg() == 28992
+    assert locations["ATTR1"].dtype == float
+
+
+def test_parameters(server):
+    parameters = run(server.url, "get_parameters")
+    assert list(parameters.index) == server.parameter_ids
+
+
+def test_qualifiers(server):
+    qualifiers = run(server.url, "get_qualifiers")
+    assert qualifiers.loc["validatie", "name"] == "Validatie"
+
+
+def test_time_series(server):
+    time_series_set = run(server.url, "get_time_series", **KWARGS)
+    assert len(time_series_set) == 10
+    assert all(len(i.events) == 97 for i in time_series_set.time_series)
+
+
+def test_time_series_parallel_and_chunked(server):
+    assert len(
+        run(server.url, "get_time_series", **KWARGS, parallel=True)
+        ) == 10
+    time_series_set = run(
+        server.url, "get_time_series", **KWARGS, max_events=100
+        )
+    assert all(len(i.events) == 97 for i in time_series_set.time_series)
+
+
+def test_shared_session(server):
+    async def _run():
+        async with AsyncApi(server.url) as api:
+            session = api.session
+            results = await asyncio.gather(
+                api.get_filters(), api.get_time_series(**KWARGS)
+                )
+            assert api.session is session
+            return results
+    filters, time_series_set = asyncio.run(_run())
+    assert filters and len(time_series_set) == 10
@@ -0,0 +1,132 @@
+import sys
+from pathlib import Path
+from datetime import datetime
+from mock_fews import FILTER_ID
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.api import Api
+
+KWARGS = dict(filter_id=FILTER_ID,
+              start_time=datetime(2022, 1, 1),
+              end_time=datetime(2022, 1, 2))
+
+
+def test_filters(api):
+    assert api.get_filters()[0]["id"] == FILTER_ID
+
+
+def test_locations(api):
+    locations = api.get_locations(attributes=True)
+    assert len(locations) == 5
+    assert locations.crs.to_epsg() == 28992
+    assert locations["ATTR1"].dtype == float
+
+
+def test_parameters(server, api):
+    parameters = api.get_parameters()
+    assert list(parameters.index) == server.parameter_ids
+    assert not parameters["uses_datum"].any()
+
+
+def test_qualifiers(api):
+    assert api.get_qualifiers().loc["validatie", "name"] == "Validatie"
+
+
+def test_time_series(api):
+    time_series_set = api.get_time_series(**KWARGS)
+    assert len(time_series_set) == 10
+    assert all(len(i.events) == 97 for i in time_series_set.time_series)
+
+
+def test_time_series_parallel(server, api):
+    time_series_set = api.get_time_series(**KWARGS, parallel=True)
+    assert len(time_series_set) == 10
+    assert sorted(time_series_set.location_ids) == server.location_ids
+
+
+def test_time_series_chunked(api):
+    time_series_set = api.get_time_series(**KWARGS, max_events=100)
+    assert len(time_series_set) == 10
+    assert all(len(i.events) == 97 for i in time_series_set.time_series)
+
+
+def test_iter_time_series(api):
+    assert len(list(api.iter_time_series(**KWARGS, chunk_size=1024))) == 10
+
+
+def test_time_series_float32(api):
+    time_series_set = api.get_time_series(**KWARGS, compact="float32")
+    assert all(i._compact.value.dtype == "float32"
+               for i in time_series_set.time_series)
+
+
+def test_time_series_lazy(server, api):
+    requests = len(server.requests)
+    time_series_set = api.get_time_series(**KWARGS, lazy=True)
+    assert len(server.requests) == requests + 1
+    assert all(i.lazy for i in time_series_set.time_series)
+
+    # repr and len do not fetch events
+    assert "events=<lazy>" in repr(time_series_set)
+    assert len(time_series_set.time_series[0]) == 0
+    assert len(server.requests) == requests + 1
+    assert all(i.lazy for i in time_series_set.time_series)
+
+    # events on access
+    assert len(time_series_set.time_series[0].events) == 97
+    assert len(server.requests) == requests + 2
+
+    # batched prefetch, one request per parameter
+    time_series_set.prefetch(location_ids=server.location_ids[:3])
+    assert len(server.requests) == requests + 4
+    assert sum(i.lazy for i in time_series_set.time_series) == 4
+    assert time_series_set.to_frame().shape == (97, 10)
+
+
+def test_time_series_pi_xml(api):
+    reference = api.get_time_series(**KWARGS)
+    time_series_set = api.get_time_series(**KWARGS, document_format="PI_XML")
+    assert time_series_set.time_zone == reference.time_zone
+    assert time_series_set.to_frame().equals(reference.to_frame())
+    assert time_series_set.time_series[0].header == (
+        reference.time_series[0].header
+        )
+
+
+def test_iter_time_series_pi_xml(api):
+    time_series = list(api.iter_time_series(
+        **KWARGS, chunk_size=1024, document_format="PI_XML"
+        ))
+    assert len(time_series) == 10
+    assert all(len(i.events) == 97 for i in time_series)
+
+
+def test_time_series_plot_width(server, api):
+    time_series_set = api.get_time_series(**KWARGS, plot_width=24)
+    assert server.requests[-1][1]["thinning"] == ["3600000"]
+    assert all(len(i.events) == 25 for i in time_series_set.time_series)
+
+
+def test_metrics(api):
+    api.metrics.clear()
+    api.get_time_series(**KWARGS)
+    list(api.iter_time_series(**KWARGS, chunk_size=1024))
+    api.get_filters()
+    records = list(api.metrics.records)
+    assert [i.endpoint for i in records] == ["timeseries"] * 2 + ["filters"]
+    assert records[0].content_encoding == "gzip"
+    assert records[0].wire_bytes < records[0].content_bytes
+    assert records[0].content_bytes == records[1].content_bytes
+    summary = api.metrics.summary()
+    assert summary.loc["timeseries", "requests"] == 2
+    assert summary.loc["timeseries", "compression_ratio"] > 1
+
+
+def test_no_compression(server):
+    with Api(server.url, compression=False) as uncompressed:
+        uncompressed.get_filters()
+        record = uncompressed.metrics.records[-1]
+    assert record.content_encoding == "identity"
+    assert record.wire_bytes == record.content_bytes
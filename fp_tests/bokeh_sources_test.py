@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+import json
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+import numpy as np
+
+from fewspy.bokeh_sources import TimeSeriesSetSource, TimeSeriesSource
+from fewspy.time_series import Events, TimeSeries, TimeSeriesSet
+
+DATA_PATH = Path(__file__).parent / "data"
+
+with open(DATA_PATH / "pi_time_series.json") as src:
+    pi_time_series = json.load(src)
+
+timeseriesset = TimeSeriesSet.from_pi_time_series(pi_time_series)
+time_series = timeseriesset.time_series[0]
+events = time_series.events
+
+
+def _time_series(events: Events) -> TimeSeries:
+    return TimeSeries(header=time_series.header, events=events)
+
+
+def test_numpy_columns():
+    source = TimeSeriesSource(_time_series(events.iloc[:100])).source
+    assert all(isinstance(i, np.ndarray) for i in source.data.values())
+    assert len(source.data["value"]) == 100
+
+
+def test_stream_and_patch():
+    source = TimeSeriesSource(_time_series(events.iloc[:100]))
+    refresh = Events(events.iloc[90:120].copy())
+    refresh.iloc[5, 0] = 1000.0
+    result = source.update(_time_series(refresh))
+    assert result == {"streamed": 20, "patched": 1, "replaced": 0}
+    assert len(source.source.data["value"]) == 120
+    assert source.source.data["value"][95] == 1000.0
+
+
+def test_replace_on_insert():
+    source = TimeSeriesSource(_time_series(events.iloc[::2]))
+    assert source.update(_time_series(events))["replaced"] == 1
+    assert len(source.source.data["value"]) == len(events)
+
+
+def test_time_series_set_source():
+    source = TimeSeriesSetSource(timeseriesset)
+    assert len(source.columns) == 2
+    result = source.update(timeseriesset)
+    assert result == {"streamed": 0, "patched": 0, "replaced": 0}
+
+
+def test_rollover():
+    source = TimeSeriesSource(_time_series(events.iloc[:100]), rollover=50)
+    assert len(source.source.data["value"]) == 50
+    result = source.update(_time_series(events.iloc[:120]))
+    assert result == {"streamed": 20, "patched": 0, "replaced": 0}
+    assert len(source.source.data["value"]) == 50
+
+    # rows dropped by rollover do not force a replace
+    result = source.update(_time_series(events.iloc[:130]))
+    assert result == {"streamed": 10, "patched": 0, "replaced": 0}
+    assert all(type(i) is int for i in result.values())
+    assert len(source.source.data["value"]) == 50
+    assert source.source.data["datetime"][-1] == events.index[129]
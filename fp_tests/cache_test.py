@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+from datetime import datetime
+import json
+import sqlite3
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.cache import TimeSeriesCache, request_key
+from fewspy.time_series import TimeSeriesSet
+
+DATA_PATH = Path(__file__).parent / "data"
+
+with open(DATA_PATH / "pi_time_series.json") as src:
+    pi_time_series = json.load(src)
+
+
+class Fetch:
+    """Serve the reference time series within the requested window."""
+
+    def __init__(self):
+        self.windows = []
+
+    def __call__(self, start_time, end_time, **kwargs):
+        self.windows.append((start_time, end_time))
+        # events are in time zone +1
+        start = start_time.replace(hour=start_time.hour + 1).isoformat()
+        end = end_time.replace(hour=end_time.hour + 1).isoformat()
+        time_series = [
+            {**i, "events": [j for j in i["events"]
+                             if start <= f"{j['date']}T{j['time']}" <= end]}
+            for i in pi_time_series["timeSeries"]
+            ]
+        return TimeSeriesSet.from_pi_time_series(
+            {**pi_time_series, "timeSeries": time_series}
+            )
+
+
+def test_incremental(tmp_path):
+    cache = TimeSeriesCache(tmp_path / "cache.sqlite")
+    fetch = Fetch()
+    kwargs = dict(filter_id="WDB_OW_KGM", location_ids=["b", "a"])
+
+    first = cache.get_time_series(fetch,
+                                  start_time=datetime(2022, 5, 2),
+                                  end_time=datetime(2022, 5, 3),
+                                  **kwargs)
+    second = cache.get_time_series(fetch,
+                                   start_time=datetime(2022, 5, 1),
+                                   end_time=datetime(2022, 5, 3, 12),
+                                   **kwargs)
+    third = cache.get_time_series(fetch,
+                                  start_time=datetime(2022, 5, 2),
+                                  end_time=datetime(2022, 5, 3),
+                                  **kwargs)
+
+    assert fetch.windows == [
+        (datetime(2022, 5, 2), datetime(2022, 5, 3)),
+        (datetime(2022, 5, 1), datetime(2022, 5, 2)),
+        (datetime(2022, 5, 3), datetime(2022, 5, 3, 12))
+        ]
+    assert len(first) == len(second) == len(third) == 2
+    assert first.time_zone == 1.0
+    assert first.version == "1.28"
+    reference = fetch(**kwargs,
+                      start_time=datetime(2022, 5, 1),
+                      end_time=datetime(2022, 5, 3, 12))
+    for i, j in zip(second.time_series, reference.time_series):
+        assert i.header == j.header
+        assert i.events.equals(j.events)
+    for i, j in zip(first.time_series, third.time_series):
+        assert i.events.equals(j.events)
+    cache.close()
+
+
+def test_request_key():
+    assert request_key("f", ["b", "a"]) == request_key("f", ["a", "b"])
+    assert request_key("f", "a") == request_key("f", ["a"])
+
+
+def test_old_schema(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    with sqlite3.connect(path.as_posix()) as connection:
+        connection.execute("CREATE TABLE series (header BLOB)")
+        connection.execute("INSERT INTO series VALUES (?)", (b"pickle",))
+    connection.close()
+
+    cache = TimeSeriesCache(path)
+    fetch = Fetch()
+    kwargs = dict(filter_id="WDB_OW_KGM",
+                  start_time=datetime(2022, 5, 2),
+                  end_time=datetime(2022, 5, 3))
+    cache.get_time_series(fetch, **kwargs)
+    cache.close()
+
+    # headers are stored as PI JSON and read by a new connection
+    cache = TimeSeriesCache(path)
+    cached = cache.get_time_series(fetch, **kwargs)
+    assert len(fetch.windows) == 1
+    assert cached.time_series[0].header == fetch(**kwargs).time_series[0].header
+    cache.close()
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+from datetime import datetime
+import json
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.get_time_series_chunked import (
+    _stitch,
+    plan_requests,
+    time_step_to_timedelta
+    )
+from fewspy.time_series import TimeSeriesSet
+
+DATA_PATH = Path(__file__).parent / "data"
+
+with open(DATA_PATH / "pi_time_series.json") as src:
+    pi_time_series = json.load(src)
+
+START_TIME = datetime(2022, 1, 1)
+END_TIME = datetime(2022, 1, 11)
+
+
+def test_time_step():
+    assert time_step_to_timedelta(
+        {"unit": "minute", "multiplier": "15"}
+        ).total_seconds() == 900
+    assert time_step_to_timedelta(
+        {"unit": "nonequidistant"}
+        ).total_seconds() == 900
+
+
+def test_plan_batches():
+    chunks = plan_requests(
+        START_TIME, END_TIME, {"a": 96, "b": 96, "c": 96}, max_events=2000
+        )
+    assert [i[2] for i in chunks] == [["a", "b"], ["c"]]
+    assert all((i[0], i[1]) == (START_TIME, END_TIME) for i in chunks)
+
+
+def test_plan_slices():
+    chunks = plan_requests(
+        START_TIME, END_TIME, {"a": 96, "b": 1}, max_events=500
+        )
+    assert [i[2] for i in chunks] == [["a"]] * 2 + [["b"]]
+    assert chunks[0][1] == chunks[1][0] == datetime(2022, 1, 6)
+    assert chunks[1][1] == END_TIME
+
+
+def test_stitch():
+    def _slice(start, end):
+        time_series = [
+            {**i, "events": i["events"][start:end]}
+            for i in pi_time_series["timeSeries"]
+            ]
+        return TimeSeriesSet.from_pi_time_series(
+            {**pi_time_series, "timeSeries": time_series}
+            )
+
+    # slices overlap one event at their boundary
+    stitched = _stitch([_slice(0, 101), _slice(100, 201), _slice(200, None)])
+    reference = TimeSeriesSet.from_pi_time_series(pi_time_series)
+    assert len(stitched) == 2
+    assert stitched.version == reference.version
+    for i, j in zip(stitched.time_series, reference.time_series):
+        assert i.events.equals(j.events)
@@ -0,0 +1,128 @@
+import sys
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from datetime import datetime
+from mock_fews import FILTER_ID
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+import pytest
+
+from fewspy.api import Api
+from fewspy.api_async import AsyncApi
+from fewspy.utils.coalescing import AsyncSingleFlight, SingleFlight, request_key
+
+KWARGS = dict(filter_id=FILTER_ID,
+              start_time=datetime(2022, 1, 1),
+              end_time=datetime(2022, 1, 2))
+
+
+def test_request_key():
+    key = request_key({**KWARGS, "url": "timeseries", "thinning": None})
+    assert key == request_key({**KWARGS, "url": "timeseries",
+                               "logger": None, "session": object()})
+    assert key != request_key({**KWARGS, "url": "timeseries", "compact": True})
+    assert request_key({**KWARGS, "location_ids": ["B", "A"]}) == (
+        request_key({**KWARGS, "location_ids": ["A", "B"]})
+        )
+    assert request_key({**KWARGS, "parameter_ids": "P"}) == (
+        request_key({**KWARGS, "parameter_ids": ["P"]})
+        )
+
+
+def test_request_key_attributes():
+    keys = [request_key({"url": "u/locations", "filter_id": "f",
+                         "attributes": i})
+            for i in [[], ["x"], True, ["y", "x"]]]
+    assert len(set(keys)) == 4
+    assert keys[3] == request_key(
+        {"url": "u/locations", "filter_id": "f", "attributes": ["x", "y"]}
+        )
+
+
+def test_single_flight():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def _slow(value):
+        calls.append(value)
+        release.wait(5)
+        return value
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(single_flight.do, "key", _slow, value=1)
+                   for i in range(4)]
+        for i in range(100):
+            if single_flight.waiters.get("key") == 4:
+                break
+            time.sleep(0.01)
+        assert single_flight.waiters == {"key": 4}
+        release.set()
+        assert [i.result() for i in futures] == [1] * 4
+
+    assert calls == [1]
+    assert (single_flight.requests, single_flight.coalesced) == (1, 3)
+    assert single_flight.waiters == {}
+
+
+def test_single_flight_error():
+    single_flight = SingleFlight()
+
+    def _fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", _fail)
+    assert single_flight.waiters == {}
+
+
+def test_api(server):
+    api = Api(server.url)
+    requests = len(server.requests)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda i: api.get_time_series(**KWARGS), range(8)
+            ))
+    assert all(len(i) == 10 for i in results)
+    assert len(server.requests) - requests == api.single_flight.requests
+    assert api.single_flight.requests + api.single_flight.coalesced == 8
+
+
+def test_async_single_flight():
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def _slow(value):
+        calls.append(value)
+        await asyncio.sleep(0.05)
+        return value
+
+    async def _run():
+        return await asyncio.gather(
+            *[single_flight.do("key", _slow, value=1) for i in range(5)]
+            )
+
+    assert asyncio.run(_run()) == [1] * 5
+    assert calls == [1]
+    assert (single_flight.requests, single_flight.coalesced) == (1, 4)
+    assert single_flight.waiters == {}
+
+
+def test_async_api(server):
+    async def _run():
+        async with AsyncApi(server.url) as api:
+            results = await asyncio.gather(
+                *[api.get_time_series(**KWARGS) for i in range(5)]
+                )
+            return api, results
+
+    requests = len(server.requests)
+    api, results = asyncio.run(_run())
+    assert all(i is results[0] for i in results)
+    assert len(server.requests) - requests == 1
+    assert api.single_flight.coalesced == 4
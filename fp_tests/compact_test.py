@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+import json
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+import numpy as np
+
+from fewspy.time_series import CompactEvents, TimeSeries, TimeSeriesSet
+
+DATA_PATH = Path(__file__).parent / "data"
+
+with open(DATA_PATH / "pi_time_series.json") as src:
+    pi_time_series = json.load(src)
+
+reference = TimeSeriesSet.from_pi_time_series(pi_time_series)
+compact = TimeSeriesSet.from_pi_time_series(pi_time_series, compact=True)
+
+
+def test_compact_storage():
+    time_series = compact.time_series[0]
+    assert time_series.compact
+    assert isinstance(time_series._compact, CompactEvents)
+    assert len(time_series) == len(reference.time_series[0].events)
+
+
+def test_to_frame_stays_compact():
+    df = compact.to_frame()
+    assert df.equals(reference.to_frame())
+    assert all(i.compact for i in compact.time_series)
+
+
+def test_events_on_access():
+    time_series = TimeSeries.from_pi_time_series(
+        pi_time_series["timeSeries"][0], compact=True
+        )
+    events = time_series.events
+    assert not time_series.compact
+    assert time_series.events is events
+    assert time_series == reference.time_series[0]
+
+
+def test_nbytes():
+    events = CompactEvents.from_pi_events(
+        pi_time_series["timeSeries"][0]["events"], -999.0, np.float32
+        )
+    assert events.nbytes == len(events) * (8 + 4 + 1)
+
+
+def test_value_dtype():
+    float32 = TimeSeriesSet.from_pi_time_series(
+        pi_time_series, compact="float32"
+        )
+    time_series = float32.time_series[0]
+    assert time_series._compact.value.dtype == np.float32
+    assert compact.time_series[0]._compact.value.dtype == np.float64
+    assert np.allclose(
+        time_series.events["value"], reference.time_series[0].events["value"]
+        )
+
+
+def test_empty_events():
+    time_series = TimeSeries(header=reference.time_series[0].header)
+    assert time_series.events.empty
+    assert time_series.events is not TimeSeries(header=None).events
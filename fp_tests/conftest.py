@@ -0,0 +1,32 @@
+"""
+Fixtures of the offline tests.
+
+The mock FEWS server is started once per test module, and stopped after its
+last test. A module sets its size with a MOCK_FEWS dict of MockFews arguments.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, Path(__file__).parents[1].as_posix())
+
+from mock_fews import MockFews
+
+from fewspy.api import Api
+
+MOCK_FEWS = dict(locations=5, parameters=2, events=200)
+
+
+@pytest.fixture(scope="module")
+def server(request):
+    kwargs = getattr(request.module, "MOCK_FEWS", MOCK_FEWS)
+    with MockFews(**kwargs) as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def api(server):
+    with Api(server.url) as api:
+        yield api
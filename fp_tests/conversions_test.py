@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.utils.conversions import attributes_to_frame, xy_array_to_point
+
+XY_ARRAY = np.array([["225746.0", "596639.0"], ["225750.5", "596640.0"]],
+                    dtype=object)
+
+
+def test_xy_array_to_point():
+    points = xy_array_to_point(XY_ARRAY)
+    assert len(points) == 2
+    assert (points[1].x, points[1].y) == (225750.5, 596640.0)
+
+
+ATTRIBUTE_VALUES = np.array([
+    [{"id": "MPN_IDENT", "type": "text", "value": "0012"},
+     {"id": "DEPTH", "type": "number", "value": "1.5"},
+     {"id": "ACTIVE", "type": "boolean", "value": "true"},
+     {"id": "CODE", "value": "7"}],
+    [{"id": "CODE", "value": "8"}],
+    []
+    ], dtype=object)
+
+
+def test_attributes_to_frame_selection():
+    df = attributes_to_frame(ATTRIBUTE_VALUES, ["DEPTH", "MPN_IDENT", "MISSING"])
+    assert list(df.columns) == ["DEPTH", "MPN_IDENT", "MISSING"]
+    assert df["DEPTH"].dtype == float
+    assert df["MPN_IDENT"].tolist() == ["0012", None, None]
+    assert df["MISSING"].isna().all()
+
+
+def test_attributes_to_frame_all():
+    df = attributes_to_frame(ATTRIBUTE_VALUES)
+    assert list(df.columns) == ["MPN_IDENT", "DEPTH", "ACTIVE", "CODE"]
+    assert df["CODE"].tolist()[:2] == [7, 8]
+    assert df["ACTIVE"].tolist()[0] is True
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+from datetime import datetime
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+import numpy as np
+
+from fewspy.time_series import Events
+from fewspy.utils.downsampling import (
+    downsample,
+    lttb,
+    min_max,
+    thinning_for_width
+    )
+
+datetime_index = np.arange(
+    np.datetime64("2022-01-01"), np.datetime64("2022-02-01"),
+    np.timedelta64(15, "m")
+    ).astype("datetime64[ns]")
+value = np.sin(np.arange(len(datetime_index)) / 50)
+value[1000] = 10.0
+events = Events.from_arrays(
+    datetime_index, value, np.zeros(len(value), dtype=np.int8)
+    )
+
+
+def test_thinning_for_width():
+    assert thinning_for_width(
+        datetime(2022, 1, 1), datetime(2022, 1, 2), 864
+        ) == 100_000
+
+
+def test_lttb():
+    indices = lttb(np.arange(len(value)), value, 500)
+    assert len(indices) == 500
+    assert indices[0] == 0 and indices[-1] == len(value) - 1
+    assert np.all(np.diff(indices) > 0)
+    assert 1000 in indices
+
+
+def test_min_max():
+    indices = min_max(np.arange(len(value)), value, 500)
+    assert len(indices) <= 500
+    assert 1000 in indices
+    assert np.argmin(value) in indices
+
+
+def test_downsample():
+    result = downsample(events, 1000)
+    assert len(result) == 1000
+    assert result["value"].max() == 10.0
+    assert downsample(events.iloc[:10], 1000).equals(events.iloc[:10])
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+import json
+import numpy as np
+import pandas as pd
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.time_series import Events
+
+DATA_PATH = Path(__file__).parent / "data"
+
+with open(DATA_PATH / "pi_time_series.json") as src:
+    pi_events = json.load(src)["timeSeries"][0]["events"]
+
+pi_events[1] = {**pi_events[1], "value": "-999.0"}
+events = Events.from_pi_events(pi_events, missing_value=-999.0)
+
+
+def test_length():
+    assert len(events) == len(pi_events) - 1
+
+
+def test_dtypes():
+    assert events.index.dtype == np.dtype("datetime64[ns]")
+    assert events["value"].dtype == np.float64
+    assert events["flag"].dtype == np.int8
+
+
+def test_to_reference():
+    reference = pd.DataFrame(pi_events)
+    reference.index = pd.DatetimeIndex(
+        pd.to_datetime(reference["date"] + " " + reference["time"]),
+        name="datetime"
+        )
+    reference = reference.loc[reference["value"] != "-999.0"]
+    assert np.array_equal(events.index.values, reference.index.values)
+    assert np.array_equal(events["value"].values,
+                          reference["value"].astype(float).values)
+
+
+def test_empty():
+    assert Events.from_pi_events([], missing_value=-999.0).empty
+
+
+def test_sub_second():
+    sub_second = Events.from_pi_events(
+        [{"date": "2022-05-01", "time": "00:00:00.500", "value": "1.0",
+          "flag": "0"}],
+        missing_value=-999.0
+        )
+    assert sub_second.index[0] == pd.Timestamp("2022-05-01 00:00:00.500")
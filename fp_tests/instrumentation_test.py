@@ -0,0 +1,137 @@
+import sys
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime
+from mock_fews import FILTER_ID
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+import pytest
+
+from fewspy.api import Api
+from fewspy.utils.instrumentation import Histogram, Instrumentation
+from fewspy.utils.timer import Timer
+
+KWARGS = dict(filter_id=FILTER_ID,
+              start_time=datetime(2022, 1, 1),
+              end_time=datetime(2022, 1, 2))
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+class FakeSpan:
+    def __init__(self):
+        self.attributes = {}
+        self.error = None
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+
+class FakeTracer:
+    """Stand-in for an OpenTelemetry Tracer."""
+
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name):
+        span = FakeSpan()
+        self.spans.append((name, span))
+        try:
+            yield span
+        except BaseException as error:
+            span.error = error
+            raise
+
+
+def test_histogram():
+    histogram = Histogram(max_samples=100)
+    for i in range(1, 201):
+        histogram.add(i)
+    assert (histogram.count, histogram.min, histogram.max) == (200, 1, 200)
+    assert histogram.mean == 100.5
+    assert histogram.percentiles([0, 50, 100]) == [101, 150.5, 200]
+
+
+def test_span():
+    exporter = ListExporter()
+    tracer = FakeTracer()
+    instrumentation = Instrumentation(exporters=[exporter], tracer=tracer)
+    with instrumentation.span("parse", series=2) as span:
+        span.add(events=10)
+        span.add(events=5)
+    with pytest.raises(ValueError):
+        with instrumentation.span("parse"):
+            raise ValueError("failed")
+
+    assert [i.attributes for i in exporter.spans] == [
+        {"series": 2, "events": 15}, {}
+        ]
+    assert "ValueError" in exporter.spans[1].error
+    assert tracer.spans[0][1].attributes == {"series": 2, "events": 15}
+    summary = instrumentation.summary()
+    assert summary.loc["parse.duration", "count"] == 2
+    assert summary.loc["parse.events", "p50"] == 15
+
+
+def test_tracer_exception():
+    tracer = FakeTracer()
+    instrumentation = Instrumentation(tracer=tracer)
+    try:
+        raise KeyError("handled around the span")
+    except KeyError:
+        with instrumentation.span("ok"):
+            pass
+    with pytest.raises(ValueError):
+        with instrumentation.span("failed"):
+            raise ValueError("failed")
+    assert tracer.spans[0][1].error is None
+    assert isinstance(tracer.spans[1][1].error, ValueError)
+
+
+def test_api(server, caplog):
+    exporter = ListExporter()
+    api = Api(server.url, exporters=[exporter])
+    with caplog.at_level(logging.DEBUG, logger="fewspy.api"):
+        api.get_time_series(**KWARGS)
+        api.get_parameters()
+
+    span = exporter.spans[0]
+    assert span.name == "get_time_series"
+    assert span.attributes["series"] == 10
+    assert span.attributes["events"] == 970
+    assert span.attributes["requests"] == 1
+    assert span.attributes["wire_bytes"] > 0
+    assert 0 < span.attributes["build_time"] < span.duration
+    assert exporter.spans[1].attributes["rows"] == 2
+    assert "get_time_series in" in caplog.text
+
+    summary = api.instrumentation.summary()
+    for metric in ["duration", "ttfb", "wire_bytes", "decode_time",
+                   "build_time", "series", "events"]:
+        assert summary.loc[f"get_time_series.{metric}", "count"] == 1
+
+
+def test_lazy_events(server):
+    api = Api(server.url)
+    time_series_set = api.get_time_series(**KWARGS, lazy=True)
+    assert api.instrumentation.histograms["get_time_series.events"].max == 0
+    time_series_set.prefetch()
+    histogram = api.instrumentation.histograms["load_events.events"]
+    assert histogram.sum == 970
+
+
+def test_timer():
+    timer = Timer(logging.getLogger(__name__))
+    start_time = timer.start_time
+    timer.start()
+    assert timer.start_time >= start_time
@@ -0,0 +1,81 @@
+import sys
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.cache import MetadataCache
+
+
+class Endpoint:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, filter_id=None):
+        self.calls += 1
+        time.sleep(0.05)
+        return [{"id": filter_id}]
+
+
+def test_hit_miss():
+    cache = MetadataCache()
+    endpoint = Endpoint()
+    first = cache.get("filters", "a", endpoint, filter_id="a")
+    first[0]["id"] = "modified"
+    second = cache.get("filters", "a", endpoint, filter_id="a")
+    cache.get("filters", "b", endpoint, filter_id="b")
+    assert second == [{"id": "a"}]
+    assert endpoint.calls == 2
+    assert cache.stats == {"filters": {"hits": 1, "misses": 2}}
+
+
+def test_ttl_and_invalidate():
+    cache = MetadataCache(ttl={"filters": 0})
+    endpoint = Endpoint()
+    cache.get("filters", "a", endpoint, filter_id="a")
+    cache.get("filters", "a", endpoint, filter_id="a")
+    assert endpoint.calls == 2
+
+    cache = MetadataCache()
+    cache.get("filters", "a", endpoint, filter_id="a")
+    cache.invalidate("filters")
+    assert len(cache) == 0
+
+
+def test_lru():
+    cache = MetadataCache(max_size=2)
+    endpoint = Endpoint()
+    for i in ["a", "b", "a", "c"]:
+        cache.get("filters", i, endpoint, filter_id=i)
+    cache.get("filters", "a", endpoint, filter_id="a")
+    assert endpoint.calls == 3
+
+
+def test_concurrent_misses():
+    cache = MetadataCache()
+    endpoint = Endpoint()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(
+            lambda i: cache.get("filters", "a", endpoint, filter_id="a"),
+            range(30)
+            ))
+    assert endpoint.calls == 1
+    assert all(i == [{"id": "a"}] for i in results)
+
+
+def test_empty_not_stored():
+    cache = MetadataCache()
+    results = iter([[], [{"id": "a"}]])
+    calls = []
+
+    def _failing_once():
+        calls.append(1)
+        return next(results)
+
+    assert cache.get("filters", "a", _failing_once) == []
+    assert len(cache) == 0
+    assert cache.get("filters", "a", _failing_once) == [{"id": "a"}]
+    assert cache.get("filters", "a", _failing_once) == [{"id": "a"}]
+    assert len(calls) == 2
@@ -0,0 +1,308 @@
+"""
+Offline stand-in for a Delft-FEWS PI-REST webservice.
+
+Serves generated filters, locations, parameters, qualifiers and time series of a
+configurable size (locations x parameters x events) as PI JSON or PI XML, so the
+fewspy Api can be tested and benchmarked without a FEWS server.
+
+Usage:
+    with MockFews(locations=100, parameters=2, events=10_000) as server:
+        api = Api(server.url)
+"""
+
+import gzip
+import json
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+START_TIME = datetime(2022, 1, 1)
+TIME_STEP = timedelta(minutes=15)
+TIME_ZONE = 0.0
+FILTER_ID = "MOCK"
+QUALIFIER_ID = "validatie"
+PI_NS = "http://www.wldelft.nl/fews/PI"
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+
+
+class MockFews:
+    """Threaded HTTP server generating FEWS PI-REST responses."""
+
+    def __init__(self,
+                 locations: int = 10,
+                 parameters: int = 2,
+                 events: int = 1000,
+                 time_step: timedelta = TIME_STEP,
+                 attributes: int = 4):
+        self.location_ids = [f"LOC{i:05d}" for i in range(locations)]
+        self.parameter_ids = [f"PAR{i:02d}" for i in range(parameters)]
+        self.events = events
+        self.time_step = time_step
+        self.attributes = attributes
+        self.requests = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+            )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/FewsWebServices/rest/fewspiservice/v1/"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    # responses
+    def filters(self, query: dict) -> tuple:
+        return "application/json", json.dumps({"filters": [
+            {"id": FILTER_ID, "name": "Mock filter", "child": [
+                {"id": f"{FILTER_ID}_{i}", "name": f"Mock {i}"}
+                for i in self.parameter_ids]}
+            ]})
+
+    def locations(self, query: dict) -> tuple:
+        locations = [
+            {"locationId": i,
+             "shortName": i,
+             "lat": "53.0",
+             "lon": "6.5",
+             "x": f"{200000 + j}.0",
+             "y": f"{550000 + j}.0",
+             "z": "0.0",
+             "attributes": [
+                 {"name": f"ATTR{k}",
+                  "id": f"ATTR{k}",
+                  "type": "number" if k % 2 else "text",
+                  "value": f"{j * k}"}
+                 for k in range(self.attributes)]}
+            for j, i in enumerate(self.location_ids)
+            ]
+        return "application/json", json.dumps(
+            {"geoDatum": "Rijks Driehoekstelsel", "locations": locations}
+            )
+
+    def parameters(self, query: dict) -> tuple:
+        return "application/json", json.dumps({"timeSeriesParameters": [
+            {"id": i,
+             "name": i,
+             "parameterType": "instantaneous",
+             "unit": "m",
+             "displayUnit": "m",
+             "usesDatum": "false",
+             "parameterGroup": "Mock"}
+            for i in self.parameter_ids
+            ]})
+
+    def qualifiers(self, query: dict) -> tuple:
+        return "text/xml", (
+            f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<qualifiers xmlns="{PI_NS}" version="1.28">'
+            f'<qualifier id="{QUALIFIER_ID}"><name>Validatie</name>'
+            f'<groupId>Mock</groupId></qualifier></qualifiers>'
+            )
+
+    def timeseries(self, query: dict) -> tuple:
+        location_ids = query.get("locationIds", self.location_ids)
+        parameter_ids = query.get("parameterIds", self.parameter_ids)
+        if "startTime" in query.keys():
+            start_time = _parse_time(query["startTime"][0])
+        else:
+            start_time = START_TIME
+        if "endTime" in query.keys():
+            end_time = _parse_time(query["endTime"][0])
+        else:
+            end_time = START_TIME + self.time_step * (self.events - 1)
+        only_headers = query.get("onlyHeaders", ["false"])[0].lower() == "true"
+        document_format = query.get("documentFormat", ["PI_JSON"])[0]
+
+        # thinning (milliseconds per pixel) as a coarser time step
+        time_step = self.time_step
+        if "thinning" in query.keys():
+            time_step *= max(
+                1, int(query["thinning"][0]) // int(time_step / timedelta(
+                    milliseconds=1))
+                )
+
+        series = [
+            (i, j) for i in location_ids for j in parameter_ids
+            if (i in self.location_ids) and (j in self.parameter_ids)
+            ]
+        return _time_series(
+            tuple(series),
+            start_time,
+            end_time,
+            time_step,
+            only_headers,
+            document_format
+            )
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                endpoint = url.path.rstrip("/").split("/")[-1]
+                query = parse_qs(url.query)
+                server.requests.append((endpoint, query))
+                if endpoint not in ["filters",
+                                    "locations",
+                                    "parameters",
+                                    "qualifiers",
+                                    "timeseries"]:
+                    body, content_type, status = b"Not found", "text/plain", 404
+                else:
+                    content_type, body = getattr(server, endpoint)(query)
+                    if isinstance(body, str):
+                        body = body.encode()
+                    status = 200
+                self.send_response(status)
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = _gzip(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _dates_times(start_time: datetime, end_time: datetime, time_step: timedelta):
+    step = np.timedelta64(int(time_step.total_seconds()), "s")
+    moments = np.arange(
+        np.datetime64(start_time, "s"),
+        np.datetime64(end_time, "s") + np.timedelta64(1, "s"),
+        step
+        )
+    strings = np.datetime_as_string(moments, unit="s")
+    return [i[:10] for i in strings], [i[11:] for i in strings]
+
+
+def _header(location_id: str, parameter_id: str, start_time, end_time, time_step):
+    return {
+        "type": "instantaneous",
+        "moduleInstanceId": "Mock",
+        "locationId": location_id,
+        "parameterId": parameter_id,
+        "qualifierId": [QUALIFIER_ID],
+        "timeStep": {"unit": "second",
+                     "multiplier": str(int(time_step.total_seconds()))},
+        "startDate": {"date": start_time.strftime("%Y-%m-%d"),
+                      "time": start_time.strftime("%H:%M:%S")},
+        "endDate": {"date": end_time.strftime("%Y-%m-%d"),
+                    "time": end_time.strftime("%H:%M:%S")},
+        "missVal": "-999.0",
+        "stationName": location_id,
+        "lat": "53.0",
+        "lon": "6.5",
+        "x": "200000.0",
+        "y": "550000.0",
+        "z": "0.0",
+        "units": "m"
+        }
+
+
+def _header_xml(header: dict) -> str:
+    elements = []
+    for key, value in header.items():
+        if key == "qualifierId":
+            elements += [f"<qualifierId>{i}</qualifierId>" for i in value]
+        elif isinstance(value, dict):
+            attributes = " ".join(f'{k}="{v}"' for k, v in value.items())
+            elements.append(f"<{key} {attributes}/>")
+        else:
+            elements.append(f"<{key}>{value}</{key}>")
+    return f"<header>{''.join(elements)}</header>"
+
+
+@lru_cache(maxsize=64)
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=1)
+
+
+@lru_cache(maxsize=1024)
+def _time_series(series: tuple,
+                 start_time: datetime,
+                 end_time: datetime,
+                 time_step: timedelta,
+                 only_headers: bool,
+                 document_format: str) -> tuple:
+    """Generate a PI JSON or PI XML time series response (cached)."""
+    dates, times = _dates_times(start_time, end_time, time_step)
+    values = np.round(np.sin(np.arange(len(dates)) / 96), 3).astype(str)
+    xml = document_format == "PI_XML"
+
+    parts = []
+    for location_id, parameter_id in series:
+        header = _header(location_id, parameter_id, start_time, end_time, time_step)
+        if xml:
+            events = "" if only_headers else "".join(
+                f'<event date="{i}" time="{j}" value="{k}" flag="0"/>'
+                for i, j, k in zip(dates, times, values)
+                )
+            parts.append(f"<series>{_header_xml(header)}{events}</series>")
+        else:
+            time_series = json.dumps({"header": header})
+            if not only_headers:
+                events = ",".join(
+                    f'{{"date":"{i}","time":"{j}","value":"{k}","flag":"0"}}'
+                    for i, j, k in zip(dates, times, values)
+                    )
+                time_series = f'{time_series[:-1]},"events":[{events}]}}'
+            parts.append(time_series)
+
+    if xml:
+        return "text/xml", (
+            f'<?xml version="1.0" encoding="UTF-8"?>'
+            f'<TimeSeries xmlns="{PI_NS}" version="1.28">'
+            f"<timeZone>{TIME_ZONE}</timeZone>{''.join(parts)}</TimeSeries>"
+            ).encode()
+    return "application/json", (
+        f'{{"version":"1.28","timeZone":"{TIME_ZONE}",'
+        f'"timeSeries":[{",".join(parts)}]}}'
+        ).encode()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--locations", type=int, default=10)
+    parser.add_argument("--parameters", type=int, default=2)
+    parser.add_argument("--events", type=int, default=1000)
+    args = parser.parse_args()
+
+    server = MockFews(args.locations, args.parameters, args.events)
+    print(f"Mock FEWS PI-REST at {server.url}")
+    server.start()
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
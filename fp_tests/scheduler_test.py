@@ -0,0 +1,151 @@
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from mock_fews import FILTER_ID
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+import numpy as np
+
+from fewspy.scheduler import RefreshScheduler, _changed, delta
+from fewspy.time_series import Events, TimeSeries, TimeSeriesSet
+
+MOCK_FEWS = dict(locations=3, parameters=2, events=100)
+
+KWARGS = dict(start_time=datetime(2022, 1, 1), end_time=datetime(2022, 1, 2))
+
+
+def test_shared_view(server, api):
+    scheduler = RefreshScheduler(api, interval=3600)
+    received = []
+    for i in range(5):
+        scheduler.subscribe(
+            lambda tss, changes: received.append(len(changes)),
+            FILTER_ID,
+            parameter_ids=server.parameter_ids[::(-1) ** i],
+            **KWARGS
+            )
+    scheduler.subscribe(lambda *args: None, FILTER_ID, **KWARGS)
+    assert len(scheduler) == 2
+    assert scheduler.subscriptions == 6
+
+    scheduler.run_pending()
+    assert scheduler.requests == 2
+    assert received == [6] * 5
+
+    # not due, and unchanged data is not passed on
+    scheduler.run_pending()
+    assert scheduler.requests == 2
+    scheduler.refresh(next(iter(scheduler.views.values())))
+    assert received == [6] * 5
+
+    # late subscribers get the latest set immediately
+    scheduler.subscribe(
+        lambda tss, changes: received.append(len(tss)),
+        FILTER_ID,
+        parameter_ids=server.parameter_ids,
+        **KWARGS
+        )
+    assert received[-1] == 6
+
+
+def test_cancel(api):
+    scheduler = RefreshScheduler(api)
+    subscriptions = [
+        scheduler.subscribe(lambda *args: None, FILTER_ID, **KWARGS)
+        for i in range(2)
+        ]
+    subscriptions[0].cancel()
+    assert len(scheduler) == 1
+    subscriptions[1].cancel()
+    assert len(scheduler) == 0
+
+
+def test_delta(api):
+    previous = api.get_time_series(FILTER_ID, **KWARGS)
+    current = api.get_time_series(FILTER_ID, **KWARGS)
+    assert delta(previous, current).empty
+
+    time_series = current.time_series[0]
+    datetime_, value, flag = time_series.to_arrays()
+    value = value.copy()
+    value[3] += 1
+    current.time_series[0] = TimeSeries(
+        header=time_series.header,
+        events=Events.from_arrays(
+            np.append(datetime_, datetime_[-1] + np.timedelta64(15, "m")),
+            np.append(value, 1.0),
+            np.append(flag, 0)
+            )
+        )
+    changes = delta(previous, current)
+    assert len(changes) == 1
+    assert list(changes.time_series[0].events["value"]) == [value[3], 1.0]
+
+
+def test_background_thread(api):
+    scheduler = RefreshScheduler(api, interval=3600).start()
+    received = []
+    scheduler.subscribe(lambda *args: received.append(args), FILTER_ID, **KWARGS)
+    for i in range(100):
+        if received:
+            break
+        time.sleep(0.05)
+    scheduler.stop(timeout=5)
+    assert not scheduler.running
+    assert len(received) == 1
+
+
+class FailingApi:
+    """Api of which the second request fails, as Api returns an empty set."""
+
+    def __init__(self, api):
+        self.api = api
+        self.calls = []
+
+    def get_time_series(self, **kwargs):
+        self.calls.append(kwargs)
+        if len(self.calls) == 2:
+            return TimeSeriesSet()
+        return self.api.get_time_series(**kwargs)
+
+
+def test_failed_refresh(api):
+    failing_api = FailingApi(api)
+    scheduler = RefreshScheduler(failing_api, interval=3600)
+    received = []
+    subscription = scheduler.subscribe(
+        lambda tss, changes: received.append((len(tss), len(changes))),
+        FILTER_ID,
+        **KWARGS
+        )
+    for i in range(3):
+        scheduler.refresh(subscription.view)
+    assert received == [(6, 6)]
+    assert len(subscription.view.time_series_set) == 6
+
+
+def test_period_in_utc(api):
+    failing_api = FailingApi(api)
+    scheduler = RefreshScheduler(failing_api)
+    subscription = scheduler.subscribe(
+        lambda *args: None, FILTER_ID, period=timedelta(days=1)
+        )
+    kwargs = subscription.view.request_kwargs()
+    assert kwargs["end_time"].tzinfo is None
+    utc_now = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs(kwargs["end_time"] - utc_now) < timedelta(minutes=1)
+    assert kwargs["end_time"] - kwargs["start_time"] == timedelta(days=1)
+
+
+def test_missing_flags_unchanged():
+    times = np.arange(5).astype("datetime64[h]").astype("datetime64[ns]")
+    value = np.array([1.0, np.nan, 3.0, 4.0, 5.0])
+    flag = np.full(5, np.nan)
+    previous, current = (
+        TimeSeries(header=None, events=Events.from_arrays(times, value, flag))
+        for i in range(2)
+        )
+    assert _changed(previous, current).sum() == 0
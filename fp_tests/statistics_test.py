@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+import json
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+import numpy as np
+
+from fewspy.time_series import TimeSeriesSet
+from fewspy.utils.statistics import (
+    cumulative,
+    period_statistics,
+    rolling,
+    summary
+    )
+
+DATA_PATH = Path(__file__).parent / "data"
+
+with open(DATA_PATH / "pi_time_series.json") as src:
+    pi_time_series = json.load(src)
+
+timeseriesset = TimeSeriesSet.from_pi_time_series(pi_time_series)
+values = timeseriesset.time_series[0].events["value"]
+
+
+def test_summary():
+    df = summary(timeseriesset, ["mean", "median", "min", "max", "q90", "count"])
+    assert df.shape == (2, 6)
+    row = df.iloc[0]
+    assert np.isclose(row["mean"], values.mean())
+    assert np.isclose(row["median"], values.median())
+    assert np.isclose(row["q90"], values.quantile(0.9))
+    assert row["min"] == values.min() and row["max"] == values.max()
+    assert row["count"] == len(values)
+
+
+def test_period_statistics():
+    df = period_statistics(timeseriesset, "day", ["mean", "q10"])
+    daily = values.groupby(values.index.floor("D"))
+    first = df.xs(timeseriesset.time_series[0].header.location_id)
+    assert np.allclose(first["mean"].dropna().values, daily.mean().values)
+    assert np.allclose(first["q10"].dropna().values, daily.quantile(0.1).values)
+
+
+def test_hydrological_year():
+    df = period_statistics(timeseriesset, "hydrological_year", ["max"])
+    assert list(df.index.get_level_values("hydrological_year").unique()) == [
+        2021
+        ]
+
+
+def test_rolling_and_cumulative():
+    df = rolling(timeseriesset, "1h", "max")
+    assert df.shape == timeseriesset.to_frame().shape
+    assert np.isclose(
+        cumulative(timeseriesset).iloc[:, 0].dropna().iloc[-1], values.sum()
+        )
+
+
+def test_unknown_statistic():
+    try:
+        summary(timeseriesset, ["mode"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError expected")
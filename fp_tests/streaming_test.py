@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+import json
+
+parentdir = Path(__file__).parents[1]
+sys.path.insert(0, parentdir.as_posix())
+
+from fewspy.time_series import TimeSeries
+from fewspy.utils.streaming import iter_json_array
+
+DATA_PATH = Path(__file__).parent / "data"
+
+content = (DATA_PATH / "pi_time_series.json").read_bytes()
+pi_time_series = json.loads(content)
+
+
+def _chunks(content: bytes, size: int):
+    return (content[i:i + size] for i in range(0, len(content), size))
+
+
+def test_small_chunks():
+    items = list(iter_json_array(_chunks(content, 7), "timeSeries"))
+    assert items == pi_time_series["timeSeries"]
+
+
+def test_one_chunk():
+    items = list(iter_json_array([content], "timeSeries"))
+    assert items == pi_time_series["timeSeries"]
+
+
+def test_time_series():
+    time_series = [
+        TimeSeries.from_pi_time_series(i)
+        for i in iter_json_array(_chunks(content, 4096), "timeSeries")
+        ]
+    assert len(time_series) == 2
+    assert time_series[0].header.location_id == "NL34.HL.KGM156.HWZ1"
+
+
+def test_strings_and_multibyte():
+    document = {"version": "1.28",
+                "timeSeries": [{"a": "}{][\",\\"}, {"b": "µ€ ﬁ"}, {}]}
+    content = json.dumps(document, ensure_ascii=False).encode()
+    items = list(iter_json_array(_chunks(content, 1), "timeSeries"))
+    assert items == document["timeSeries"]
+
+
+def test_no_array():
+    assert list(iter_json_array([b'{"version": "1.28"}'], "timeSeries")) == []
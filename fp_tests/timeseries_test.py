@@ -2,10 +2,12 @@ import sys
 from pathlib import Path
 import json
 
+import numpy as np
+
 parentdir = Path(__file__).parents[1]
 sys.path.insert(0, parentdir.as_posix())
 
-from fewspy.time_series import TimeSeriesSet
+from fewspy.time_series import Header, TimeSeriesSet, merge_arrays
 
 DATA_PATH = Path(__file__).parent / "data"
 
@@ -42,3 +44,88 @@ def test_location_ids():
 
 def test_qualifier_ids():
     assert timeseriesset.qualifier_ids == ['validatie']
+
+
+def test_to_frame():
+    df = timeseriesset.to_frame()
+    assert df.shape == (390, 2)
+    assert df.columns.names == ["location_id", "parameter_id", "qualifier_id"]
+    for i, time_series in enumerate(timeseriesset.time_series):
+        assert df.iloc[:, i].dropna().equals(
+            time_series.events["value"].rename(df.columns[i])
+            )
+
+
+def test_to_frame_resample():
+    df = timeseriesset.to_frame("flag", resample="1D")
+    assert len(df) == 5
+    assert df.dtypes.eq("float32").all()
+
+
+def test_header_extra():
+    pi_header = {**pi_time_series["timeSeries"][0]["header"],
+                 "creationDate": "2022-05-05"}
+    header = Header.from_pi_header(pi_header)
+    assert header.extra == {"creation_date": "2022-05-05"}
+    assert header.miss_val == -999.0
+    assert timeseriesset.time_series[0].header.extra is None
+    assert Header.from_pi_header(header.to_pi_header()) == header
+
+
+def test_add():
+    time_series = TimeSeriesSet.from_pi_time_series(pi_time_series)
+    first, last = (TimeSeriesSet.from_pi_time_series(pi_time_series)
+                   for _ in range(2))
+    events = time_series.time_series[0].events
+    first.time_series[0].events = events.iloc[:200]
+    last.time_series[0].events = events.iloc[150:]
+    last.time_series[0].events.loc[events.index[150], "value"] = 1000.0
+    last.time_series = last.time_series[:1]
+
+    result = TimeSeriesSet().add(first).add(last)
+    assert len(result) == 2
+    assert not result.empty
+    merged = result.time_series[0].events
+    assert merged.index.equals(events.index)
+    assert merged.loc[events.index[150], "value"] == 1000.0
+    assert merged["value"].drop(events.index[150]).equals(
+        events["value"].drop(events.index[150])
+        )
+
+
+def test_merge_arrays():
+    def arrays(moments, value):
+        datetime = np.array(moments, dtype="datetime64[ns]")
+        return datetime, np.full(len(moments), value), np.zeros(len(moments))
+
+    result = merge_arrays(
+        arrays(["2022-01-01", "2022-01-03", "2022-01-05", "2022-01-07"], 1.0),
+        arrays(["2022-01-02", "2022-01-03", "2022-01-04"], 2.0)
+        )
+    assert list(result[0].astype(str)) == [
+        f"2022-01-0{i}T00:00:00.000000000" for i in range(1, 6)
+        ] + ["2022-01-07T00:00:00.000000000"]
+    assert list(result[1]) == [1.0, 2.0, 2.0, 2.0, 1.0, 1.0]
+
+
+def test_get():
+    time_series = timeseriesset.time_series[1]
+    header = time_series.header
+    assert timeseriesset.get(header.location_id, header.parameter_id) is (
+        time_series
+        )
+    assert timeseriesset.get(
+        header.location_id, header.parameter_id, "validatie"
+        ) is time_series
+    assert timeseriesset.get(header.location_id, "unknown") is None
+    assert timeseriesset.by_location[header.location_id] == [time_series]
+    assert len(timeseriesset.by_parameter[header.parameter_id]) == 2
+
+
+def test_index_invalidation():
+    time_series_set = TimeSeriesSet.from_pi_time_series(pi_time_series)
+    assert len(time_series_set.location_ids) == 2
+    time_series_set.time_series = time_series_set.time_series[:1]
+    assert len(time_series_set.location_ids) == 1
+    time_series_set.time_series.pop()
+    assert time_series_set.location_ids == []
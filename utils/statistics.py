@@ -1,3 +1,11 @@
+"""
+Per-frame statistics helpers, superseded by fewspy.utils.statistics.
+
+These helpers add a full-length column per statistic to a single Events frame.
+fewspy.utils.statistics computes statistics for a whole TimeSeriesSet into one
+compact table.
+"""
+
 from pathlib import Path
 import pandas as pd
 